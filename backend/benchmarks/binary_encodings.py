@@ -0,0 +1,86 @@
+"""Size and encode/decode time of msgpack and CBOR bodies against orjson, with gzip sizes alongside.
+
+    python -m benchmarks.binary_encodings
+"""
+import decimal
+import gzip
+import timeit
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Dict
+
+import orjson
+
+from utils.codecs import CODECS, decode, encode
+from utils.json_provider import OrjsonProvider
+
+
+def _sample_payloads(count: int) -> Dict[str, Any]:
+    kids = [
+        {
+            "id": str(uuid.UUID(int=i)),
+            "first_name": f"Kid {i}",
+            "gender": "f",
+            "dob": date(2015, 1, 1 + i % 28),
+            "household_id": "8c5b0a6e-4f0e-4d0c-9a55-1f6c2c0a0001",
+            "parent_user_id": "8c5b0a6e-4f0e-4d0c-9a55-1f6c2c0a0002",
+            "avatar_url": None,
+        }
+        for i in range(count)
+    ]
+    activities = [
+        {
+            "id": str(uuid.UUID(int=10**6 + i)),
+            "name": f"Soccer practice {i}",
+            "provider": "City League",
+            "address": "9 Park Ave",
+            "location": None,
+            "latitude": 40.7128 + i / 1e4,
+            "longitude": -74.006,
+            "kids": [{"id": kids[i]["id"], "first_name": kids[i]["first_name"]}],
+            "schedule": {
+                "type": "recurring",
+                "start_date": date(2026, 9, 1),
+                "end_date": date(2027, 6, 1),
+                "timezone": "America/New_York",
+                "weekdays": [0, 2],
+                "default_start_time": "16:00",
+                "default_end_time": "17:00",
+                "day_times": [{"weekday": 2, "start_time": "17:00", "end_time": "18:00"}],
+            },
+            "created_at": datetime(2026, 1, 1, 12, 30, 15, 250000),
+        }
+        for i in range(count // 10)
+    ]
+    mixed = {
+        "unicode": "Zoë’s ⚽ practice",
+        "time": time(7, 45),
+        "decimal": decimal.Decimal("12.50"),
+        "numbers": [0, -1, 2**53, 1.5, -0.25],
+    }
+    return {"kids": kids, "activities": activities, "mixed": mixed}
+
+
+def main(count: int = 5_000, repeat: int = 5) -> None:
+    if not CODECS:
+        print("Neither msgpack nor cbor2 is installed; nothing to compare.")
+        return
+    dumpb = OrjsonProvider.dumpb.__get__(object.__new__(OrjsonProvider))
+
+    for label, payload in _sample_payloads(count).items():
+        json_body = dumpb(payload)
+        json_encode = min(timeit.repeat(lambda: dumpb(payload), number=1, repeat=repeat))
+        json_decode = min(timeit.repeat(lambda: orjson.loads(json_body), number=1, repeat=repeat))
+        print(f"{label}: json {len(json_body):>8} B (gzip {len(gzip.compress(json_body)):>7} B)  "
+              f"encode {json_encode * 1000:6.2f} ms  decode {json_decode * 1000:6.2f} ms")
+        for media_type in CODECS:
+            body = encode(payload, media_type)
+            enc = min(timeit.repeat(lambda: encode(payload, media_type), number=1, repeat=repeat))
+            dec = min(timeit.repeat(lambda: decode(body, media_type), number=1, repeat=repeat))
+            print(f"  {media_type:<20} {len(body):>8} B (gzip {len(gzip.compress(body)):>7} B)  "
+                  f"encode {enc * 1000:6.2f} ms  decode {dec * 1000:6.2f} ms  "
+                  f"size {len(body) / len(json_body):4.0%} of json")
+
+
+if __name__ == "__main__":
+    main()
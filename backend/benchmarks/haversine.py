@@ -0,0 +1,49 @@
+"""NumPy haversine kernel against a pure-Python loop, one point to 10k and 1M points.
+
+    python -m benchmarks.haversine
+"""
+import math
+import time
+from typing import Sequence
+
+import numpy as np
+
+from utils.distance import as_coordinates, haversine_one_to_many, top_k
+from utils.geohash import EARTH_RADIUS_KM
+
+
+def haversine_python(lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]):
+    phi1, lambda1 = math.radians(lat), math.radians(lon)
+    result = []
+    for lat2, lon2 in zip(lats, lons):
+        phi2 = math.radians(lat2)
+        a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(
+            (math.radians(lon2) - lambda1) / 2
+        ) ** 2
+        result.append(2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a))))
+    return result
+
+
+def main(sizes: Sequence[int] = (10_000, 1_000_000), seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    for size in sizes:
+        lats = as_coordinates(rng.uniform(-60, 60, size))
+        lons = as_coordinates(rng.uniform(-180, 180, size))
+        lat_list, lon_list = lats.tolist(), lons.tolist()
+
+        started = time.perf_counter()
+        haversine_python(40.7, -74.0, lat_list, lon_list)
+        python_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        top_k(haversine_one_to_many(40.7, -74.0, lats, lons), 50)
+        numpy_seconds = time.perf_counter() - started
+
+        print(
+            f"n={size:>9,}  python={python_seconds * 1000:9.1f} ms  numpy={numpy_seconds * 1000:7.1f} ms  "
+            f"speedup={python_seconds / numpy_seconds:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""p50/p99 of one GET /kids page as a household grows from 10 to 10,000 kids.
+
+    python -m benchmarks.kids_pagination
+
+The keyset query walks the (household_id, created_at, id) index, so both the first page and a
+page deep into the list should cost the same at every size.
+"""
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SIZES = (10, 100, 1_000, 10_000)
+PAGE_SIZE = 50
+SAMPLES = 300
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory}/bench.db"
+
+    from sqlalchemy import insert
+
+    from app import create_app
+    from models import Household, Kid, db
+    from models.db import default_uuid
+    from services.kid_service import list_kids_for_user
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        # Noise households so the index, not table size, decides the cost.
+        other = Household(name="Other")
+        target = Household(name="Target")
+        db.session.add_all([other, target])
+        db.session.flush()
+        base = datetime(2026, 1, 1)
+        db.session.execute(
+            insert(Kid),
+            [{"id": default_uuid(), "first_name": "x", "household_id": other.id, "created_at": base} for _ in range(20_000)],
+        )
+
+        print(f"{'kids':>7}  {'first p50':>10}  {'first p99':>10}  {'deep p50':>10}  {'deep p99':>10}")
+        existing = 0
+        for size in SIZES:
+            db.session.execute(
+                insert(Kid),
+                [
+                    {
+                        "id": default_uuid(),
+                        "first_name": f"kid{i}",
+                        "household_id": target.id,
+                        # Pairs share a timestamp so the id tie-breaker is exercised.
+                        "created_at": base + timedelta(seconds=i // 2),
+                    }
+                    for i in range(existing, size)
+                ],
+            )
+            db.session.commit()
+            existing = size
+
+            middle = Kid.query.filter_by(household_id=target.id).order_by(Kid.created_at.desc(), Kid.id.desc())
+            anchor = middle.offset(size // 2).first()
+            results = []
+            for after in (None, (anchor.created_at, anchor.id)):
+                samples = []
+                for _ in range(SAMPLES):
+                    started = time.perf_counter()
+                    list_kids_for_user(target.id, None, limit=PAGE_SIZE, after=after)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    db.session.expunge_all()
+                results += [statistics.median(samples), _percentile(samples, 0.99)]
+            print(f"{size:>7}  " + "  ".join(f"{value:8.3f}ms" for value in results))
+
+
+if __name__ == "__main__":
+    main()
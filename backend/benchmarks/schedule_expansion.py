@@ -0,0 +1,73 @@
+"""Expand a school year (Sep-Jun) for 50 recurring activities, columnar vs a day-by-day zoneinfo loop.
+
+    python -m benchmarks.schedule_expansion
+"""
+import random
+import statistics
+import time as timer
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from models import ActivityDayTime, ActivitySchedule
+from services.schedule_service import expand_schedules_columnar, weekday_times
+
+SCHOOL_YEAR = (date(2026, 9, 1), date(2027, 6, 30))
+ZONES = ["America/New_York", "America/Chicago", "America/Los_Angeles", "Europe/London"]
+
+
+def _schedules(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    schedules = []
+    for _ in range(count):
+        hour = rng.randint(7, 18)
+        schedule = ActivitySchedule(
+            schedule_type="recurring",
+            start_date=SCHOOL_YEAR[0],
+            end_date=SCHOOL_YEAR[1],
+            timezone=rng.choice(ZONES),
+            recurrence_weekdays=sorted(rng.sample(range(7), rng.randint(1, 3))),
+            default_start_time=time(hour),
+            default_end_time=time(hour + 1, 30),
+        )
+        schedule.day_times = [ActivityDayTime(weekday=schedule.recurrence_weekdays[0], start_time=time(8), end_time=time(9))]
+        schedules.append(schedule)
+    return schedules
+
+
+def _day_by_day(schedules, window_start, window_end):
+    rows = []
+    for schedule in schedules:
+        tz = ZoneInfo(schedule.timezone)
+        times = weekday_times(schedule)
+        day = max(schedule.start_date, window_start)
+        while day <= min(schedule.end_date, window_end):
+            if day.weekday() in times:
+                start, end = times[day.weekday()]
+                rows.append((datetime.combine(day, start, tz), datetime.combine(day, end, tz)))
+            day += timedelta(days=1)
+    return rows
+
+
+def _timings(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        fn()
+        samples.append((timer.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main(count: int = 50, repeat: int = 50) -> None:
+    schedules = _schedules(count)
+    occurrences = len(expand_schedules_columnar(schedules, *SCHOOL_YEAR))
+    # The first call fills the per-zone offset cache; warm it so the figures are steady state.
+    expand_schedules_columnar(schedules, *SCHOOL_YEAR)
+    columnar = _timings(lambda: expand_schedules_columnar(schedules, *SCHOOL_YEAR), repeat)
+    loop = _timings(lambda: _day_by_day(schedules, *SCHOOL_YEAR), max(1, repeat // 10))
+    print(f"{count} activities, {occurrences} occurrences")
+    print(f"  columnar    median {columnar[0]:7.2f} ms  max {columnar[1]:7.2f} ms")
+    print(f"  day-by-day  median {loop[0]:7.2f} ms  max {loop[1]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Hand-built dicts + stdlib json (the previous response path) against the model serializers + orjson.
+
+    python -m benchmarks.serializers
+"""
+import json
+import timeit
+from datetime import date, datetime, time
+
+from models import Activity, ActivityDayTime, ActivitySchedule, Kid, KidActivityEnrollment
+from models.serializers import ACTIVITY, KID, format_time
+from utils.json_provider import OrjsonProvider
+
+
+def _sample(count):
+    kids = [
+        Kid(
+            id=f"kid-{i}",
+            first_name=f"Kid {i}",
+            gender="f",
+            dob=date(2015, 1, 1),
+            household_id="h",
+            parent_user_id="u",
+            avatar_url=None,
+        )
+        for i in range(count)
+    ]
+    activities = []
+    for i in range(count // 10):
+        schedule = ActivitySchedule(
+            schedule_type="recurring",
+            start_date=date(2026, 9, 1),
+            end_date=date(2027, 6, 1),
+            timezone="America/New_York",
+            recurrence_weekdays=[0, 2],
+            default_start_time=time(16),
+            default_end_time=time(17),
+        )
+        schedule.day_times = [ActivityDayTime(weekday=2, start_time=time(17), end_time=time(18))]
+        # Set every column, as a row loaded from the database would have them.
+        activity = Activity(
+            id=f"a-{i}",
+            name=f"Activity {i}",
+            provider=None,
+            address="9 Park Ave",
+            location=None,
+            latitude=40.7,
+            longitude=-74.0,
+            household_id="h",
+            created_by_user_id="u",
+            created_at=datetime(2026, 1, 1),
+        )
+        activity.schedule = schedule
+        activity.enrollments = [KidActivityEnrollment(kid=kids[i]), KidActivityEnrollment(kid=kids[i + 1])]
+        activities.append(activity)
+    return kids, activities
+
+
+def _old_kid(k):
+    return {
+        "id": str(k.id),
+        "first_name": k.first_name,
+        "gender": k.gender,
+        "dob": k.dob.isoformat() if k.dob else None,
+        "household_id": k.household_id,
+        "parent_user_id": k.parent_user_id,
+        "avatar_url": k.avatar_url,
+    }
+
+
+def _old_activity(a):
+    s = a.schedule
+    return {
+        "id": a.id,
+        "name": a.name,
+        "provider": a.provider,
+        "address": a.address,
+        "location": a.location,
+        "latitude": a.latitude,
+        "longitude": a.longitude,
+        "household_id": a.household_id,
+        "created_by_user_id": a.created_by_user_id,
+        "kids": [{"id": e.kid.id, "first_name": e.kid.first_name} for e in a.enrollments],
+        "schedule": {
+            "type": s.schedule_type,
+            "start_date": s.start_date.isoformat(),
+            "end_date": s.end_date.isoformat(),
+            "timezone": s.timezone,
+            "weekdays": s.recurrence_weekdays,
+            "default_start_time": format_time(s.default_start_time),
+            "default_end_time": format_time(s.default_end_time),
+            "day_times": [
+                {"weekday": dt.weekday, "start_time": format_time(dt.start_time), "end_time": format_time(dt.end_time)}
+                for dt in s.day_times
+            ],
+        },
+        "created_at": a.created_at.isoformat(),
+    }
+
+
+def _stdlib(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def main(count: int = 10_000, repeat: int = 5) -> None:
+    kids, activities = _sample(count)
+    dumpb = OrjsonProvider.dumpb.__get__(object.__new__(OrjsonProvider))
+    cases = [
+        ("kids", len(kids), lambda: _stdlib([_old_kid(k) for k in kids]), lambda: dumpb(KID.many(kids))),
+        (
+            "activities",
+            len(activities),
+            lambda: _stdlib([_old_activity(a) for a in activities]),
+            lambda: dumpb(ACTIVITY.many(activities)),
+        ),
+    ]
+    for label, size, before, after in cases:
+        old = min(timeit.repeat(before, number=1, repeat=repeat))
+        new = min(timeit.repeat(after, number=1, repeat=repeat))
+        print(f"{label:<10} n={size:>6}  before={old * 1000:7.1f} ms  after={new * 1000:7.1f} ms  speedup={old / new:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+from utils.db_pool import engine_options, replica_binds
+
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = BASE_DIR.parent
 ENV_PATH = PROJECT_ROOT / ".env"
@@ -15,16 +17,84 @@ class Config:
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
     DEBUG = FLASK_ENV == "development"
     TESTING = os.getenv("TESTING", "false").lower() == "true"
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
+    # Signing keys have no defaults: create_app refuses to start without them unless DEBUG or TESTING.
+    SECRET_KEY = os.getenv("SECRET_KEY")
+    # Signs calendar feed URLs; separate from SECRET_KEY so either can be rotated on its own.
+    CALENDAR_FEED_SECRET = os.getenv("CALENDAR_FEED_SECRET")
 
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///kidride_dev.db")
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Each process holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections; size against
+    # Postgres max_connections (or PgBouncer's pool) times the number of gunicorn workers.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Transaction-mode PgBouncer: no server-side prepared statements.
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pgbouncer=DB_PGBOUNCER,
+    )
+    # Comma-separated read replicas; safe GET/HEAD requests in READ_REPLICA_BLUEPRINTS read from them.
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    SQLALCHEMY_BINDS = replica_binds(
+        DATABASE_REPLICA_URLS,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pgbouncer=DB_PGBOUNCER,
+    )
+    READ_REPLICA_BLUEPRINTS = [
+        name.strip()
+        for name in os.getenv("READ_REPLICA_BLUEPRINTS", "users,kids,households,activities").split(",")
+        if name.strip()
+    ]
+    # After a successful write, the same user's reads stay on the primary this long (replica lag).
+    READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
 
     CORS_ALLOW_ORIGINS = [
         origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if origin.strip()
     ]
 
     FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
+    FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
+    # Point at a local JWKS file (tests, air-gapped environments) instead of Google's endpoint.
+    FIREBASE_JWKS_URL = os.getenv("FIREBASE_JWKS_URL")
+    FIREBASE_JWKS_PATH = os.getenv("FIREBASE_JWKS_PATH")
+    FIREBASE_KEY_REFRESH_MARGIN = int(os.getenv("FIREBASE_KEY_REFRESH_MARGIN", "300"))
+    FIREBASE_KEY_FETCH_TIMEOUT = float(os.getenv("FIREBASE_KEY_FETCH_TIMEOUT", "5"))
     AUTH_DEV_BYPASS = os.getenv("AUTH_DEV_BYPASS", "true").lower() == "true"
+    TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "4096"))
+    # Verified tokens are cached until exp, capped at this many seconds.
+    TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    # Ask Firebase whether the token was revoked (costs a user lookup on every cache miss).
+    TOKEN_CHECK_REVOKED = os.getenv("TOKEN_CHECK_REVOKED", "false").lower() == "true"
+    USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "4096"))
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    ACTIVITY_INSTANCE_HORIZON_DAYS = int(os.getenv("ACTIVITY_INSTANCE_HORIZON_DAYS", "180"))
+    GEOCODER_PROVIDER = os.getenv("GEOCODER_PROVIDER", "file")
+    # JSON file of {"address": [lat, lon]} used by the file provider (local development, tests).
+    GEOCODER_FILE_PATH = os.getenv("GEOCODER_FILE_PATH")
+    GEOCODE_CACHE_MAX_SIZE = int(os.getenv("GEOCODE_CACHE_MAX_SIZE", "10000"))
+    GEOCODE_NEGATIVE_TTL_SECONDS = int(os.getenv("GEOCODE_NEGATIVE_TTL_SECONDS", "86400"))
+    CALENDAR_FEED_CACHE_MAX_SIZE = int(os.getenv("CALENDAR_FEED_CACHE_MAX_SIZE", "2048"))
+    CALENDAR_FEED_CACHE_TTL_SECONDS = int(os.getenv("CALENDAR_FEED_CACHE_TTL_SECONDS", "300"))
+    # Responses smaller than this go out uncompressed; gzip/zstd framing would eat the savings.
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "5"))
+    COMPRESSION_CACHE_MAX_SIZE = int(os.getenv("COMPRESSION_CACHE_MAX_SIZE", "256"))
+    # GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>"; unset, the endpoint is not served.
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
     SERVICE_NAME = os.getenv("SERVICE_NAME", "kidride-backend")
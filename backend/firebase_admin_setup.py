@@ -5,26 +5,45 @@ import firebase_admin
 from firebase_admin import credentials
 from flask import Flask
 
+from services.firebase_key_store import GOOGLE_JWKS_URL, FirebaseKeyStore
+
 firebase_app: Optional[firebase_admin.App] = None
 
 
 def init_firebase(app: Flask) -> Optional[firebase_admin.App]:
     global firebase_app
 
-    if firebase_app:
-        return firebase_app
+    if not firebase_app:
+        cred_path = app.config.get("FIREBASE_CREDENTIALS_PATH")
+        if not cred_path:
+            app.logger.warning("FIREBASE_CREDENTIALS_PATH not set; Firebase admin not initialized")
+        else:
+            try:
+                cred = credentials.Certificate(cred_path)
+                firebase_app = firebase_admin.initialize_app(cred)
+                app.logger.info("Firebase admin initialized")
+            except Exception as exc:  # noqa: BLE001
+                app.logger.warning("Firebase admin initialization failed: %s", exc)
+                logging.exception(exc)
+                firebase_app = None
+
+    init_key_store(app)
+    return firebase_app
 
-    cred_path = app.config.get("FIREBASE_CREDENTIALS_PATH")
-    if not cred_path:
-        app.logger.warning("FIREBASE_CREDENTIALS_PATH not set; Firebase admin not initialized")
+
+def init_key_store(app: Flask) -> Optional[FirebaseKeyStore]:
+    project_id = app.config.get("FIREBASE_PROJECT_ID") or getattr(firebase_app, "project_id", None)
+    if not project_id:
+        app.logger.warning("Firebase project id unknown; ID tokens will be verified by firebase_admin")
         return None
 
-    try:
-        cred = credentials.Certificate(cred_path)
-        firebase_app = firebase_admin.initialize_app(cred)
-        app.logger.info("Firebase admin initialized")
-    except Exception as exc:  # noqa: BLE001
-        app.logger.warning("Firebase admin initialization failed: %s", exc)
-        logging.exception(exc)
-        firebase_app = None
-    return firebase_app
+    store = FirebaseKeyStore(
+        project_id,
+        jwks_url=app.config.get("FIREBASE_JWKS_URL") or GOOGLE_JWKS_URL,
+        jwks_path=app.config.get("FIREBASE_JWKS_PATH"),
+        refresh_margin=app.config.get("FIREBASE_KEY_REFRESH_MARGIN", 300),
+        fetch_timeout=app.config.get("FIREBASE_KEY_FETCH_TIMEOUT", 5),
+    )
+    store.start()
+    app.extensions["firebase_key_store"] = store
+    return store
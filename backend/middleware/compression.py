@@ -0,0 +1,136 @@
+import gzip
+import time
+from typing import Callable, Optional, Sequence
+
+from flask import Flask, Response, request
+from werkzeug.datastructures import Accept
+
+from utils.cache import TTLCache
+from utils.metrics import get_metrics
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip only
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+# Server preference when the client rates several encodings equally.
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/msgpack",
+    "application/cbor",
+    "text/calendar",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+
+
+def compression_level(
+    level: Optional[int] = None, *, zstd_level: Optional[int] = None, br_level: Optional[int] = None
+) -> Callable:
+    """Per-route override of the gzip (and zstd/brotli) level; ``compression_level(0)`` turns compression off."""
+
+    def decorator(func):
+        # Stored on the function; functools.wraps in outer decorators carries it to the endpoint.
+        func.compression_level = level
+        func.zstd_compression_level = zstd_level if zstd_level is not None else level
+        func.br_compression_level = br_level if br_level is not None else level
+        return func
+
+    return decorator
+
+
+def available_encodings() -> Sequence[str]:
+    installed = {"zstd": zstandard is not None, "br": brotli is not None, "gzip": True}
+    return tuple(encoding for encoding in ENCODING_PREFERENCE if installed[encoding])
+
+
+def choose_encoding(accept_encodings: Accept, available: Optional[Sequence[str]] = None) -> Optional[str]:
+    """The encoding to send: the client's highest q wins, ties go by ENCODING_PREFERENCE; None means identity."""
+    return accept_encodings.best_match(available_encodings() if available is None else available)
+
+
+def _route_level(app: Flask, encoding: str) -> int:
+    view = app.view_functions.get(request.endpoint) if request.endpoint else None
+    attribute, setting, default = {
+        "zstd": ("zstd_compression_level", "COMPRESSION_ZSTD_LEVEL", 3),
+        "br": ("br_compression_level", "COMPRESSION_BROTLI_LEVEL", 5),
+        "gzip": ("compression_level", "COMPRESSION_GZIP_LEVEL", 6),
+    }[encoding]
+    level = getattr(view, attribute, None)
+    return app.config.get(setting, default) if level is None else level
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _should_compress(app: Flask, response: Response) -> bool:
+    return (
+        response.status_code == 200
+        and request.method != "HEAD"
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and "Content-Encoding" not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and (response.content_length or 0) >= app.config.get("COMPRESSION_MIN_SIZE", 1024)
+    )
+
+
+def init_compression(app: Flask) -> None:
+    cache = TTLCache(max_size=app.config.get("COMPRESSION_CACHE_MAX_SIZE", 256))
+    app.extensions["compression_cache"] = cache
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if not _should_compress(app, response):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        level = _route_level(app, encoding)
+        if not level:
+            return response
+
+        data = response.get_data()
+        etag, weak = response.get_etag()
+        cache_key = (etag, encoding, level) if etag else None
+        metrics = get_metrics()
+
+        compressed = cache.get(cache_key) if cache_key else None
+        if compressed is None:
+            started = time.perf_counter()
+            compressed = _compress(data, encoding, level)
+            if metrics is not None:
+                metrics.observe("compression.seconds", time.perf_counter() - started, encoding=encoding)
+            if cache_key:
+                cache.set(cache_key, compressed)
+        elif metrics is not None:
+            metrics.incr("compression.cache_hits", encoding=encoding)
+
+        if len(compressed) >= len(data):
+            return response
+        if metrics is not None:
+            metrics.observe("compression.ratio", len(data) / len(compressed), encoding=encoding)
+            metrics.incr("compression.bytes_in", len(data), encoding=encoding)
+            metrics.incr("compression.bytes_out", len(compressed), encoding=encoding)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            # Same entity, different bytes: a weak validator still lets If-None-Match revalidate.
+            response.set_etag(etag, weak=True)
+        return response
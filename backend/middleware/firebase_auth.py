@@ -1,18 +1,59 @@
+import hashlib
+import time
 from functools import wraps
 from typing import Any, Dict, Optional
 
 from firebase_admin import auth
-from flask import current_app, g
+from flask import Flask, current_app, g, request
 
 from models import User
 from services.user_service import get_or_create_user
+from utils.cache import TTLCache
 from utils.helpers import error_response, get_bearer_token
 
 
+def init_token_cache(app: Flask) -> TTLCache:
+    cache = TTLCache(max_size=app.config.get("TOKEN_CACHE_MAX_SIZE", 4096))
+    app.extensions["token_cache"] = cache
+    return cache
+
+
+def _token_cache() -> Optional[TTLCache]:
+    return current_app.extensions.get("token_cache")
+
+
+def _token_key(token: str) -> str:
+    # Never keep raw bearer tokens in memory longer than the request needs them.
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def _verify_token(token: str) -> Optional[Dict[str, Any]]:
+    cache = _token_cache()
+    key = _token_key(token)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    check_revoked = bool(current_app.config.get("TOKEN_CHECK_REVOKED"))
     try:
-        decoded = auth.verify_id_token(token)
-        current_app.logger.info(f"Token verified successfully for uid: {decoded.get('uid')}")
+        decoded = None
+        key_store = current_app.extensions.get("firebase_key_store")
+        if key_store is not None and not check_revoked:
+            decoded = key_store.verify(token)
+        if decoded is None:
+            # Unknown key id, keys not loaded yet, or a revocation check (which needs the user
+            # record): let firebase_admin verify.
+            decoded = auth.verify_id_token(token, check_revoked=check_revoked)
+        current_app.logger.debug(f"Token verified successfully for uid: {decoded.get('uid')}")
+        exp = decoded.get("exp")
+        now = time.time()
+        if cache is not None and isinstance(exp, (int, float)) and exp > now:
+            # Re-verify at least every TOKEN_CACHE_TTL_SECONDS so a revoked token stops working
+            # without waiting for its exp.
+            max_age = current_app.config.get("TOKEN_CACHE_TTL_SECONDS")
+            expires_at = float(exp) if not max_age else min(float(exp), now + max_age)
+            cache.set(key, decoded, expires_at=expires_at)
         return decoded
     except Exception as e:  # noqa: BLE001
         current_app.logger.warning(f"Token verification failed: {str(e)}")
@@ -43,6 +84,7 @@ def auth_required(func):
             email=decoded.get("email"),
             first_name=decoded.get("name"),
             avatar_url=decoded.get("picture"),
+            defer_backfill=request.method in ("GET", "HEAD", "OPTIONS"),
         )
         g.current_user = user
         return func(*args, **kwargs)
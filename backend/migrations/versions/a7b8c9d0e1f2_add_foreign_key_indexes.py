@@ -0,0 +1,41 @@
+"""Add foreign key and hot lookup indexes
+
+Revision ID: a7b8c9d0e1f2
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7b8c9d0e1f2"
+down_revision = "f2a3b4c5d6e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # kids.household_id is covered by ix_kids_household_created_at_id; enrollments.kid_id,
+    # activity_day_times.schedule_id and activity_schedules.activity_id by their unique constraints.
+    op.create_index(op.f("ix_users_household_id"), "users", ["household_id"])
+    op.create_index("ix_kids_parent_created_at_id", "kids", ["parent_user_id", "created_at", "id"])
+    op.create_index(op.f("ix_vehicles_household_id"), "vehicles", ["household_id"])
+    op.create_index(
+        "ix_activities_household_created_at_id",
+        "activities",
+        ["household_id", "created_at", "id"],
+    )
+    op.create_index(
+        op.f("ix_kid_activity_enrollments_activity_id"),
+        "kid_activity_enrollments",
+        ["activity_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_kid_activity_enrollments_activity_id"), table_name="kid_activity_enrollments")
+    op.drop_index("ix_activities_household_created_at_id", table_name="activities")
+    op.drop_index(op.f("ix_vehicles_household_id"), table_name="vehicles")
+    op.drop_index("ix_kids_parent_created_at_id", table_name="kids")
+    op.drop_index(op.f("ix_users_household_id"), table_name="users")
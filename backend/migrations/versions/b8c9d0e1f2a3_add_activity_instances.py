@@ -0,0 +1,42 @@
+"""Add activity instances
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b8c9d0e1f2a3"
+down_revision = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_instances",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("activity_id", sa.String(length=36), nullable=False),
+        sa.Column("occurrence_date", sa.Date(), nullable=False),
+        sa.Column("start_at", sa.DateTime(), nullable=False),
+        sa.Column("end_at", sa.DateTime(), nullable=False),
+        sa.Column("cancelled_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["activity_id"], ["activities.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("activity_id", "occurrence_date", name="uq_activity_instance_date"),
+    )
+    op.create_index("ix_activity_instances_start_at", "activity_instances", ["start_at"])
+
+    # NULL means "not materialized yet"; `flask instances extend` fills existing schedules in.
+    op.add_column("activity_schedules", sa.Column("materialized_through", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("activity_schedules", "materialized_through")
+    op.drop_index("ix_activity_instances_start_at", table_name="activity_instances")
+    op.drop_table("activity_instances")
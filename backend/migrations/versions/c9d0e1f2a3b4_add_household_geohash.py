@@ -0,0 +1,88 @@
+"""Add household geohash
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c9d0e1f2a3b4"
+down_revision = "b8c9d0e1f2a3"
+branch_labels = None
+depends_on = None
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def _encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    # Frozen copy of utils.geohash.encode as of this revision, so later changes there cannot
+    # alter what this migration writes.
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def upgrade() -> None:
+    op.add_column("households", sa.Column("geohash", sa.String(length=12), nullable=True))
+    op.create_index(
+        "ix_households_geohash",
+        "households",
+        ["geohash"],
+        postgresql_ops={"geohash": "varchar_pattern_ops"},
+    )
+
+    # Backfill households that already have coordinates.
+    households = sa.table(
+        "households",
+        sa.column("id", sa.String),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+        sa.column("geohash", sa.String),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(households.c.id, households.c.latitude, households.c.longitude).where(
+            households.c.latitude.isnot(None), households.c.longitude.isnot(None)
+        )
+    ).all()
+    if rows:
+        conn.execute(
+            households.update().where(households.c.id == sa.bindparam("household_id")),
+            [{"household_id": row.id, "geohash": _encode(row.latitude, row.longitude)} for row in rows],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_households_geohash", table_name="households")
+    op.drop_column("households", "geohash")
@@ -0,0 +1,28 @@
+"""Add kids (household_id, created_at, id) index
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2g3h4i5j6
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2a3b4c5d6e7"
+down_revision = "e1f2g3h4i5j6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves GET /kids keyset pages: equality on household_id, ordered by (created_at, id).
+    op.create_index(
+        "ix_kids_household_created_at_id",
+        "kids",
+        ["household_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_kids_household_created_at_id", table_name="kids")
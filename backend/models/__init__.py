@@ -1,7 +1,9 @@
 from .db import (
     Activity,
     ActivityDayTime,
+    ActivityInstance,
     ActivitySchedule,
+    GeocodeCache,
     Household,
     Kid,
     KidActivityEnrollment,
@@ -19,5 +21,7 @@ __all__ = [
     "Activity",
     "ActivitySchedule",
     "ActivityDayTime",
+    "ActivityInstance",
     "KidActivityEnrollment",
+    "GeocodeCache",
 ]
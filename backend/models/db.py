@@ -2,8 +2,13 @@ import uuid
 from datetime import date, datetime, time
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
-db = SQLAlchemy()
+from utils.geohash import encode as geohash_encode
+
+from .routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def default_uuid() -> str:
@@ -24,19 +29,36 @@ class Household(db.Model, TimestampMixin):
     # Use double precision for coordinates to avoid precision loss.
     latitude = db.Column(db.Float(precision=53))
     longitude = db.Column(db.Float(precision=53))
+    # Derived from latitude/longitude on every write (see _sync_geohash below).
+    geohash = db.Column(db.String(12))
     avatar_url = db.Column(db.Text)
 
     users = db.relationship("User", backref="household", lazy=True)
     kids = db.relationship("Kid", backref="household", lazy=True)
     vehicles = db.relationship("Vehicle", backref="household", lazy=True)
 
+    __table_args__ = (
+        # Pattern ops so prefix LIKE queries use the index regardless of the database collation.
+        db.Index("ix_households_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+    )
+
+
+@event.listens_for(Household, "before_insert")
+@event.listens_for(Household, "before_update")
+def _sync_geohash(_mapper, _connection, household: Household) -> None:
+    # Registered with the model so every writer keeps the index column current, whatever it imports.
+    if household.latitude is None or household.longitude is None:
+        household.geohash = None
+    else:
+        household.geohash = geohash_encode(household.latitude, household.longitude)
+
 
 class User(db.Model, TimestampMixin):
     __tablename__ = "users"
 
     id = db.Column(db.String(36), primary_key=True, default=default_uuid)
     firebase_uid = db.Column(db.String(128), unique=True, nullable=False)
-    household_id = db.Column(db.String(36), db.ForeignKey("households.id"))
+    household_id = db.Column(db.String(36), db.ForeignKey("households.id"), index=True)
     email = db.Column(db.String(255), unique=True)
     first_name = db.Column(db.String(120))
     last_name = db.Column(db.String(120))
@@ -62,12 +84,17 @@ class Kid(db.Model, TimestampMixin):
         "KidActivityEnrollment", backref="kid", cascade="all, delete-orphan", lazy=True
     )
 
+    __table_args__ = (
+        db.Index("ix_kids_household_created_at_id", "household_id", "created_at", "id"),
+        db.Index("ix_kids_parent_created_at_id", "parent_user_id", "created_at", "id"),
+    )
+
 
 class Vehicle(db.Model, TimestampMixin):
     __tablename__ = "vehicles"
 
     id = db.Column(db.String(36), primary_key=True, default=default_uuid)
-    household_id = db.Column(db.String(36), db.ForeignKey("households.id"))
+    household_id = db.Column(db.String(36), db.ForeignKey("households.id"), index=True)
     make = db.Column(db.String(120))
     model = db.Column(db.String(120))
     color = db.Column(db.String(64))
@@ -93,6 +120,11 @@ class Activity(db.Model, TimestampMixin):
     enrollments = db.relationship(
         "KidActivityEnrollment", backref="activity", cascade="all, delete-orphan", lazy=True
     )
+    instances = db.relationship(
+        "ActivityInstance", backref="activity", cascade="all, delete-orphan", lazy=True
+    )
+
+    __table_args__ = (db.Index("ix_activities_household_created_at_id", "household_id", "created_at", "id"),)
 
 
 class KidActivityEnrollment(db.Model, TimestampMixin):
@@ -100,8 +132,9 @@ class KidActivityEnrollment(db.Model, TimestampMixin):
 
     id = db.Column(db.String(36), primary_key=True, default=default_uuid)
     kid_id = db.Column(db.String(36), db.ForeignKey("kids.id"), nullable=False)
-    activity_id = db.Column(db.String(36), db.ForeignKey("activities.id"), nullable=False)
+    activity_id = db.Column(db.String(36), db.ForeignKey("activities.id"), nullable=False, index=True)
 
+    # kid_id lookups are served by the leading column of uq_kid_activity.
     __table_args__ = (db.UniqueConstraint("kid_id", "activity_id", name="uq_kid_activity"),)
 
 
@@ -117,6 +150,8 @@ class ActivitySchedule(db.Model, TimestampMixin):
     default_start_time = db.Column(db.Time)
     default_end_time = db.Column(db.Time)
     recurrence_weekdays = db.Column(db.JSON)  # list of integers 0 (Mon) - 6 (Sun)
+    # Last local date for which activity_instances rows have been generated.
+    materialized_through = db.Column(db.Date)
 
     day_times = db.relationship(
         "ActivityDayTime",
@@ -137,3 +172,33 @@ class ActivityDayTime(db.Model, TimestampMixin):
     end_time = db.Column(db.Time, nullable=False)
 
     __table_args__ = (db.UniqueConstraint("schedule_id", "weekday", name="uq_schedule_weekday"),)
+
+
+class ActivityInstance(db.Model, TimestampMixin):
+    __tablename__ = "activity_instances"
+
+    id = db.Column(db.String(36), primary_key=True, default=default_uuid)
+    activity_id = db.Column(db.String(36), db.ForeignKey("activities.id"), nullable=False)
+    occurrence_date = db.Column(db.Date, nullable=False)  # local date in the schedule timezone
+    start_at = db.Column(db.DateTime, nullable=False)  # UTC
+    end_at = db.Column(db.DateTime, nullable=False)  # UTC
+    # Set instead of deleting when a schedule change drops an instance other rows still reference.
+    cancelled_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.UniqueConstraint("activity_id", "occurrence_date", name="uq_activity_instance_date"),
+        db.Index("ix_activity_instances_start_at", "start_at"),
+    )
+
+
+class GeocodeCache(db.Model):
+    __tablename__ = "geocoding_cache"
+
+    id = db.Column(db.String(36), primary_key=True, default=default_uuid)
+    address = db.Column(db.Text, nullable=False)  # normalized form
+    address_hash = db.Column(db.String(64), nullable=False, unique=True)
+    # Both NULL records a miss, so unknown addresses are not sent to the provider again right away.
+    latitude = db.Column(db.Float(precision=53))
+    longitude = db.Column(db.Float(precision=53))
+    provider = db.Column(db.String(64), nullable=False)
+    cached_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
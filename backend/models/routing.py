@@ -0,0 +1,137 @@
+import hashlib
+import hmac
+import random
+import time
+from typing import Any, List, NamedTuple, Optional
+
+from flask import Flask, current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+from utils.db_pool import REPLICA_BIND_PREFIX
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Sent back after a write; clients echo it as a header (or keep the cookie) to read from the primary.
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+class ReadReplicas(NamedTuple):
+    engines: List[Engine]
+    blueprints: frozenset
+    window_seconds: int
+
+
+def _user_key() -> Optional[str]:
+    user = g.get("current_user")
+    if user is None:
+        return None
+    # The identity is known without loading attributes, which would itself call get_bind.
+    identity = inspect(user).identity
+    return str(identity[0]) if identity else None
+
+
+def _marker_signature(user_key: str, until: int) -> str:
+    key = current_app.config["SECRET_KEY"].encode("utf-8")
+    return hmac.new(key, f"read-primary:{user_key}:{until}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def read_primary_marker(user_key: str, until: int) -> str:
+    """``<unix time>.<signature>``: the user reads from the primary until then, in whichever worker."""
+    return f"{until}.{_marker_signature(user_key, until)}"
+
+
+def _reads_primary(user_key: str) -> bool:
+    # Workers share no memory, so the marker travels with the client and is signed to stop forgery.
+    marker = request.headers.get(READ_PRIMARY_HEADER) or request.cookies.get(READ_PRIMARY_COOKIE)
+    if not marker:
+        return False
+    until, _, signature = marker.partition(".")
+    if not until.isdigit() or int(until) < time.time():
+        return False
+    return hmac.compare_digest(_marker_signature(user_key, int(until)), signature)
+
+
+def _replica_engine() -> Optional[Engine]:
+    """The replica this request reads from, or None when its reads belong on the primary."""
+    if not has_request_context():
+        return None
+    replicas: Optional[ReadReplicas] = current_app.extensions.get("read_replicas")
+    if replicas is None or request.method not in SAFE_METHODS or request.blueprint not in replicas.blueprints:
+        return None
+    # Before auth has run we do not know whose writes to honour, so the user lookup stays on the primary.
+    user_key = _user_key()
+    if user_key is None or _reads_primary(user_key):
+        return None
+    engine = g.get("replica_engine")
+    if engine is None:
+        # One replica per request, so all of its reads see the same snapshot.
+        engine = g.replica_engine = random.choice(replicas.engines)
+    return engine
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to a read replica when the request allows it; everything else uses the binds."""
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, bind: Any = None, **kwargs: Any):
+        if (
+            bind is None
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self.info.get("wrote")
+        ):
+            engine = _replica_engine()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_flush(session, flush_context) -> None:
+    # A request that has written reads its own rows back from the primary from then on.
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _pin_after_dml(orm_execute_state) -> None:
+    # session.execute(insert(...)) and friends write without a flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def init_read_replicas(app: Flask) -> Optional[ReadReplicas]:
+    engines = [
+        engine
+        for bind, engine in app.extensions["sqlalchemy"].engines.items()
+        if bind and bind.startswith(REPLICA_BIND_PREFIX)
+    ]
+    if not engines:
+        return None
+    replicas = ReadReplicas(
+        engines=engines,
+        blueprints=frozenset(app.config.get("READ_REPLICA_BLUEPRINTS", ())),
+        window_seconds=int(app.config.get("READ_YOUR_WRITES_SECONDS", 5)),
+    )
+    app.extensions["read_replicas"] = replicas
+
+    @app.after_request
+    def remember_writer(response):
+        user_key = _user_key()
+        if user_key and response.status_code < 400:
+            session = app.extensions["sqlalchemy"].session
+            if request.method not in SAFE_METHODS or session.info.get("wrote"):
+                marker = read_primary_marker(user_key, int(time.time()) + replicas.window_seconds)
+                response.headers[READ_PRIMARY_HEADER] = marker
+                response.set_cookie(
+                    READ_PRIMARY_COOKIE,
+                    marker,
+                    max_age=replicas.window_seconds,
+                    secure=request.is_secure,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        return response
+
+    return replicas
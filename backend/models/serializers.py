@@ -0,0 +1,79 @@
+from datetime import time
+from typing import Dict, List, Optional
+
+from utils.serializers import Serializer
+
+from .db import Activity, ActivitySchedule
+
+
+def format_time(value: Optional[time]) -> Optional[str]:
+    if not value:
+        return None
+    return f"{value.hour:02d}:{value.minute:02d}"
+
+
+def _effective_day_times(schedule: ActivitySchedule) -> List[Dict[str, object]]:
+    if schedule.day_times:
+        return DAY_TIME.many(schedule.day_times)
+    if schedule.recurrence_weekdays and schedule.default_start_time and schedule.default_end_time:
+        start, end = format_time(schedule.default_start_time), format_time(schedule.default_end_time)
+        return [{"weekday": w, "start_time": start, "end_time": end} for w in schedule.recurrence_weekdays]
+    return []
+
+
+def _enrolled_kids(enrollments) -> List[Dict[str, object]]:
+    return [KID_REF(e.kid) for e in enrollments]
+
+
+# Dates and datetimes are left as objects; the JSON provider writes them as ISO 8601.
+USER = Serializer("User", ["id", "firebase_uid", "email", "first_name", "last_name", "avatar_url"])
+
+HOUSEHOLD = Serializer("Household", ["id", "name", "address", "phone", "latitude", "longitude"])
+
+KID = Serializer(
+    "Kid", ["id", "first_name", "gender", "dob", "household_id", "parent_user_id", "avatar_url"]
+)
+
+KID_REF = Serializer("Kid", ["id", "first_name"])
+
+DAY_TIME = Serializer(
+    "ActivityDayTime",
+    [
+        "weekday",
+        ("start_time", "start_time", format_time),
+        ("end_time", "end_time", format_time),
+    ],
+)
+
+SCHEDULE = Serializer(
+    "ActivitySchedule",
+    [
+        ("type", "schedule_type"),
+        "start_date",
+        "end_date",
+        "timezone",
+        ("weekdays", "recurrence_weekdays"),
+        ("default_start_time", "default_start_time", format_time),
+        ("default_end_time", "default_end_time", format_time),
+        ("day_times", _effective_day_times),
+    ],
+)
+
+ACTIVITY = Serializer(
+    "Activity",
+    [
+        "id",
+        "name",
+        "provider",
+        "address",
+        "location",
+        "latitude",
+        "longitude",
+        "household_id",
+        "created_by_user_id",
+        ("kids", "enrollments", _enrolled_kids),
+        ("schedule", "schedule", SCHEDULE.optional),
+        "created_at",
+    ],
+)
+
@@ -1,4 +1,6 @@
+import io
 from datetime import date, time
+from itertools import islice
 from typing import Dict, List, Optional, Tuple, Union
 
 from flask import Blueprint, g, request
@@ -12,10 +14,45 @@ from models import (
     KidActivityEnrollment,
     db,
 )
-from utils.helpers import error_response, json_response
+from models.serializers import ACTIVITY, format_time
+from services.activity_service import (
+    accessible_activity_ids,
+    bulk_insert_activities,
+    list_activities_for_household,
+    load_activity,
+)
+from services.calendar_feed import invalidate_household_feed
+from services.calendar_service import household_calendar
+from services.capacity_planner import plan_capacity
+from services.conflict_service import conflicts_for_activity
+from services.driver_rotation import AvailabilitySlot, rotation_for_activity
+from services.geocoding_service import fill_coordinates
+from services.geo_service import households_near
+from services.instance_service import sync_instances
+from services.schedule_import import detect_format, iter_csv_rows, iter_ics_rows
+from services.schedule_service import is_valid_timezone
+from utils.helpers import (
+    NEXT_CURSOR_HEADER,
+    conditional_json_response,
+    decode_cursor,
+    encode_cursor,
+    error_response,
+    get_request_payload,
+    json_response,
+    parse_limit,
+)
 
 activity_bp = Blueprint("activities", __name__)
 
+MAX_CALENDAR_DAYS = 366
+MAX_CAPACITY_DAYS = 31
+MAX_ROTATION_DAYS = 366
+MAX_BULK_ACTIVITIES = 500
+IMPORT_CHUNK_SIZE = 200
+DEFAULT_NEARBY_RADIUS_KM = 5.0
+MAX_NEARBY_RADIUS_KM = 50.0
+DEFAULT_NEARBY_LIMIT = 20
+
 
 def _parse_date(value: Optional[str], field: str) -> Tuple[Optional[date], Optional[str]]:
     if value is None:
@@ -45,12 +82,6 @@ def _parse_float(value: Optional[Union[str, float, int]], field: str) -> Tuple[O
         return None, f"{field} must be a number"
 
 
-def _format_time(value: Optional[time]) -> Optional[str]:
-    if not value:
-        return None
-    return value.strftime("%H:%M")
-
-
 def _ensure_weekdays(raw_weekdays: Optional[List[int]], schedule_type: str, start_date: date) -> Tuple[List[int], Optional[str]]:
     if raw_weekdays in (None, []):
         if schedule_type == "recurring":
@@ -93,6 +124,8 @@ def _validate_schedule(payload: Dict[str, object]) -> Tuple[Optional[Dict[str, o
     tz = payload.get("timezone")
     if not tz or not isinstance(tz, str):
         return None, "timezone is required"
+    if not is_valid_timezone(tz):
+        return None, "timezone must be an IANA timezone name (e.g. America/New_York)"
 
     weekdays, err = _ensure_weekdays(payload.get("weekdays"), schedule_type, start_date)
     if err:
@@ -168,63 +201,10 @@ def _get_kids_for_enrollment(kid_ids: List[str], household_id: str) -> Tuple[Opt
     return kids, None
 
 
-def _serialize_activity(activity: Activity) -> Dict[str, object]:
-    schedule = activity.schedule
-    day_times = []
-    if schedule:
-        if schedule.day_times:
-            day_times = [
-                {
-                    "weekday": dt.weekday,
-                    "start_time": _format_time(dt.start_time),
-                    "end_time": _format_time(dt.end_time),
-                }
-                for dt in schedule.day_times
-            ]
-        elif schedule.recurrence_weekdays and schedule.default_start_time and schedule.default_end_time:
-            day_times = [
-                {
-                    "weekday": w,
-                    "start_time": _format_time(schedule.default_start_time),
-                    "end_time": _format_time(schedule.default_end_time),
-                }
-                for w in schedule.recurrence_weekdays
-            ]
-
-    return {
-        "id": activity.id,
-        "name": activity.name,
-        "provider": activity.provider,
-        "address": activity.address,
-        "location": activity.location,
-        "latitude": activity.latitude,
-        "longitude": activity.longitude,
-        "household_id": activity.household_id,
-        "created_by_user_id": activity.created_by_user_id,
-        "kids": [
-            {"id": e.kid.id, "first_name": e.kid.first_name if e.kid else None}
-            for e in activity.enrollments
-        ],
-        "schedule": {
-            "type": schedule.schedule_type if schedule else None,
-            "start_date": schedule.start_date.isoformat() if schedule and schedule.start_date else None,
-            "end_date": schedule.end_date.isoformat() if schedule and schedule.end_date else None,
-            "timezone": schedule.timezone if schedule else None,
-            "weekdays": schedule.recurrence_weekdays if schedule else [],
-            "default_start_time": _format_time(schedule.default_start_time) if schedule else None,
-            "default_end_time": _format_time(schedule.default_end_time) if schedule else None,
-            "day_times": day_times,
-        }
-        if schedule
-        else None,
-        "created_at": activity.created_at.isoformat() if activity.created_at else None,
-    }
-
-
 @activity_bp.route("", methods=["POST"])
 @auth_required
 def create_activity():
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     current_user = getattr(g, "current_user", None)
     if not current_user or not getattr(current_user, "id", None):
         return error_response("User not found", status_code=401)
@@ -249,6 +229,9 @@ def create_activity():
     if err:
         return error_response(err, status_code=400)
     longitude, err = _parse_float(payload.get("longitude"), "longitude")
+    if err:
+        return error_response(err, status_code=400)
+    (latitude, longitude), err = fill_coordinates(payload.get("address"), latitude, longitude)
     if err:
         return error_response(err, status_code=400)
 
@@ -291,19 +274,281 @@ def create_activity():
     for kid in kids:
         db.session.add(KidActivityEnrollment(kid_id=kid.id, activity_id=activity.id))
 
+    db.session.flush()
+    db.session.expire(schedule, ["day_times"])
+    sync_instances(schedule)
     db.session.commit()
+    invalidate_household_feed(household_id)
+
+    activity = load_activity(activity.id)
+    body = ACTIVITY(activity)
+    body["conflicts"] = conflicts_for_activity(activity)
+    return json_response(body, status_code=201)
+
+
+def _prepare_bulk_item(
+    payload: object, kids_by_id: Dict[str, Kid], household_id: str
+) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    if not isinstance(payload, dict):
+        return None, "Each activity must be an object"
+
+    name = (payload.get("name") or "").strip()
+    if not name:
+        return None, "name is required"
+
+    schedule_data, err = _validate_schedule(payload)
+    if err:
+        return None, err
+    day_weekdays = [dt["weekday"] for dt in schedule_data["day_times"]]
+    if len(day_weekdays) != len(set(day_weekdays)):
+        return None, "day_times.weekday must be unique"
+
+    kid_ids = payload.get("kid_ids") or []
+    if not kid_ids:
+        return None, "kid_ids is required"
+    if not isinstance(kid_ids, list):
+        return None, "kid_ids must be a list"
+    for kid_id in kid_ids:
+        kid = kids_by_id.get(kid_id) if isinstance(kid_id, str) else None
+        if kid is None:
+            return None, "One or more kids not found"
+        if kid.household_id != household_id:
+            return None, "All kids must belong to the current household"
+
+    latitude, err = _parse_float(payload.get("latitude"), "latitude")
+    if err:
+        return None, err
+    longitude, err = _parse_float(payload.get("longitude"), "longitude")
+    if err:
+        return None, err
+    (latitude, longitude), err = fill_coordinates(payload.get("address"), latitude, longitude)
+    if err:
+        return None, err
 
-    db.session.refresh(activity)
-    return json_response(_serialize_activity(activity), status_code=201)
+    return (
+        {
+            "name": name,
+            "provider": payload.get("provider"),
+            "address": payload.get("address"),
+            "location": payload.get("location"),
+            "latitude": latitude,
+            "longitude": longitude,
+            "schedule": schedule_data,
+            "kid_ids": kid_ids,
+        },
+        None,
+    )
+
+
+def _create_batch(payloads: List[object], household_id: str, user_id: str) -> List[Dict[str, object]]:
+    """Validate each payload and insert the valid ones; one result per payload, in order."""
+    kid_ids = {
+        kid_id
+        for payload in payloads
+        if isinstance(payload, dict) and isinstance(payload.get("kid_ids"), list)
+        for kid_id in payload["kid_ids"]
+        if isinstance(kid_id, str)
+    }
+    kids_by_id = {kid.id: kid for kid in Kid.query.filter(Kid.id.in_(kid_ids))} if kid_ids else {}
+
+    results: List[Dict[str, object]] = []
+    items: List[Dict[str, object]] = []
+    for payload in payloads:
+        try:
+            item, err = _prepare_bulk_item(payload, kids_by_id, household_id)
+        except Exception:  # noqa: BLE001 - one malformed item must not fail the rest of the batch
+            item, err = None, "Invalid activity"
+        if err:
+            results.append({"error": err})
+        else:
+            results.append({})
+            items.append(item)
+
+    created_ids = iter(bulk_insert_activities(household_id, user_id, items))
+    for result in results:
+        if "error" not in result:
+            result["id"] = next(created_ids)
+    return results
+
+
+@activity_bp.route("/bulk", methods=["POST"])
+@auth_required
+def bulk_create_activities():
+    payload = get_request_payload() or {}
+    current_user = getattr(g, "current_user", None)
+    if not current_user or not getattr(current_user, "id", None):
+        return error_response("User not found", status_code=401)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    activities = payload.get("activities") if isinstance(payload, dict) else None
+    if not isinstance(activities, list) or not activities:
+        return error_response("activities must be a non-empty list", status_code=400)
+    if len(activities) > MAX_BULK_ACTIVITIES:
+        return error_response(f"At most {MAX_BULK_ACTIVITIES} activities per request", status_code=400)
+
+    results = _create_batch(activities, household_id, current_user.id)
+    db.session.commit()
+    invalidate_household_feed(household_id)
+
+    created = sum(1 for result in results if "id" in result)
+    return json_response(
+        {
+            "created": created,
+            "failed": len(results) - created,
+            "results": [{"index": index, **result} for index, result in enumerate(results)],
+        },
+        status_code=201 if created else 400,
+    )
+
+
+@activity_bp.route("/import", methods=["POST"])
+@auth_required
+def import_activities():
+    """Import an .ics or .csv schedule export, uploaded as multipart ``file`` or as the raw body."""
+    current_user = getattr(g, "current_user", None)
+    if not current_user or not getattr(current_user, "id", None):
+        return error_response("User not found", status_code=401)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    upload = request.files.get("file")
+    if upload is not None:
+        stream, fmt = upload.stream, detect_format(upload.filename, upload.mimetype)
+    else:
+        stream, fmt = request.stream, detect_format(None, request.mimetype)
+    fmt = request.values.get("format") or fmt
+    if fmt not in {"ics", "csv"}:
+        return error_response("Upload an .ics or .csv file (or pass format=ics|csv)", status_code=400)
+
+    default_timezone = request.values.get("timezone") or "UTC"
+    if not is_valid_timezone(default_timezone):
+        return error_response("timezone must be an IANA timezone name (e.g. America/New_York)", status_code=400)
+    kid_ids = [kid_id.strip() for value in request.values.getlist("kid_ids") for kid_id in value.split(",") if kid_id.strip()]
+
+    # newline="" keeps quoted CSV newlines intact; the ICS reader strips line endings itself.
+    lines = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    rows = (iter_ics_rows if fmt == "ics" else iter_csv_rows)(lines, default_timezone, kid_ids)
+
+    report: List[Dict[str, object]] = []
+    # Bounded chunks keep memory flat: each is validated, inserted and committed before reading on.
+    while True:
+        chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        results = iter(_create_batch([payload for _, payload, err in chunk if not err], household_id, current_user.id))
+        db.session.commit()
+        invalidate_household_feed(household_id)
+        for number, _, err in chunk:
+            report.append({"row": number, **({"error": err} if err else next(results))})
+
+    created = sum(1 for entry in report if "id" in entry)
+    return json_response(
+        {"created": created, "failed": len(report) - created, "results": report},
+        status_code=201 if created else 400,
+    )
 
 
 def _get_activity_for_user(activity_id: str, household_id: str) -> Optional[Activity]:
-    activity = Activity.query.filter_by(id=activity_id).first()
-    if not activity:
-        return None
-    if activity.household_id != household_id:
-        return None
-    return activity
+    return load_activity(activity_id, household_id=household_id)
+
+
+@activity_bp.route("", methods=["GET"])
+@auth_required
+def list_activities():
+    current_user = getattr(g, "current_user", None)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    limit, err = parse_limit(request.args.get("limit"))
+    if err:
+        return error_response(err, status_code=400)
+
+    after = None
+    cursor = request.args.get("cursor")
+    if cursor:
+        after, err = decode_cursor(cursor)
+        if err:
+            return error_response(err, status_code=400)
+
+    date_from = date_to = None
+    if request.args.get("from"):
+        date_from, err = _parse_date(request.args.get("from"), "from")
+        if err:
+            return error_response(err, status_code=400)
+    if request.args.get("to"):
+        date_to, err = _parse_date(request.args.get("to"), "to")
+        if err:
+            return error_response(err, status_code=400)
+    if date_from and date_to and date_to < date_from:
+        return error_response("to cannot be before from", status_code=400)
+
+    schedule_type = request.args.get("schedule_type")
+    if schedule_type and schedule_type not in {"one_time", "recurring"}:
+        return error_response("schedule_type must be 'one_time' or 'recurring'", status_code=400)
+
+    activities, has_more = list_activities_for_household(
+        household_id,
+        limit=limit,
+        after=after,
+        kid_id=request.args.get("kid_id"),
+        date_from=date_from,
+        date_to=date_to,
+        schedule_type=schedule_type,
+    )
+
+    headers = {}
+    if has_more:
+        last = activities[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return json_response(ACTIVITY.many(activities), headers=headers)
+
+
+@activity_bp.route("/calendar", methods=["GET"])
+@auth_required
+def activity_calendar():
+    current_user = getattr(g, "current_user", None)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    date_from, err = _parse_date(request.args.get("from"), "from")
+    if err:
+        return error_response(err, status_code=400)
+    date_to, err = _parse_date(request.args.get("to"), "to")
+    if err:
+        return error_response(err, status_code=400)
+    if date_to < date_from:
+        return error_response("to cannot be before from", status_code=400)
+    if (date_to - date_from).days >= MAX_CALENDAR_DAYS:
+        return error_response(f"Calendar window cannot exceed {MAX_CALENDAR_DAYS} days", status_code=400)
+
+    return json_response(household_calendar(household_id, date_from, date_to))
+
+
+@activity_bp.route("/capacity", methods=["GET"])
+@auth_required
+def activity_capacity():
+    current_user = getattr(g, "current_user", None)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    date_from, err = _parse_date(request.args.get("from"), "from")
+    if err:
+        return error_response(err, status_code=400)
+    date_to, err = _parse_date(request.args.get("to"), "to")
+    if err:
+        return error_response(err, status_code=400)
+    if date_to < date_from:
+        return error_response("to cannot be before from", status_code=400)
+    if (date_to - date_from).days >= MAX_CAPACITY_DAYS:
+        return error_response(f"Capacity window cannot exceed {MAX_CAPACITY_DAYS} days", status_code=400)
+
+    return json_response(plan_capacity(accessible_activity_ids(household_id), date_from, date_to))
 
 
 @activity_bp.route("/<activity_id>", methods=["GET"])
@@ -318,13 +563,125 @@ def get_activity(activity_id: str):
     if not activity:
         return error_response("Activity not found", status_code=404)
 
-    return json_response(_serialize_activity(activity))
+    return conditional_json_response(ACTIVITY(activity))
+
+
+@activity_bp.route("/<activity_id>/nearby-households", methods=["GET"])
+@auth_required
+def nearby_households(activity_id: str):
+    current_user = getattr(g, "current_user", None)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    activity = _get_activity_for_user(activity_id, household_id)
+    if not activity:
+        return error_response("Activity not found", status_code=404)
+    if activity.latitude is None or activity.longitude is None:
+        return error_response("Activity has no coordinates", status_code=400)
+
+    radius_km, err = _parse_float(request.args.get("radius_km"), "radius_km")
+    if err:
+        return error_response(err, status_code=400)
+    radius_km = DEFAULT_NEARBY_RADIUS_KM if radius_km is None else radius_km
+    if not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+        return error_response(f"radius_km must be between 0 and {MAX_NEARBY_RADIUS_KM:g}", status_code=400)
+
+    limit, err = parse_limit(request.args.get("limit"), default=DEFAULT_NEARBY_LIMIT)
+    if err:
+        return error_response(err, status_code=400)
+
+    return json_response(
+        households_near(
+            activity.latitude,
+            activity.longitude,
+            radius_km,
+            limit=limit,
+            exclude_household_id=household_id,
+        )
+    )
+
+
+def _parse_rotation_inputs(
+    payload: Dict[str, object]
+) -> Tuple[Optional[Tuple[List[AvailabilitySlot], Dict[str, int], List[Tuple[str, date]]]], Optional[str]]:
+    raw_slots = payload.get("availability") or []
+    raw_history = payload.get("history") or {}
+    raw_blocked = payload.get("blocked_dates") or []
+    if not isinstance(raw_slots, list) or not isinstance(raw_history, dict) or not isinstance(raw_blocked, list):
+        return None, "availability and blocked_dates must be lists and history an object"
+
+    slots: List[AvailabilitySlot] = []
+    for index, raw in enumerate(raw_slots):
+        if not isinstance(raw, dict) or not raw.get("household_id"):
+            return None, f"availability[{index}].household_id is required"
+        try:
+            weekday = int(raw.get("weekday"))
+        except (TypeError, ValueError):
+            weekday = -1
+        if not 0 <= weekday <= 6:
+            return None, f"availability[{index}].weekday must be between 0 (Monday) and 6 (Sunday)"
+        start, err = _parse_time(raw.get("start_time"), f"availability[{index}].start_time")
+        if err:
+            return None, err
+        end, err = _parse_time(raw.get("end_time"), f"availability[{index}].end_time")
+        if err:
+            return None, err
+        if start is None or end is None:
+            return None, f"availability[{index}] needs start_time and end_time"
+        slots.append(AvailabilitySlot(str(raw["household_id"]), weekday, start, end))
+
+    history: Dict[str, int] = {}
+    for household_id, legs in raw_history.items():
+        if not isinstance(legs, int) or legs < 0:
+            return None, "history values must be non-negative integers"
+        history[str(household_id)] = legs
+
+    blocked: List[Tuple[str, date]] = []
+    for index, raw in enumerate(raw_blocked):
+        if not isinstance(raw, dict) or not raw.get("household_id"):
+            return None, f"blocked_dates[{index}].household_id is required"
+        blocked_date, err = _parse_date(raw.get("date"), f"blocked_dates[{index}].date")
+        if err:
+            return None, err
+        blocked.append((str(raw["household_id"]), blocked_date))
+    return (slots, history, blocked), None
+
+
+@activity_bp.route("/<activity_id>/driver-rotation", methods=["POST"])
+@auth_required
+def driver_rotation(activity_id: str):
+    payload = get_request_payload() or {}
+    current_user = getattr(g, "current_user", None)
+    household_id = getattr(current_user, "household_id", None)
+    if not household_id:
+        return error_response("User must belong to a household", status_code=400)
+
+    if not accessible_activity_ids(household_id, activity_id):
+        return error_response("Activity not found", status_code=404)
+
+    date_from, err = _parse_date(payload.get("from"), "from")
+    if err:
+        return error_response(err, status_code=400)
+    date_to, err = _parse_date(payload.get("to"), "to")
+    if err:
+        return error_response(err, status_code=400)
+    if date_to < date_from:
+        return error_response("to cannot be before from", status_code=400)
+    if (date_to - date_from).days >= MAX_ROTATION_DAYS:
+        return error_response(f"Rotation window cannot exceed {MAX_ROTATION_DAYS} days", status_code=400)
+
+    inputs, err = _parse_rotation_inputs(payload)
+    if err:
+        return error_response(err, status_code=400)
+    availability, history, blocked = inputs
+    return json_response(rotation_for_activity(activity_id, date_from, date_to, availability, history, blocked))
 
 
 @activity_bp.route("/<activity_id>", methods=["PATCH"])
 @auth_required
 def update_activity(activity_id: str):
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     current_user = getattr(g, "current_user", None)
     household_id = getattr(current_user, "household_id", None)
     if not household_id:
@@ -353,15 +710,15 @@ def update_activity(activity_id: str):
             "end_date": payload.get("end_date", existing_schedule.end_date.isoformat()),
             "timezone": payload.get("timezone", existing_schedule.timezone),
             "weekdays": payload.get("weekdays", existing_schedule.recurrence_weekdays),
-            "start_time": payload.get("start_time", _format_time(existing_schedule.default_start_time)),
-            "end_time": payload.get("end_time", _format_time(existing_schedule.default_end_time)),
+            "start_time": payload.get("start_time", format_time(existing_schedule.default_start_time)),
+            "end_time": payload.get("end_time", format_time(existing_schedule.default_end_time)),
             "day_times": payload.get(
                 "day_times",
                 [
                     {
                         "weekday": dt.weekday,
-                        "start_time": _format_time(dt.start_time),
-                        "end_time": _format_time(dt.end_time),
+                        "start_time": format_time(dt.start_time),
+                        "end_time": format_time(dt.end_time),
                     }
                     for dt in existing_schedule.day_times
                 ],
@@ -392,6 +749,11 @@ def update_activity(activity_id: str):
                 )
             )
 
+        db.session.flush()
+        db.session.expire(activity.schedule, ["day_times"])
+        # Diff against existing instances so unchanged dates keep their rows (and references).
+        sync_instances(activity.schedule)
+
     if "kid_ids" in payload:
         kid_ids = payload.get("kid_ids") or []
         kids, err = _get_kids_for_enrollment(kid_ids, household_id)
@@ -417,6 +779,9 @@ def update_activity(activity_id: str):
         activity.longitude = longitude
 
     db.session.commit()
-    db.session.refresh(activity)
-    return json_response(_serialize_activity(activity))
+    invalidate_household_feed(household_id)
+    activity = load_activity(activity.id)
+    body = ACTIVITY(activity)
+    body["conflicts"] = conflicts_for_activity(activity)
+    return json_response(body)
 
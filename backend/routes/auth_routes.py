@@ -1,6 +1,6 @@
-from flask import Blueprint, request
+from flask import Blueprint
 
-from utils.helpers import json_response
+from utils.helpers import get_request_payload, json_response
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -8,7 +8,7 @@ auth_bp = Blueprint("auth", __name__)
 @auth_bp.route("/login", methods=["POST"])
 def login():
     # Firebase Auth should be handled on the client; this is a placeholder
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     return json_response(
         {
             "message": "Use Firebase client SDK to obtain ID token; send as Bearer token to protected endpoints.",
@@ -19,5 +19,5 @@ def login():
 
 @auth_bp.route("/register", methods=["POST"])
 def register():
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     return json_response({"message": "Registration handled via Firebase; ensure ID token is sent", "echo": payload})
@@ -1,10 +1,15 @@
-from flask import Blueprint, current_app, g, request
+from flask import Blueprint, Response, current_app, g, request, url_for
 
+from middleware.compression import compression_level
 from middleware.firebase_auth import auth_required
 from models import Household, db
+from models.serializers import HOUSEHOLD
+from services.calendar_feed import feed_token, household_feed, verify_feed_token
+from services.conflict_service import conflict_window, household_conflicts
+from services.geocoding_service import fill_coordinates
 from services.household_service import create_household, get_household_for_user
 from services.storage_service import generate_avatar_key, generate_presigned_upload
-from utils.helpers import error_response, json_response
+from utils.helpers import conditional_json_response, error_response, get_request_payload, json_response
 
 household_bp = Blueprint("households", __name__)
 
@@ -26,7 +31,7 @@ def _authorize_household_access(household_id: str, user):
 @household_bp.route("", methods=["POST"])
 @auth_required
 def create():
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     name = (payload.get("name") or "").strip()
     address = payload.get("address")
     phone = payload.get("phone")
@@ -39,6 +44,9 @@ def create():
     if not name:
         return error_response("name is required", status_code=400)
 
+    (latitude, longitude), err = fill_coordinates(address, latitude, longitude)
+    if err:
+        return error_response(err, status_code=400)
     household = create_household(
         name=name,
         address=address,
@@ -52,17 +60,7 @@ def create():
         current_user.household_id = household.id
         db.session.commit()
 
-    return json_response(
-        {
-            "id": household.id,
-            "name": household.name,
-            "address": household.address,
-            "phone": household.phone,
-            "latitude": household.latitude,
-            "longitude": household.longitude,
-        },
-        status_code=201,
-    )
+    return json_response(HOUSEHOLD(household), status_code=201)
 
 
 @household_bp.route("/me", methods=["GET"])
@@ -73,22 +71,13 @@ def get_my_household():
     if not household:
         return error_response("Household not found", status_code=404)
 
-    return json_response(
-        {
-            "id": household.id,
-            "name": household.name,
-            "address": household.address,
-            "phone": household.phone,
-            "latitude": household.latitude,
-            "longitude": household.longitude,
-        }
-    )
+    return conditional_json_response(HOUSEHOLD(household))
 
 
 @household_bp.route("/avatar/upload-url", methods=["POST"])
 @auth_required
 def household_avatar_upload_url():
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     provided_household_id = payload.get("household_id")
     content_type = payload.get("content_type")
     file_name = payload.get("file_name")
@@ -141,3 +130,56 @@ def get_household_avatar(household_id: str):
             "avatar_url": household.avatar_url,
         }
     )
+
+
+@household_bp.route("/<household_id>/calendar-feed", methods=["GET"])
+@auth_required
+def get_household_calendar_feed(household_id: str):
+    current_user = getattr(g, "current_user", None)
+    household, error = _authorize_household_access(household_id, current_user)
+    if error:
+        status = 404 if error == "Household not found" else 403 if "Not authorized" in error else 400
+        return error_response(error, status_code=status)
+
+    url = url_for(
+        "households.household_calendar_ics",
+        household_id=household.id,
+        token=feed_token(household.id),
+        _external=True,
+    )
+    return json_response({"household_id": household.id, "url": url})
+
+
+@household_bp.route("/<household_id>/conflicts", methods=["GET"])
+@auth_required
+def get_household_conflicts(household_id: str):
+    current_user = getattr(g, "current_user", None)
+    household, error = _authorize_household_access(household_id, current_user)
+    if error:
+        status = 404 if error == "Household not found" else 403 if "Not authorized" in error else 400
+        return error_response(error, status_code=status)
+
+    window, err = conflict_window(request.args.get("from"), request.args.get("to"))
+    if err:
+        return error_response(err, status_code=400)
+
+    return json_response(household_conflicts(household.id, *window))
+
+
+@household_bp.route("/<household_id>/calendar.ics", methods=["GET"])
+@compression_level(9, zstd_level=19)  # polled often and cached by ETag, so the slower levels pay off
+def household_calendar_ics(household_id: str):
+    # Calendar apps cannot send bearer tokens; the signed token in the URL is the credential.
+    if not verify_feed_token(household_id, request.args.get("token")):
+        return error_response("Calendar feed not found", status_code=404)
+
+    feed = household_feed(household_id)
+    if feed is None:
+        return error_response("Calendar feed not found", status_code=404)
+
+    response = Response(feed.body, mimetype="text/calendar")
+    response.set_etag(feed.etag)
+    response.last_modified = feed.last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
@@ -4,9 +4,20 @@ from flask import Blueprint, current_app, g, request
 
 from middleware.firebase_auth import auth_required
 from models import Kid, db
+from models.serializers import KID
+from services.conflict_service import conflict_window, kid_conflicts
 from services.kid_service import create_kid, list_kids_for_user
 from services.storage_service import generate_avatar_key, generate_presigned_upload
-from utils.helpers import error_response, json_response
+from utils.helpers import (
+    NEXT_CURSOR_HEADER,
+    conditional_json_response,
+    decode_cursor,
+    encode_cursor,
+    error_response,
+    get_request_payload,
+    json_response,
+    parse_limit,
+)
 
 kid_bp = Blueprint("kids", __name__)
 
@@ -24,7 +35,7 @@ def _kid_belongs_to_user(kid: Kid, user) -> bool:
 @kid_bp.route("", methods=["POST"])
 @auth_required
 def add_kid():
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     first_name = (payload.get("first_name") or "").strip()
     dob_raw = payload.get("dob")
     gender = payload.get("gender")
@@ -57,49 +68,43 @@ def add_kid():
         avatar_url=avatar_url,
     )
 
-    return json_response(
-        {
-            "id": str(kid.id),
-            "first_name": kid.first_name,
-            "gender": kid.gender,
-            "dob": kid.dob.isoformat() if kid.dob else None,
-            "household_id": kid.household_id,
-            "parent_user_id": kid.parent_user_id,
-            "avatar_url": kid.avatar_url,
-        },
-        status_code=201,
-    )
+    return json_response(KID(kid), status_code=201)
 
 
 @kid_bp.route("", methods=["GET"])
 @auth_required
 def list_kids():
     current_user = getattr(g, "current_user", None)
-    household_id = request.args.get("household_id") or getattr(current_user, "household_id", None)
+    own_household_id = getattr(current_user, "household_id", None)
+    household_id = request.args.get("household_id") or own_household_id
+    if household_id != own_household_id and not current_app.config.get("AUTH_DEV_BYPASS"):
+        return error_response("Not authorized for this household", status_code=403)
     parent_user_id = getattr(current_user, "id", None)
 
-    kids = list_kids_for_user(household_id=household_id, parent_user_id=parent_user_id)
-
-    return json_response(
-        [
-            {
-                "id": str(k.id),
-                "first_name": k.first_name,
-                "gender": k.gender,
-                "dob": k.dob.isoformat() if k.dob else None,
-                "household_id": k.household_id,
-                "parent_user_id": k.parent_user_id,
-                "avatar_url": k.avatar_url,
-            }
-            for k in kids
-        ]
+    limit, err = parse_limit(request.args.get("limit"))
+    if err:
+        return error_response(err, status_code=400)
+    after = None
+    if request.args.get("cursor"):
+        after, err = decode_cursor(request.args["cursor"])
+        if err:
+            return error_response(err, status_code=400)
+
+    kids, has_more = list_kids_for_user(
+        household_id=household_id, parent_user_id=parent_user_id, limit=limit, after=after
     )
 
+    headers = {}
+    if has_more:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(kids[-1].created_at, kids[-1].id)
+
+    return conditional_json_response(KID.many(kids), headers=headers)
+
 
 @kid_bp.route("/avatar/upload-url", methods=["POST"])
 @auth_required
 def kid_avatar_upload_url():
-    payload = request.get_json(silent=True) or {}
+    payload = get_request_payload() or {}
     kid_id = (payload.get("kid_id") or "").strip()
     content_type = payload.get("content_type")
     file_name = payload.get("file_name")
@@ -156,3 +161,20 @@ def get_kid_avatar(kid_id: str):
             "avatar_url": kid.avatar_url,
         }
     )
+
+
+@kid_bp.route("/<kid_id>/conflicts", methods=["GET"])
+@auth_required
+def get_kid_conflicts(kid_id: str):
+    current_user = getattr(g, "current_user", None)
+    kid = Kid.query.filter_by(id=kid_id).first()
+    if not kid:
+        return error_response("Kid not found", status_code=404)
+    if not _kid_belongs_to_user(kid, current_user):
+        return error_response("Not authorized for this kid", status_code=403)
+
+    window, err = conflict_window(request.args.get("from"), request.args.get("to"))
+    if err:
+        return error_response(err, status_code=400)
+
+    return json_response(kid_conflicts(kid.id, *window))
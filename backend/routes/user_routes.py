@@ -1,7 +1,8 @@
 from flask import Blueprint, g
 
 from middleware.firebase_auth import auth_required
-from utils.helpers import json_response
+from models.serializers import USER
+from utils.helpers import conditional_json_response, json_response
 
 user_bp = Blueprint("users", __name__)
 
@@ -13,13 +14,4 @@ def me():
     if not user:
         return json_response({"error": "User not found"}, status_code=404)
 
-    return json_response(
-        {
-            "id": str(user.id) if getattr(user, "id", None) else None,
-            "firebase_uid": user.firebase_uid,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "avatar_url": user.avatar_url,
-        }
-    )
+    return conditional_json_response(USER(user))
@@ -0,0 +1,153 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, insert, or_, select, tuple_
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+
+from models import Activity, ActivityDayTime, ActivitySchedule, Kid, KidActivityEnrollment, db
+from models.db import default_uuid
+from services.instance_service import materialize_new
+
+
+def activity_loader_options():
+    """Eager-load everything the ACTIVITY serializer touches: three queries regardless of enrollments."""
+    return (
+        joinedload(Activity.schedule).selectinload(ActivitySchedule.day_times),
+        selectinload(Activity.enrollments).joinedload(KidActivityEnrollment.kid),
+    )
+
+
+def load_activity(activity_id: str, household_id: Optional[str] = None) -> Optional[Activity]:
+    query = Activity.query.options(*activity_loader_options()).filter(Activity.id == activity_id)
+    if household_id is not None:
+        query = query.filter(Activity.household_id == household_id)
+    # populate_existing so a reload after commit replaces collections left stale by bulk deletes.
+    return query.execution_options(populate_existing=True).first()
+
+
+def accessible_activity_ids(household_id: str, activity_id: Optional[str] = None) -> List[str]:
+    """Activities the household owns or has a kid enrolled in, i.e. the carpools it belongs to."""
+    query = select(Activity.id).where(
+        or_(
+            Activity.household_id == household_id,
+            Activity.enrollments.any(KidActivityEnrollment.kid.has(Kid.household_id == household_id)),
+        )
+    )
+    if activity_id is not None:
+        query = query.where(Activity.id == activity_id)
+    return list(db.session.execute(query).scalars())
+
+
+def list_activities_for_household(
+    household_id: str,
+    *,
+    limit: int,
+    after: Optional[Tuple[datetime, str]] = None,
+    kid_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    schedule_type: Optional[str] = None,
+) -> Tuple[List[Activity], bool]:
+    """Return one keyset page ordered by (created_at, id) descending and whether more rows follow."""
+    query = Activity.query.options(*activity_loader_options()).filter(Activity.household_id == household_id)
+    if kid_id:
+        query = query.filter(Activity.enrollments.any(KidActivityEnrollment.kid_id == kid_id))
+
+    schedule_filters = []
+    if schedule_type:
+        schedule_filters.append(ActivitySchedule.schedule_type == schedule_type)
+    if date_from:
+        schedule_filters.append(ActivitySchedule.end_date >= date_from)
+    if date_to:
+        schedule_filters.append(ActivitySchedule.start_date <= date_to)
+    if schedule_filters:
+        query = query.filter(Activity.schedule.has(and_(*schedule_filters)))
+
+    if after is not None:
+        query = query.filter(tuple_(Activity.created_at, Activity.id) < tuple_(*after))
+
+    rows = query.order_by(Activity.created_at.desc(), Activity.id.desc()).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def list_scheduled_activities(household_id: str, date_from: date, date_to: date) -> List[Activity]:
+    """Household activities whose schedule overlaps [date_from, date_to], with schedules and day times loaded."""
+    return (
+        Activity.query.join(Activity.schedule)
+        .options(contains_eager(Activity.schedule).selectinload(ActivitySchedule.day_times))
+        .filter(
+            Activity.household_id == household_id,
+            ActivitySchedule.start_date <= date_to,
+            ActivitySchedule.end_date >= date_from,
+        )
+        .all()
+    )
+
+
+def bulk_insert_activities(
+    household_id: str, created_by_user_id: str, items: Sequence[Dict[str, Any]]
+) -> List[str]:
+    """Insert validated activities with one executemany INSERT per table and return their ids.
+
+    Each item carries the Activity columns plus ``schedule`` (the output of
+    activity_routes._validate_schedule) and ``kid_ids``. Ids are generated here rather than
+    by flushing, so no statement waits on another row's primary key. The caller commits.
+    """
+    now = datetime.utcnow()
+    activities, schedules, day_times, enrollments = [], [], [], []
+    for item in items:
+        activity_id, schedule_id = default_uuid(), default_uuid()
+        schedule = item["schedule"]
+        activities.append(
+            {
+                "id": activity_id,
+                "household_id": household_id,
+                "created_by_user_id": created_by_user_id,
+                "provider": item.get("provider"),
+                "name": item["name"],
+                "address": item.get("address"),
+                "location": item.get("location"),
+                "latitude": item.get("latitude"),
+                "longitude": item.get("longitude"),
+                "created_at": now,
+            }
+        )
+        schedules.append(
+            {
+                "id": schedule_id,
+                "activity_id": activity_id,
+                "schedule_type": schedule["schedule_type"],
+                "start_date": schedule["start_date"],
+                "end_date": schedule["end_date"],
+                "timezone": schedule["timezone"],
+                "default_start_time": schedule["default_start_time"],
+                "default_end_time": schedule["default_end_time"],
+                "recurrence_weekdays": schedule["weekdays"],
+                "created_at": now,
+            }
+        )
+        day_times.extend(
+            {"id": default_uuid(), "schedule_id": schedule_id, "created_at": now, **dt} for dt in schedule["day_times"]
+        )
+        enrollments.extend(
+            {"id": default_uuid(), "kid_id": kid_id, "activity_id": activity_id, "created_at": now}
+            for kid_id in dict.fromkeys(item["kid_ids"])
+        )
+
+    for model, rows in (
+        (Activity, activities),
+        (ActivitySchedule, schedules),
+        (ActivityDayTime, day_times),
+        (KidActivityEnrollment, enrollments),
+    ):
+        if rows:
+            db.session.execute(insert(model), rows)
+
+    activity_ids = [row["id"] for row in activities]
+    if activity_ids:
+        materialize_new(
+            ActivitySchedule.query.options(selectinload(ActivitySchedule.day_times))
+            .filter(ActivitySchedule.activity_id.in_(activity_ids))
+            .all()
+        )
+    return activity_ids
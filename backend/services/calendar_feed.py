@@ -0,0 +1,214 @@
+import hashlib
+import hmac
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from flask import Flask, current_app
+
+from models import Activity, Household, db
+from services.activity_service import list_scheduled_activities
+from services.schedule_service import get_zone, weekday_times
+from utils.cache import TTLCache
+
+ICS_WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+PRODID = "-//LyncWyze//Household Calendar//EN"
+
+
+class Feed(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def init_calendar_feed_cache(app: Flask) -> TTLCache:
+    # Per process, so the TTL bounds how stale another worker's copy can be after an edit.
+    cache = TTLCache(
+        max_size=app.config.get("CALENDAR_FEED_CACHE_MAX_SIZE", 2048),
+        default_ttl=app.config.get("CALENDAR_FEED_CACHE_TTL_SECONDS", 300),
+    )
+    app.extensions["calendar_feed_cache"] = cache
+    return cache
+
+
+def feed_token(household_id: str) -> str:
+    key = current_app.config["CALENDAR_FEED_SECRET"].encode("utf-8")
+    return hmac.new(key, f"calendar-feed:{household_id}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def verify_feed_token(household_id: str, token: Optional[str]) -> bool:
+    return bool(token) and hmac.compare_digest(feed_token(household_id), token)
+
+
+def invalidate_household_feed(household_id: Optional[str]) -> None:
+    cache = current_app.extensions.get("calendar_feed_cache")
+    if cache is not None and household_id:
+        cache.invalidate(household_id)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> List[str]:
+    # RFC 5545: content lines are at most 75 octets, continued with a leading space.
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return [line]
+    parts, limit = [], 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1  # never split a multi-byte character
+        parts.append(("" if not parts else " ") + encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74
+    return parts
+
+
+def _local_stamp(day: date, value: time) -> str:
+    return datetime.combine(day, value).strftime("%Y%m%dT%H%M%S")
+
+
+def _utc_stamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _utc_offset(value: timedelta) -> str:
+    sign = "-" if value < timedelta(0) else "+"
+    minutes, seconds = divmod(abs(int(value.total_seconds())), 60)
+    text = f"{sign}{minutes // 60:02d}{minutes % 60:02d}"
+    return f"{text}{seconds:02d}" if seconds else text
+
+
+def _transitions(tz: ZoneInfo, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    """(instant before, instant after) pairs, a second apart, around each UTC offset change in [start, end)."""
+    found = []
+    step = timedelta(days=1)
+    lo = start
+    while lo < end:
+        hi = min(lo + step, end)
+        if lo.astimezone(tz).utcoffset() != hi.astimezone(tz).utcoffset():
+            before, after = lo, hi
+            while after - before > timedelta(seconds=1):
+                mid = before + (after - before) / 2
+                if mid.astimezone(tz).utcoffset() == before.astimezone(tz).utcoffset():
+                    before = mid
+                else:
+                    after = mid
+            found.append((after - timedelta(seconds=1), after))
+        lo = hi
+    return found
+
+
+def _observance(local: datetime, offset_from: timedelta) -> List[str]:
+    """STANDARD/DAYLIGHT block for the period starting at ``local``; DTSTART is read in ``offset_from``."""
+    kind = "DAYLIGHT" if local.dst() else "STANDARD"
+    wall_clock = local.astimezone(timezone(offset_from)).replace(tzinfo=None)
+    lines = [
+        f"BEGIN:{kind}",
+        f"DTSTART:{wall_clock.strftime('%Y%m%dT%H%M%S')}",
+        f"TZOFFSETFROM:{_utc_offset(offset_from)}",
+        f"TZOFFSETTO:{_utc_offset(local.utcoffset())}",
+    ]
+    if local.tzname():
+        lines.append(f"TZNAME:{_escape(local.tzname())}")
+    lines.append(f"END:{kind}")
+    return lines
+
+
+def _vtimezone(tz: ZoneInfo, first: date, last: date) -> List[str]:
+    """VTIMEZONE for a TZID used between ``first`` and ``last``, listing every offset change in that span.
+
+    Clients that do not know the IANA name (or know an older version of it) read local times
+    against these rules rather than guessing.
+    """
+    start = datetime.combine(first - timedelta(days=1), time(), tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(last + timedelta(days=2), time(), tzinfo=tz).astimezone(timezone.utc)
+    initial = start.astimezone(tz)
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tz.key}"]
+    lines.extend(_observance(initial, initial.utcoffset()))
+    for before, after in _transitions(tz, start, end):
+        lines.extend(_observance(after.astimezone(tz), before.astimezone(tz).utcoffset()))
+    lines.append("END:VTIMEZONE")
+    return lines
+
+
+def _activity_events(activity: Activity, stamp: str) -> List[List[str]]:
+    schedule = activity.schedule
+    tz = get_zone(schedule.timezone)
+    # Days sharing the same times become one weekly VEVENT; per-day overrides get their own.
+    groups: Dict[Tuple[time, time], List[int]] = defaultdict(list)
+    for weekday, times in sorted(weekday_times(schedule).items()):
+        groups[times].append(weekday)
+
+    events = []
+    for (start_time, end_time), weekdays in groups.items():
+        offsets = [(weekday - schedule.start_date.weekday()) % 7 for weekday in weekdays]
+        first = schedule.start_date + timedelta(days=min(offsets))
+        if first > schedule.end_date:
+            continue
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{activity.id}-{''.join(ICS_WEEKDAYS[w] for w in weekdays)}@lyncwyze",
+            f"DTSTAMP:{stamp}",
+            f"SUMMARY:{_escape(activity.name)}",
+            f"DTSTART;TZID={tz.key}:{_local_stamp(first, start_time)}",
+            f"DTEND;TZID={tz.key}:{_local_stamp(first, end_time)}",
+        ]
+        location = activity.address or activity.location
+        if location:
+            lines.append(f"LOCATION:{_escape(location)}")
+        if schedule.schedule_type == "recurring" and schedule.end_date > first:
+            until = datetime.combine(schedule.end_date, time(23, 59, 59), tzinfo=tz)
+            lines.append(f"RRULE:FREQ=WEEKLY;BYDAY={','.join(ICS_WEEKDAYS[w] for w in weekdays)};UNTIL={_utc_stamp(until)}")
+        lines.append("END:VEVENT")
+        events.append(lines)
+    return events
+
+
+def render_household_feed(household: Household) -> Feed:
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    stamp = _utc_stamp(now)
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(household.name)}",
+    ]
+    activities = list_scheduled_activities(household.id, date.min, date.max)
+    # Every TZID referenced by a DTSTART/DTEND needs a matching VTIMEZONE (RFC 5545, 3.6.5).
+    spans: Dict[str, Tuple[date, date]] = {}
+    for activity in activities:
+        schedule = activity.schedule
+        key = get_zone(schedule.timezone).key
+        first, last = spans.get(key, (schedule.start_date, schedule.end_date))
+        spans[key] = (min(first, schedule.start_date), max(last, schedule.end_date))
+    for key in sorted(spans):
+        lines.extend(_vtimezone(ZoneInfo(key), *spans[key]))
+    for activity in sorted(activities, key=lambda a: (a.created_at, a.id)):
+        for event in _activity_events(activity, stamp):
+            lines.extend(event)
+    lines.append("END:VCALENDAR")
+
+    body = "".join(f"{folded}\r\n" for line in lines for folded in _fold(line)).encode("utf-8")
+    # DTSTAMP changes per render; hash without it so identical schedules keep the same ETag.
+    digest = hashlib.sha256(body.replace(stamp.encode("ascii"), b"")).hexdigest()
+    return Feed(body, digest, now)
+
+
+def household_feed(household_id: str) -> Optional[Feed]:
+    """Rendered feed for a household, served from the cache when possible."""
+    cache: TTLCache = current_app.extensions["calendar_feed_cache"]
+    feed = cache.get(household_id)
+    if feed is not None:
+        return feed
+    household = db.session.get(Household, household_id)
+    if household is None:
+        return None
+    feed = render_household_feed(household)
+    cache.set(household_id, feed)
+    return feed
@@ -0,0 +1,70 @@
+from datetime import date, timezone
+from typing import Dict, List, Tuple
+
+from models import ActivityInstance
+from services.activity_service import list_scheduled_activities
+from services.schedule_service import expand_schedules_columnar, format_local_isoformat, get_zone
+
+
+def household_calendar(household_id: str, date_from: date, date_to: date) -> List[Dict[str, object]]:
+    """Occurrences of a household's activities in [date_from, date_to], sorted by start.
+
+    Schedules materialized through the end of the window (or their own end date, if sooner) are
+    read from activity_instances in one range query; the rest are expanded on the fly.
+    """
+    activities = list_scheduled_activities(household_id, date_from, date_to)
+    materialized = {
+        a.id: a
+        for a in activities
+        if a.schedule.materialized_through is not None
+        and a.schedule.materialized_through >= min(date_to, a.schedule.end_date)
+    }
+    pending = [a for a in activities if a.id not in materialized]
+
+    rows: List[Tuple[object, Dict[str, object]]] = []
+    if materialized:
+        instances = (
+            ActivityInstance.query.filter(
+                ActivityInstance.activity_id.in_(list(materialized)),
+                ActivityInstance.occurrence_date >= date_from,
+                ActivityInstance.occurrence_date <= date_to,
+                ActivityInstance.cancelled_at.is_(None),
+            )
+            .order_by(ActivityInstance.start_at)
+            .all()
+        )
+        for instance in instances:
+            activity = materialized[instance.activity_id]
+            tz = get_zone(activity.schedule.timezone)
+            start = instance.start_at.replace(tzinfo=timezone.utc).astimezone(tz)
+            end = instance.end_at.replace(tzinfo=timezone.utc).astimezone(tz)
+            rows.append(
+                (
+                    (instance.start_at, activity.id),
+                    _row(activity, start.isoformat(), end.isoformat(), instance.id),
+                )
+            )
+
+    if pending:
+        expanded = expand_schedules_columnar([a.schedule for a in pending], date_from, date_to)
+        starts = format_local_isoformat(expanded.start_local, expanded.start_offset)
+        ends = format_local_isoformat(expanded.end_local, expanded.end_offset)
+        utc_starts = (expanded.start_local - expanded.start_offset).astype("datetime64[s]").tolist()
+        for index, utc_start, start, end in zip(expanded.activity_index.tolist(), utc_starts, starts, ends):
+            activity = pending[index]
+            rows.append(((utc_start, activity.id), _row(activity, start, end, None)))
+
+    rows.sort(key=lambda item: item[0])
+    return [row for _, row in rows]
+
+
+def _row(activity, start: str, end: str, instance_id) -> Dict[str, object]:
+    return {
+        "activity_id": activity.id,
+        "instance_id": instance_id,
+        "name": activity.name,
+        "date": start[:10],
+        "start": start,
+        "end": end,
+        "timezone": activity.schedule.timezone,
+    }
@@ -0,0 +1,139 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from models import ActivityInstance, Kid, KidActivityEnrollment, Vehicle, db
+
+
+class Car(NamedTuple):
+    vehicle_id: str
+    household_id: str
+    passenger_seats: int
+
+
+def _passenger_seats(seat_count: Optional[int]) -> int:
+    # One seat is the driver's.
+    return max(0, (seat_count or 0) - 1)
+
+
+def _household_cars(vehicles: Sequence[Vehicle]) -> Dict[str, Car]:
+    """Each household drives at most one car per trip: its largest."""
+    cars: Dict[str, Car] = {}
+    for vehicle in vehicles:
+        car = Car(vehicle.id, vehicle.household_id, _passenger_seats(vehicle.seat_count))
+        current = cars.get(vehicle.household_id)
+        if car.passenger_seats > 0 and (current is None or car.passenger_seats > current.passenger_seats):
+            cars[vehicle.household_id] = car
+    return cars
+
+
+def pack_kids(kids: Sequence[Kid], cars: Dict[str, Car]) -> Dict[str, object]:
+    """Seat kids using as few cars as possible.
+
+    Every kid takes one seat, so taking cars largest-first until the seats cover everyone is
+    optimal; kids then ride in their own household's car where one was picked.
+    """
+    households = {kid.household_id for kid in kids}
+    available = [cars[h] for h in households if h in cars]
+    kids_per_household: Dict[str, int] = defaultdict(int)
+    for kid in kids:
+        kids_per_household[kid.household_id] += 1
+    available.sort(key=lambda c: (-c.passenger_seats, -kids_per_household[c.household_id], c.vehicle_id))
+
+    chosen: List[Car] = []
+    seats = 0
+    for car in available:
+        if seats >= len(kids):
+            break
+        chosen.append(car)
+        seats += car.passenger_seats
+
+    loads: Dict[str, List[str]] = {car.vehicle_id: [] for car in chosen}
+    by_household = {car.household_id: car for car in chosen}
+    waiting: List[Kid] = []
+    for kid in sorted(kids, key=lambda k: k.id):
+        car = by_household.get(kid.household_id)
+        if car is not None and len(loads[car.vehicle_id]) < car.passenger_seats:
+            loads[car.vehicle_id].append(kid.id)
+        else:
+            waiting.append(kid)
+
+    unplaced = []
+    for kid in waiting:
+        car = next((c for c in chosen if len(loads[c.vehicle_id]) < c.passenger_seats), None)
+        if car is not None:
+            loads[car.vehicle_id].append(kid.id)
+            continue
+        if not available:
+            reason = "No participating household has a vehicle with seat_count set"
+        else:
+            reason = f"Not enough seats: {len(kids)} kids, {seats} passenger seats across {len(chosen)} vehicles"
+        unplaced.append({"kid_id": kid.id, "reason": reason})
+
+    return {
+        "cars": [
+            {
+                "vehicle_id": car.vehicle_id,
+                "household_id": car.household_id,
+                "passenger_seats": car.passenger_seats,
+                "kid_ids": loads[car.vehicle_id],
+            }
+            for car in chosen
+            if loads[car.vehicle_id]
+        ],
+        "unplaced": unplaced,
+    }
+
+
+def plan_capacity(activity_ids: Sequence[str], date_from: date, date_to: date) -> List[Dict[str, object]]:
+    """Seat plans for every live instance of the given activities in [date_from, date_to].
+
+    Three queries regardless of how many instances the window holds: instances, enrollments
+    with their kids, and vehicles of every household those kids belong to.
+    """
+    activity_ids = list(activity_ids)
+    if not activity_ids:
+        return []
+
+    instances = (
+        ActivityInstance.query.filter(
+            ActivityInstance.activity_id.in_(activity_ids),
+            ActivityInstance.occurrence_date >= date_from,
+            ActivityInstance.occurrence_date <= date_to,
+            ActivityInstance.cancelled_at.is_(None),
+        )
+        .order_by(ActivityInstance.start_at, ActivityInstance.id)
+        .all()
+    )
+    if not instances:
+        return []
+
+    kids_by_activity: Dict[str, List[Kid]] = defaultdict(list)
+    rows = (
+        db.session.query(KidActivityEnrollment.activity_id, Kid)
+        .join(Kid, Kid.id == KidActivityEnrollment.kid_id)
+        .filter(KidActivityEnrollment.activity_id.in_({i.activity_id for i in instances}))
+        .all()
+    )
+    for activity_id, kid in rows:
+        kids_by_activity[activity_id].append(kid)
+
+    household_ids = {kid.household_id for kids in kids_by_activity.values() for kid in kids if kid.household_id}
+    vehicles = Vehicle.query.filter(Vehicle.household_id.in_(household_ids)).all() if household_ids else []
+    cars = _household_cars(vehicles)
+
+    # Instances of one activity share the same kids, so pack once per activity.
+    packed: Dict[str, Dict[str, object]] = {}
+    plans = []
+    for instance in instances:
+        if instance.activity_id not in packed:
+            packed[instance.activity_id] = pack_kids(kids_by_activity.get(instance.activity_id, []), cars)
+        plans.append(
+            {
+                "instance_id": instance.id,
+                "activity_id": instance.activity_id,
+                "date": instance.occurrence_date.isoformat(),
+                **packed[instance.activity_id],
+            }
+        )
+    return plans
@@ -0,0 +1,154 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
+
+from models import Activity, ActivitySchedule, Kid, KidActivityEnrollment, db
+from services.schedule_service import expand_schedules_columnar
+
+DEFAULT_CONFLICT_DAYS = 180
+MAX_CONFLICT_DAYS = 366
+
+
+def conflict_window(
+    date_from: Optional[str], date_to: Optional[str], today: Optional[date] = None
+) -> Tuple[Optional[Tuple[date, date]], Optional[str]]:
+    """Parse optional ``from``/``to`` query values into an inclusive window, defaulting to today onwards."""
+    today = today or datetime.utcnow().date()
+    try:
+        start = date.fromisoformat(date_from) if date_from else today
+        end = date.fromisoformat(date_to) if date_to else start + timedelta(days=DEFAULT_CONFLICT_DAYS - 1)
+    except ValueError:
+        return None, "from and to must be ISO dates (YYYY-MM-DD)"
+    if end < start:
+        return None, "to cannot be before from"
+    if (end - start).days >= MAX_CONFLICT_DAYS:
+        return None, f"Conflict window cannot exceed {MAX_CONFLICT_DAYS} days"
+    return (start, end), None
+
+
+def _default_window(from_date: Optional[date], to_date: Optional[date]) -> Tuple[date, date]:
+    from_date = from_date or datetime.utcnow().date()
+    return from_date, to_date or from_date + timedelta(days=DEFAULT_CONFLICT_DAYS - 1)
+
+
+def _format_seconds(value: int) -> str:
+    return "{:02d}:{:02d}".format(*divmod(value % 86400 // 60, 60))
+
+
+def find_conflicts(
+    activities: Sequence[Activity], from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> List[Dict[str, object]]:
+    """Overlapping slots between activities with an occurrence in [from_date, to_date].
+
+    Schedules are expanded into concrete occurrences and compared in UTC, so activities in
+    different timezones and weeks either side of a DST change are handled exactly. The expansion
+    is already sorted by UTC start, so one sweep with an active list pruned by end time finds every
+    overlap. Repeats of the same overlap are folded into one entry per (pair, weekday, local times)
+    with the first and last dates it happens on; times and dates are in the first activity's
+    timezone. Slots that only touch (one ends as the other starts) do not conflict.
+    """
+    from_date, to_date = _default_window(from_date, to_date)
+    activities = [activity for activity in activities if activity.schedule is not None]
+    expanded = expand_schedules_columnar([activity.schedule for activity in activities], from_date, to_date)
+    index = expanded.activity_index.tolist()
+    start_offset = expanded.start_offset.tolist()
+    starts = (expanded.start_local - expanded.start_offset).tolist()
+    ends = (expanded.end_local - expanded.end_offset).tolist()
+
+    conflicts: Dict[tuple, Dict[str, object]] = {}
+    active: List[int] = []
+    for current in range(len(index)):
+        active = [other for other in active if ends[other] > starts[current]]
+        for other in active:
+            if index[other] == index[current]:
+                continue
+            first, second = sorted((other, current), key=lambda i: activities[index[i]].id)
+            # Express the overlap in the first activity's wall-clock time.
+            overlap_start = max(starts[other], starts[current]) + start_offset[first]
+            overlap_end = min(ends[other], ends[current]) + start_offset[first]
+            occurred_on = date.fromordinal(date(1970, 1, 1).toordinal() + overlap_start // 86400)
+            first_activity, second_activity = activities[index[first]], activities[index[second]]
+            key = (
+                first_activity.id,
+                second_activity.id,
+                occurred_on.weekday(),
+                _format_seconds(overlap_start),
+                _format_seconds(overlap_end),
+            )
+            existing = conflicts.get(key)
+            if existing is None:
+                conflicts[key] = {
+                    "activity_id": first_activity.id,
+                    "activity_name": first_activity.name,
+                    "other_activity_id": second_activity.id,
+                    "other_activity_name": second_activity.name,
+                    "weekday": key[2],
+                    "overlap_start": key[3],
+                    "overlap_end": key[4],
+                    "first_date": occurred_on.isoformat(),
+                    "last_date": occurred_on.isoformat(),
+                }
+            else:
+                existing["last_date"] = max(existing["last_date"], occurred_on.isoformat())
+                existing["first_date"] = min(existing["first_date"], occurred_on.isoformat())
+        active.append(current)
+    return sorted(
+        conflicts.values(),
+        key=lambda c: (c["first_date"], c["activity_id"], c["other_activity_id"], c["overlap_start"]),
+    )
+
+
+def _enrolled_activities(kid_ids, from_date: date, to_date: date) -> Dict[str, List[Activity]]:
+    """Activities per kid overlapping the window; ``kid_ids`` is a list of ids or a SELECT of them."""
+    rows = (
+        db.session.query(KidActivityEnrollment.kid_id, Activity)
+        .join(Activity, Activity.id == KidActivityEnrollment.activity_id)
+        .join(Activity.schedule)
+        .options(contains_eager(Activity.schedule).selectinload(ActivitySchedule.day_times))
+        .filter(
+            KidActivityEnrollment.kid_id.in_(kid_ids),
+            ActivitySchedule.end_date >= from_date,
+            ActivitySchedule.start_date <= to_date,
+        )
+        .all()
+    )
+    by_kid: Dict[str, List[Activity]] = defaultdict(list)
+    for kid_id, activity in rows:
+        by_kid[kid_id].append(activity)
+    return by_kid
+
+
+def kid_conflicts(
+    kid_id: str, from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> List[Dict[str, object]]:
+    from_date, to_date = _default_window(from_date, to_date)
+    return find_conflicts(_enrolled_activities([kid_id], from_date, to_date).get(kid_id, []), from_date, to_date)
+
+
+def household_conflicts(
+    household_id: str, from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> List[Dict[str, object]]:
+    """Conflicts for every kid in the household, tagged with ``kid_id``; one query for all kids."""
+    from_date, to_date = _default_window(from_date, to_date)
+    kid_ids = select(Kid.id).where(Kid.household_id == household_id)
+    conflicts = []
+    for kid_id, activities in sorted(_enrolled_activities(kid_ids, from_date, to_date).items()):
+        conflicts.extend({"kid_id": kid_id, **conflict} for conflict in find_conflicts(activities, from_date, to_date))
+    return conflicts
+
+
+def conflicts_for_activity(activity: Activity, from_date: Optional[date] = None) -> List[Dict[str, object]]:
+    """Conflicts between activity and anything else its enrolled kids attend, one query for all kids."""
+    from_date, to_date = _default_window(from_date, None)
+    kid_ids = [enrollment.kid_id for enrollment in activity.enrollments]
+    if not kid_ids:
+        return []
+    warnings = []
+    for kid_id, activities in _enrolled_activities(kid_ids, from_date, to_date).items():
+        for conflict in find_conflicts(activities, from_date, to_date):
+            if activity.id in (conflict["activity_id"], conflict["other_activity_id"]):
+                warnings.append({"kid_id": kid_id, **conflict})
+    return warnings
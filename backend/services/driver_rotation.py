@@ -0,0 +1,262 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from models import ActivityInstance, ActivitySchedule, Kid, KidActivityEnrollment
+from services.schedule_service import get_zone
+
+TO_LEG = "to"
+FROM_LEG = "from"
+DEFAULT_LEG_MINUTES = 30
+
+
+class AvailabilitySlot(NamedTuple):
+    """A household can drive on ``weekday`` (0 = Monday) between ``start`` and ``end`` local time."""
+
+    household_id: str
+    weekday: int
+    start: time
+    end: time
+
+
+class Leg(NamedTuple):
+    instance_id: str
+    activity_id: str
+    date: date
+    direction: str
+    weekday: int
+    start_minute: int  # local wall-clock window the driver must cover
+    end_minute: int
+
+
+class Assignment(NamedTuple):
+    instance_id: str
+    date: date
+    direction: str
+    household_id: str
+
+
+class RotationPlan(NamedTuple):
+    assignments: List[Assignment]
+    unassigned: List[Leg]
+    load: Dict[str, int]  # legs per household, history included
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _local(value: datetime, tz) -> datetime:
+    return value.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def legs_for_instances(
+    instances: Iterable[ActivityInstance], tz_name: Optional[str], leg_minutes: int = DEFAULT_LEG_MINUTES
+) -> List[Leg]:
+    """A drop-off leg ending at each instance's start and a pick-up leg starting at its end."""
+    tz = get_zone(tz_name)
+    legs = []
+    for instance in instances:
+        if instance.cancelled_at is not None:
+            continue
+        start = _local(instance.start_at, tz)
+        end = _local(instance.end_at, tz)
+        start_minute = start.hour * 60 + start.minute
+        end_minute = end.hour * 60 + end.minute
+        legs.append(
+            Leg(
+                instance.id,
+                instance.activity_id,
+                instance.occurrence_date,
+                TO_LEG,
+                start.weekday(),
+                max(0, start_minute - leg_minutes),
+                start_minute,
+            )
+        )
+        legs.append(
+            Leg(
+                instance.id,
+                instance.activity_id,
+                instance.occurrence_date,
+                FROM_LEG,
+                end.weekday(),
+                end_minute,
+                min(24 * 60, end_minute + leg_minutes),
+            )
+        )
+    return legs
+
+
+def load_legs(
+    activity_id: str, date_from: date, date_to: date, leg_minutes: int = DEFAULT_LEG_MINUTES
+) -> List[Leg]:
+    schedule = ActivitySchedule.query.filter_by(activity_id=activity_id).first()
+    instances = (
+        ActivityInstance.query.filter(
+            ActivityInstance.activity_id == activity_id,
+            ActivityInstance.occurrence_date >= date_from,
+            ActivityInstance.occurrence_date <= date_to,
+            ActivityInstance.cancelled_at.is_(None),
+        )
+        .order_by(ActivityInstance.start_at)
+        .all()
+    )
+    return legs_for_instances(instances, schedule.timezone if schedule else None, leg_minutes)
+
+
+def _windows(availability: Iterable[AvailabilitySlot]) -> Dict[str, Dict[int, List[Tuple[int, int]]]]:
+    windows: Dict[str, Dict[int, List[Tuple[int, int]]]] = defaultdict(lambda: defaultdict(list))
+    for slot in availability:
+        end = _minutes(slot.end) or 24 * 60
+        windows[slot.household_id][slot.weekday].append((_minutes(slot.start), end))
+    return windows
+
+
+def _eligible(
+    leg: Leg,
+    windows: Dict[str, Dict[int, List[Tuple[int, int]]]],
+    households: Sequence[str],
+    blocked: Set[Tuple[str, date]],
+) -> List[str]:
+    return [
+        household_id
+        for household_id in households
+        if (household_id, leg.date) not in blocked
+        and any(
+            start <= leg.start_minute and leg.end_minute <= end
+            for start, end in windows.get(household_id, {}).get(leg.weekday, ())
+        )
+    ]
+
+
+def _assign(
+    legs: Sequence[Leg],
+    windows: Dict[str, Dict[int, List[Tuple[int, int]]]],
+    households: Sequence[str],
+    blocked: Set[Tuple[str, date]],
+    load: Dict[str, int],
+    driving_on: Dict[Tuple[str, date], int],
+) -> Tuple[List[Assignment], List[Leg]]:
+    options = {leg: _eligible(leg, windows, households, blocked) for leg in legs}
+    assignments: List[Assignment] = []
+    unassigned: List[Leg] = []
+    # Most constrained legs first so flexible households are not used up on legs anyone could drive.
+    for leg in sorted(legs, key=lambda l: (len(options[l]), l.date, l.start_minute, l.direction)):
+        candidates = options[leg]
+        if not candidates:
+            unassigned.append(leg)
+            continue
+        # Fewest legs so far wins; prefer households not already driving that day, then a stable order.
+        household_id = min(candidates, key=lambda h: (load[h], driving_on[(h, leg.date)], h))
+        load[household_id] += 1
+        driving_on[(household_id, leg.date)] += 1
+        assignments.append(Assignment(leg.instance_id, leg.date, leg.direction, household_id))
+    return assignments, unassigned
+
+
+def _sorted_plan(assignments: List[Assignment], unassigned: List[Leg], load: Dict[str, int]) -> RotationPlan:
+    assignments.sort(key=lambda a: (a.date, a.direction != TO_LEG, a.instance_id))
+    unassigned.sort(key=lambda l: (l.date, l.direction != TO_LEG, l.instance_id))
+    return RotationPlan(assignments, unassigned, dict(load))
+
+
+def plan_rotation(
+    legs: Sequence[Leg],
+    households: Sequence[str],
+    availability: Iterable[AvailabilitySlot],
+    history: Optional[Dict[str, int]] = None,
+    blocked_dates: Iterable[Tuple[str, date]] = (),
+) -> RotationPlan:
+    """Assign a driving household to every leg without violating anyone's availability.
+
+    ``history`` holds legs each household already drove (earlier in the season), so load evens
+    out across re-plans. ``blocked_dates`` are (household_id, date) pairs a family cannot drive.
+    Legs nobody can cover come back in ``unassigned`` rather than being forced onto someone.
+    """
+    load: Dict[str, int] = defaultdict(int, {h: (history or {}).get(h, 0) for h in households})
+    assignments, unassigned = _assign(
+        legs, _windows(availability), list(households), set(blocked_dates), load, defaultdict(int)
+    )
+    return _sorted_plan(assignments, unassigned, load)
+
+
+def replan_without(
+    plan: RotationPlan,
+    legs: Sequence[Leg],
+    households: Sequence[str],
+    availability: Iterable[AvailabilitySlot],
+    household_id: str,
+    dropped_date: date,
+    blocked_dates: Iterable[Tuple[str, date]] = (),
+) -> RotationPlan:
+    """Re-plan after ``household_id`` drops ``dropped_date``, moving only the legs it gave up.
+
+    Every other assignment is kept as is; freed legs (plus any still-unassigned legs, which the
+    change cannot make harder) go through the same greedy pass with current loads.
+    """
+    blocked = set(blocked_dates)
+    blocked.add((household_id, dropped_date))
+    load: Dict[str, int] = defaultdict(int, plan.load)
+    driving_on: Dict[Tuple[str, date], int] = defaultdict(int)
+
+    kept: List[Assignment] = []
+    freed: Set[Tuple[str, str]] = set()
+    for assignment in plan.assignments:
+        if assignment.household_id == household_id and assignment.date == dropped_date:
+            load[household_id] -= 1
+            freed.add((assignment.instance_id, assignment.direction))
+        else:
+            kept.append(assignment)
+            driving_on[(assignment.household_id, assignment.date)] += 1
+
+    pending = [leg for leg in legs if (leg.instance_id, leg.direction) in freed]
+    pending.extend(plan.unassigned)
+    assignments, unassigned = _assign(pending, _windows(availability), list(households), blocked, load, driving_on)
+    return _sorted_plan(kept + assignments, unassigned, load)
+
+
+def participating_households(activity_id: str) -> List[str]:
+    """Households with at least one kid enrolled in the activity: the carpool's members."""
+    rows = (
+        Kid.query.with_entities(Kid.household_id)
+        .join(KidActivityEnrollment, KidActivityEnrollment.kid_id == Kid.id)
+        .filter(KidActivityEnrollment.activity_id == activity_id, Kid.household_id.isnot(None))
+        .distinct()
+        .all()
+    )
+    return sorted(row.household_id for row in rows)
+
+
+def rotation_for_activity(
+    activity_id: str,
+    date_from: date,
+    date_to: date,
+    availability: Iterable[AvailabilitySlot],
+    history: Optional[Dict[str, int]] = None,
+    blocked_dates: Iterable[Tuple[str, date]] = (),
+) -> Dict[str, object]:
+    """Plan drivers for the activity's instances in [date_from, date_to] among its member households."""
+    plan = plan_rotation(
+        load_legs(activity_id, date_from, date_to),
+        participating_households(activity_id),
+        availability,
+        history,
+        blocked_dates,
+    )
+    return {
+        "assignments": [
+            {
+                "instance_id": a.instance_id,
+                "date": a.date.isoformat(),
+                "direction": a.direction,
+                "household_id": a.household_id,
+            }
+            for a in plan.assignments
+        ],
+        "unassigned": [
+            {"instance_id": leg.instance_id, "date": leg.date.isoformat(), "direction": leg.direction}
+            for leg in plan.unassigned
+        ],
+        "load": plan.load,
+    }
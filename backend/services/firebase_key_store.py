@@ -0,0 +1,151 @@
+import json
+import logging
+import re
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+FIREBASE_ISSUER_PREFIX = "https://securetoken.google.com/"
+
+logger = logging.getLogger(__name__)
+
+
+class FirebaseKeyStore:
+    """In-memory copy of Google's Firebase signing keys, refreshed ahead of expiry on a daemon thread."""
+
+    def __init__(
+        self,
+        project_id: str,
+        *,
+        jwks_url: str = GOOGLE_JWKS_URL,
+        jwks_path: Optional[str] = None,
+        refresh_margin: int = 300,
+        min_refresh_interval: int = 60,
+        default_max_age: int = 3600,
+        clock_skew: int = 10,
+        fetch_timeout: float = 5,
+    ):
+        self.project_id = project_id
+        self.jwks_url = jwks_url
+        self.jwks_path = jwks_path
+        self.refresh_margin = refresh_margin
+        self.min_refresh_interval = min_refresh_interval
+        self.default_max_age = default_max_age
+        self.clock_skew = clock_skew
+        self.fetch_timeout = fetch_timeout
+
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch(self) -> Tuple[Dict[str, Any], int]:
+        if self.jwks_path:
+            with open(self.jwks_path, "r", encoding="utf-8") as fh:
+                return json.load(fh), self.default_max_age
+
+        with urllib.request.urlopen(self.jwks_url, timeout=self.fetch_timeout) as resp:  # noqa: S310
+            body = json.loads(resp.read().decode("utf-8"))
+            cache_control = resp.headers.get("Cache-Control", "")
+        match = re.search(r"max-age=(\d+)", cache_control)
+        max_age = int(match.group(1)) if match else self.default_max_age
+        return body, max_age
+
+    def refresh(self) -> int:
+        """Reload the key set and return the number of seconds until the next refresh."""
+        jwks, max_age = self._fetch()
+        keys = {}
+        for jwk in jwt.PyJWKSet.from_dict(jwks).keys:
+            if jwk.key_id:
+                keys[jwk.key_id] = jwk.key
+        with self._lock:
+            self._keys = keys
+            self._expires_at = time.time() + max_age
+            self._last_refresh = time.time()
+        logger.info("Loaded %d Firebase signing keys (max-age=%ss)", len(keys), max_age)
+        return max(self.min_refresh_interval, max_age - self.refresh_margin)
+
+    def _run(self, delay: float) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(timeout=delay)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                delay = self.refresh()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Firebase signing key refresh failed: %s", exc)
+                delay = self.min_refresh_interval
+
+    def start(self) -> None:
+        """Start refreshing in the background; app boot never waits on Google.
+
+        A local JWKS file is read up front since it cannot stall. Until the first network fetch
+        lands, verify() returns None and callers fall back to firebase_admin.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        delay = 0.0
+        if self.jwks_path:
+            try:
+                delay = self.refresh()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Initial Firebase signing key load failed: %s", exc)
+                delay = self.min_refresh_interval
+
+        self._thread = threading.Thread(
+            target=self._run, args=(delay,), name="firebase-key-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+
+    def request_refresh(self) -> None:
+        # Tokens carrying bogus key ids must not be able to hammer Google's endpoint.
+        if time.time() - self._last_refresh >= self.min_refresh_interval:
+            self._wake.set()
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify an RS256 Firebase ID token against the cached keys.
+
+        Returns None when the token's key id is unknown (or no keys are loaded) so the
+        caller can fall back to firebase_admin; raises jwt.InvalidTokenError otherwise.
+        """
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != "RS256":
+            raise jwt.InvalidAlgorithmError("Firebase ID tokens must be signed with RS256")
+
+        with self._lock:
+            key = self._keys.get(header.get("kid"))
+            stale = time.time() >= self._expires_at
+        if stale or key is None:
+            self.request_refresh()
+        if key is None:
+            return None
+
+        decoded = jwt.decode(
+            token,
+            key=key,
+            algorithms=["RS256"],
+            audience=self.project_id,
+            issuer=f"{FIREBASE_ISSUER_PREFIX}{self.project_id}",
+            leeway=self.clock_skew,
+            options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+        )
+        sub = decoded.get("sub")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise jwt.InvalidTokenError("Firebase ID token has an invalid subject")
+        auth_time = decoded.get("auth_time")
+        if isinstance(auth_time, (int, float)) and auth_time > time.time() + self.clock_skew:
+            raise jwt.ImmatureSignatureError("Firebase ID token auth_time is in the future")
+        decoded["uid"] = sub
+        return decoded
@@ -0,0 +1,48 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_
+
+from models import Household, db
+from utils.distance import as_coordinates, haversine_one_to_many, top_k
+from utils.geohash import covering_cells
+
+
+def _prefix_clause(prefix: str):
+    column = Household.geohash
+    if db.session.get_bind(mapper=Household).dialect.name == "sqlite":
+        # SQLite's LIKE is case-insensitive and skips BINARY indexes; GLOB is index-friendly.
+        return column.op("GLOB")(prefix + "*")
+    return column.like(prefix + "%")
+
+
+def households_near(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    *,
+    limit: int,
+    exclude_household_id: Optional[str] = None,
+) -> List[Dict[str, object]]:
+    """Households within radius_km of a point, nearest first.
+
+    Candidate rows come from index range scans over the geohash cells covering the circle's
+    bounding box; candidates are then scored in one vectorized pass.
+    """
+    cells = covering_cells(latitude, longitude, radius_km)
+    query = db.session.query(Household.id, Household.name, Household.latitude, Household.longitude).filter(
+        Household.geohash.isnot(None),
+        or_(*[_prefix_clause(cell) for cell in cells]),
+    )
+    if exclude_household_id:
+        query = query.filter(Household.id != exclude_household_id)
+
+    rows = query.all()
+    if not rows:
+        return []
+    ids, names, lats, lons = zip(*rows)
+    distances = haversine_one_to_many(latitude, longitude, as_coordinates(lats), as_coordinates(lons))
+    indices, nearest = top_k(distances, limit, max_distance=radius_km)
+    return [
+        {"household_id": ids[i], "name": names[i], "distance_km": round(d, 3)}
+        for i, d in zip(indices.tolist(), nearest.tolist())
+    ]
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import GeocodeCache, db
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+_MISSING = object()
+
+_ABBREVIATIONS = {
+    "apartment": "apt",
+    "avenue": "ave",
+    "av": "ave",
+    "boulevard": "blvd",
+    "building": "bldg",
+    "circle": "cir",
+    "court": "ct",
+    "drive": "dr",
+    "east": "e",
+    "floor": "fl",
+    "highway": "hwy",
+    "lane": "ln",
+    "north": "n",
+    "northeast": "ne",
+    "northwest": "nw",
+    "parkway": "pkwy",
+    "place": "pl",
+    "road": "rd",
+    "south": "s",
+    "southeast": "se",
+    "southwest": "sw",
+    "square": "sq",
+    "street": "st",
+    "suite": "ste",
+    "terrace": "ter",
+    "west": "w",
+}
+_NON_WORD = re.compile(r"[^\w#]+")
+
+
+def normalize_address(address: Optional[str]) -> str:
+    """Cache key form of an address: case-folded, punctuation and whitespace collapsed, common
+    street-type and direction words abbreviated ("123 Main Street, N." == "123 main st n")."""
+    if not address:
+        return ""
+    text = unicodedata.normalize("NFKC", address).casefold()
+    tokens = _NON_WORD.sub(" ", text).split()
+    return " ".join(_ABBREVIATIONS.get(token, token) for token in tokens)
+
+
+def address_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class GeocodingProvider(ABC):
+    name = "base"
+
+    @abstractmethod
+    def geocode(self, normalized_address: str) -> Optional[Coordinates]:
+        """Coordinates for a normalized address, or None when the provider does not know it."""
+
+
+class FileGeocodingProvider(GeocodingProvider):
+    """Looks addresses up in a JSON file of ``{"address": [lat, lon]}`` (or ``{"latitude", "longitude"}``)."""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8") as fh:
+            raw = json.load(fh)
+        self._entries: Dict[str, Coordinates] = {}
+        for address, value in raw.items():
+            if isinstance(value, dict):
+                value = (value.get("latitude"), value.get("longitude"))
+            self._entries[normalize_address(address)] = (float(value[0]), float(value[1]))
+
+    def geocode(self, normalized_address: str) -> Optional[Coordinates]:
+        return self._entries.get(normalized_address)
+
+
+PROVIDERS = {FileGeocodingProvider.name: FileGeocodingProvider}
+
+
+def _build_provider(app: Flask) -> Optional[GeocodingProvider]:
+    name = app.config.get("GEOCODER_PROVIDER") or FileGeocodingProvider.name
+    if name == FileGeocodingProvider.name:
+        path = app.config.get("GEOCODER_FILE_PATH")
+        if not path:
+            app.logger.info("GEOCODER_FILE_PATH not set; addresses will not be geocoded")
+            return None
+        try:
+            return FileGeocodingProvider(path)
+        except (OSError, ValueError, TypeError, IndexError) as exc:
+            app.logger.warning("Could not load geocoder file %s: %s", path, exc)
+            return None
+    app.logger.warning("Unknown GEOCODER_PROVIDER %r; addresses will not be geocoded", name)
+    return None
+
+
+def init_geocoding(app: Flask, provider: Optional[GeocodingProvider] = None) -> None:
+    app.extensions["geocoder"] = provider or _build_provider(app)
+    app.extensions["geocode_cache"] = TTLCache(max_size=app.config.get("GEOCODE_CACHE_MAX_SIZE", 10000))
+
+
+_inflight: Dict[str, threading.Lock] = {}
+_inflight_guard = threading.Lock()
+
+
+@contextmanager
+def _single_flight(key: str) -> Iterator[None]:
+    # Concurrent lookups of the same new address wait for the first one instead of all calling out.
+    with _inflight_guard:
+        lock = _inflight.setdefault(key, threading.Lock())
+    with lock:
+        try:
+            yield
+        finally:
+            with _inflight_guard:
+                if _inflight.get(key) is lock:
+                    del _inflight[key]
+
+
+def _negative_ttl() -> int:
+    return int(current_app.config.get("GEOCODE_NEGATIVE_TTL_SECONDS", 86400))
+
+
+def _from_row(row: GeocodeCache) -> Optional[Coordinates]:
+    if row.latitude is None or row.longitude is None:
+        return None
+    return row.latitude, row.longitude
+
+
+def _remember(cache: TTLCache, key: str, result: Optional[Coordinates]) -> None:
+    cache.set(key, result, ttl=None if result is not None else _negative_ttl())
+
+
+def _store(key: str, normalized: str, provider: str, result: Optional[Coordinates]) -> None:
+    """Write the answer on its own connection so it survives a rollback of the request's transaction."""
+    latitude, longitude = result if result is not None else (None, None)
+    values = {"latitude": latitude, "longitude": longitude, "provider": provider, "cached_at": datetime.utcnow()}
+    try:
+        with Session(db.engine) as session, session.begin():
+            updated = session.execute(
+                update(GeocodeCache).where(GeocodeCache.address_hash == key).values(**values)
+            ).rowcount
+            if not updated:
+                session.add(GeocodeCache(address=normalized, address_hash=key, **values))
+    except IntegrityError:
+        # Another worker cached the same address first; its row is as good as ours.
+        pass
+    except SQLAlchemyError as exc:
+        # The in-process cache still has the answer; the table is only a shared second level.
+        logger.warning("Could not cache geocode for %r: %s", normalized, exc)
+
+
+def geocode(address: Optional[str]) -> Optional[Coordinates]:
+    """(latitude, longitude) for a free-text address, or None.
+
+    Lookups go LRU -> geocoding_cache table -> provider, and every provider answer, including
+    "not found", is written back to both caches, so a repeated address reaches the provider at
+    most once (misses are retried after GEOCODE_NEGATIVE_TTL_SECONDS).
+    """
+    normalized = normalize_address(address)
+    if not normalized or not has_app_context():
+        return None
+    cache: TTLCache = current_app.extensions["geocode_cache"]
+    provider: Optional[GeocodingProvider] = current_app.extensions.get("geocoder")
+
+    key = address_hash(normalized)
+    cached = cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    with _single_flight(key):
+        cached = cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        row = GeocodeCache.query.filter_by(address_hash=key).first()
+        if row is not None:
+            result = _from_row(row)
+            if result is not None or row.cached_at > datetime.utcnow() - timedelta(seconds=_negative_ttl()):
+                _remember(cache, key, result)
+                return result
+
+        if provider is None:
+            return None
+        try:
+            result = provider.geocode(normalized)
+        except Exception as exc:  # noqa: BLE001
+            # Provider outages are not cached; the next request tries again.
+            logger.warning("Geocoding failed for %r: %s", normalized, exc)
+            return None
+
+        _store(key, normalized, provider.name, result)
+        _remember(cache, key, result)
+        return result
+
+
+def fill_coordinates(
+    address: Optional[str], latitude: Optional[float], longitude: Optional[float]
+) -> Tuple[Tuple[Optional[float], Optional[float]], Optional[str]]:
+    """Geocode the address only when the caller did not supply coordinates.
+
+    Coordinates come as a pair: supplying only one of them is an error rather than a reason to
+    replace it with a geocoded value.
+    """
+    if (latitude is None) != (longitude is None):
+        return (None, None), "latitude and longitude must be provided together"
+    if latitude is not None:
+        return (latitude, longitude), None
+    result = geocode(address)
+    return (result if result is not None else (None, None)), None
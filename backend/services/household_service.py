@@ -26,4 +26,4 @@ def create_household(
 def get_household_for_user(user: User) -> Optional[Household]:
     if not user or not getattr(user, "household_id", None):
         return None
-    return Household.query.get(user.household_id)
+    return db.session.get(Household, user.household_id)
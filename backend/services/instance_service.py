@@ -0,0 +1,225 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import selectinload
+
+from models import ActivityInstance, ActivitySchedule, db
+from services.schedule_service import Occurrence, expand_schedule, expand_schedules_columnar, to_occurrences
+
+DEFAULT_HORIZON_DAYS = 180
+
+instances_cli = AppGroup("instances", help="Maintain materialized activity instances.")
+
+
+def _horizon_days() -> int:
+    return int(current_app.config.get("ACTIVITY_INSTANCE_HORIZON_DAYS", DEFAULT_HORIZON_DAYS))
+
+
+def _utc_naive(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def referenced_instance_ids(instance_ids: Iterable[str]) -> Set[str]:
+    """Instance ids that rows in any other table point at through a foreign key."""
+    instance_ids = list(instance_ids)
+    if not instance_ids:
+        return set()
+    instances_table = ActivityInstance.__table__
+    referenced: Set[str] = set()
+    for table in db.metadata.tables.values():
+        for fk in table.foreign_keys:
+            if fk.column.table is not instances_table:
+                continue
+            rows = db.session.execute(
+                select(fk.parent).where(fk.parent.in_(instance_ids)).distinct()
+            ).scalars()
+            referenced.update(rows)
+    return referenced
+
+
+def sync_instances(
+    schedule: ActivitySchedule,
+    *,
+    today: Optional[date] = None,
+    horizon_days: Optional[int] = None,
+) -> Dict[str, int]:
+    """Bring the schedule's future instances in line with the schedule, touching only what changed.
+
+    Instances dated before ``today`` are history and left alone. Future instances that no longer
+    match an occurrence are deleted, unless another table references them, in which case they are
+    marked cancelled so the referencing rows stay valid. Past dates the schedule covers but that
+    precede its oldest instance (a first materialization, or a start_date moved earlier) are
+    filled in.
+    """
+    today = today or datetime.utcnow().date()
+    horizon_days = _horizon_days() if horizon_days is None else horizon_days
+    through = min(schedule.end_date, today + timedelta(days=horizon_days))
+    start = max(schedule.start_date, today)
+
+    # Past dates before the oldest instance have never been materialized, so there is no history
+    # to protect there; without this a start_date moved earlier would leave a hole in the calendar.
+    backfill_through = today - timedelta(days=1)
+    if schedule.materialized_through is not None and schedule.start_date < today:
+        oldest = db.session.execute(
+            select(func.min(ActivityInstance.occurrence_date)).where(
+                ActivityInstance.activity_id == schedule.activity_id
+            )
+        ).scalar()
+        if oldest is not None:
+            backfill_through = min(backfill_through, oldest - timedelta(days=1))
+    backfill_through = min(backfill_through, schedule.end_date)
+    backfill = schedule.start_date <= backfill_through
+
+    desired: Dict[date, Occurrence] = {}
+    if backfill or start <= through:
+        desired = {
+            occ.date: occ
+            for occ in expand_schedule(schedule, schedule.start_date if backfill else start, through)
+            if occ.date >= start or occ.date <= backfill_through
+        }
+
+    in_scope = ActivityInstance.occurrence_date >= today
+    if backfill:
+        in_scope = or_(in_scope, ActivityInstance.occurrence_date <= backfill_through)
+    existing = db.session.execute(
+        select(
+            ActivityInstance.id,
+            ActivityInstance.occurrence_date,
+            ActivityInstance.start_at,
+            ActivityInstance.end_at,
+            ActivityInstance.cancelled_at,
+        ).where(ActivityInstance.activity_id == schedule.activity_id, in_scope)
+    ).all()
+
+    inserts: List[Dict[str, object]] = []
+    updates: List[Dict[str, object]] = []
+    stale: List[str] = []
+    seen: Set[date] = set()
+    for row in existing:
+        occ = desired.get(row.occurrence_date)
+        if occ is None:
+            if row.cancelled_at is None:
+                stale.append(row.id)
+            continue
+        seen.add(row.occurrence_date)
+        start_at, end_at = _utc_naive(occ.start), _utc_naive(occ.end)
+        if row.start_at != start_at or row.end_at != end_at or row.cancelled_at is not None:
+            updates.append({"id": row.id, "start_at": start_at, "end_at": end_at, "cancelled_at": None})
+
+    for occ_date, occ in desired.items():
+        if occ_date not in seen:
+            inserts.append(
+                {
+                    "activity_id": schedule.activity_id,
+                    "occurrence_date": occ_date,
+                    "start_at": _utc_naive(occ.start),
+                    "end_at": _utc_naive(occ.end),
+                }
+            )
+
+    keep = referenced_instance_ids(stale)
+    to_delete = [instance_id for instance_id in stale if instance_id not in keep]
+    if keep:
+        db.session.execute(
+            update(ActivityInstance)
+            .where(ActivityInstance.id.in_(keep))
+            .values(cancelled_at=datetime.utcnow())
+        )
+    if to_delete:
+        db.session.execute(delete(ActivityInstance).where(ActivityInstance.id.in_(to_delete)))
+    if inserts:
+        db.session.execute(insert(ActivityInstance), inserts)
+    if updates:
+        db.session.execute(update(ActivityInstance), updates)
+
+    schedule.materialized_through = through
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "cancelled": len(keep),
+        "deleted": len(to_delete),
+    }
+
+
+def materialize_new(
+    schedules: Sequence[ActivitySchedule],
+    *,
+    today: Optional[date] = None,
+    horizon_days: Optional[int] = None,
+) -> int:
+    """First materialization for schedules that have no instances yet, with a single INSERT.
+
+    Equivalent to calling sync_instances on each schedule but without the per-schedule diff,
+    which bulk creation would otherwise pay once per activity. Returns instances inserted.
+    """
+    today = today or datetime.utcnow().date()
+    horizon_days = _horizon_days() if horizon_days is None else horizon_days
+    through = {s.activity_id: min(s.end_date, today + timedelta(days=horizon_days)) for s in schedules}
+    live = [s for s in schedules if s.start_date <= through[s.activity_id]]
+
+    rows: List[Dict[str, object]] = []
+    if live:
+        expanded = expand_schedules_columnar(
+            live, min(s.start_date for s in live), max(through[s.activity_id] for s in live)
+        )
+        for occ in to_occurrences(expanded, [s.activity_id for s in live]):
+            if occ.date <= through[occ.activity_id]:
+                rows.append(
+                    {
+                        "activity_id": occ.activity_id,
+                        "occurrence_date": occ.date,
+                        "start_at": _utc_naive(occ.start),
+                        "end_at": _utc_naive(occ.end),
+                    }
+                )
+    if rows:
+        db.session.execute(insert(ActivityInstance), rows)
+    for schedule in schedules:
+        schedule.materialized_through = through[schedule.activity_id]
+    return len(rows)
+
+
+def extend_horizon(*, today: Optional[date] = None, batch_size: int = 100) -> int:
+    """Top up every live schedule whose materialized horizon falls short. Returns schedules touched."""
+    today = today or datetime.utcnow().date()
+    target = today + timedelta(days=_horizon_days())
+    touched = 0
+    last_id = ""
+    while True:
+        # Keyset over ids so each batch can be committed without re-reading finished schedules.
+        schedules = (
+            ActivitySchedule.query.options(selectinload(ActivitySchedule.day_times))
+            .filter(
+                ActivitySchedule.id > last_id,
+                ActivitySchedule.end_date >= today,
+                or_(
+                    ActivitySchedule.materialized_through.is_(None),
+                    and_(
+                        ActivitySchedule.materialized_through < ActivitySchedule.end_date,
+                        ActivitySchedule.materialized_through < target,
+                    ),
+                ),
+            )
+            .order_by(ActivitySchedule.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not schedules:
+            break
+        for schedule in schedules:
+            sync_instances(schedule, today=today)
+            touched += 1
+        last_id = schedules[-1].id
+        db.session.commit()
+    return touched
+
+
+@instances_cli.command("extend")
+def extend_command() -> None:
+    """Materialize instances up to the rolling horizon (run periodically, e.g. hourly)."""
+    touched = extend_horizon()
+    click.echo(f"Extended instances for {touched} schedules")
@@ -1,5 +1,7 @@
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import tuple_
 
 from models import Kid, db
 
@@ -26,10 +28,19 @@ def create_kid(
     return kid
 
 
-def list_kids_for_user(household_id: Optional[str], parent_user_id: Optional[str]) -> List[Kid]:
+def list_kids_for_user(
+    household_id: Optional[str],
+    parent_user_id: Optional[str],
+    *,
+    limit: int,
+    after: Optional[Tuple[datetime, str]] = None,
+) -> Tuple[List[Kid], bool]:
     query = Kid.query
     if household_id:
         query = query.filter_by(household_id=household_id)
     elif parent_user_id:
         query = query.filter_by(parent_user_id=parent_user_id)
-    return query.order_by(Kid.created_at.desc()).all()
+    if after is not None:
+        query = query.filter(tuple_(Kid.created_at, Kid.id) < tuple_(*after))
+    rows = query.order_by(Kid.created_at.desc(), Kid.id.desc()).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,309 @@
+import csv
+import re
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.schedule_service import get_zone, is_valid_timezone
+
+# (row number, activity payload for _create_batch, error)
+ImportRow = Tuple[int, Optional[Dict[str, object]], Optional[str]]
+
+ICS_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_DAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+CSV_WEEKDAYS = {**{name: i for i, name in enumerate(_DAY_NAMES)}, **{name[:3]: i for i, name in enumerate(_DAY_NAMES)}}
+_DURATION = re.compile(r"^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+_MAX_COUNT_WEEKS = 520
+
+
+# --- iCalendar ---------------------------------------------------------------------------
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join RFC 5545 folded lines (continuations start with a space or tab)."""
+    current: Optional[str] = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split_content_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:index], line[index + 1 :]
+            break
+    else:
+        return line.upper(), {}, ""
+    name, *raw_params = head.split(";")
+    params = {}
+    for param in raw_params:
+        key, _, param_value = param.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _unescape(value: str) -> str:
+    return (
+        value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+    )
+
+
+def iter_vevents(lines: Iterable[str]) -> Iterator[Dict[str, Tuple[Dict[str, str], str]]]:
+    """Yield each VEVENT's properties (first occurrence of each name), one event in memory at a time."""
+    event: Optional[Dict[str, Tuple[Dict[str, str], str]]] = None
+    nested = 0
+    for line in _unfold(lines):
+        name, params, value = _split_content_line(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and event is None:
+                event = {}
+            elif event is not None:
+                nested += 1  # VALARM and friends
+            continue
+        if name == "END":
+            if event is not None and nested:
+                nested -= 1
+            elif event is not None and value.upper() == "VEVENT":
+                yield event
+                event = None
+            continue
+        if event is not None and not nested and name not in event:
+            event[name] = (params, value)
+
+
+def _parse_ics_datetime(params: Dict[str, str], value: str) -> Tuple[Optional[datetime], Optional[str], bool]:
+    """(naive value, timezone name or "UTC" or None when floating, is_date)."""
+    value = value.strip()
+    try:
+        if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d"), None, True
+        if value.endswith("Z"):
+            return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S"), "UTC", False
+        return datetime.strptime(value, "%Y%m%dT%H%M%S"), params.get("TZID"), False
+    except ValueError:
+        return None, None, False
+
+
+def _to_zone(value: datetime, source: str, target: str) -> datetime:
+    if source == target:
+        return value
+    return value.replace(tzinfo=get_zone(source)).astimezone(get_zone(target)).replace(tzinfo=None)
+
+
+def _parse_duration(value: str) -> Optional[timedelta]:
+    match = _DURATION.match(value.strip().upper())
+    if not match or not any(match.groups()):
+        return None
+    weeks, days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _end_after_count(start: date, weekdays: List[int], count: int) -> date:
+    day, seen = start, 0
+    for _ in range(_MAX_COUNT_WEEKS * 7):
+        if day.weekday() in weekdays:
+            seen += 1
+            if seen >= count:
+                return day
+        day += timedelta(days=1)
+    return day
+
+
+def _apply_rrule(
+    payload: Dict[str, object], rrule: str, start: datetime, tz: str
+) -> Optional[str]:
+    parts = {}
+    for part in rrule.split(";"):
+        key, _, value = part.partition("=")
+        parts[key.upper()] = value.upper()
+    if parts.get("FREQ") != "WEEKLY":
+        return "Only FREQ=WEEKLY recurrence rules are supported"
+    if parts.get("INTERVAL", "1") != "1":
+        return "Only weekly recurrence with INTERVAL=1 is supported"
+
+    weekdays = []
+    for code in filter(None, parts.get("BYDAY", "").split(",")):
+        weekday = ICS_WEEKDAYS.get(code[-2:])
+        if weekday is None:
+            return f"Unsupported BYDAY value {code}"
+        weekdays.append(weekday)
+    weekdays = sorted(set(weekdays)) or [start.weekday()]
+
+    if "UNTIL" in parts:
+        until, until_tz, is_date = _parse_ics_datetime({}, parts["UNTIL"])
+        if until is None:
+            return "RRULE UNTIL is not a valid date"
+        if until_tz == "UTC" and not is_date:
+            until = _to_zone(until, "UTC", tz)
+        end_date = until.date()
+    elif "COUNT" in parts:
+        try:
+            count = int(parts["COUNT"])
+        except ValueError:
+            return "RRULE COUNT must be an integer"
+        if count < 1:
+            return "RRULE COUNT must be positive"
+        end_date = _end_after_count(start.date(), weekdays, count)
+    else:
+        return "Recurring events need an RRULE UNTIL or COUNT"
+
+    payload.update(
+        {"schedule_type": "recurring", "weekdays": weekdays, "end_date": end_date.isoformat()}
+    )
+    return None
+
+
+def ics_event_payload(
+    event: Dict[str, Tuple[Dict[str, str], str]], default_timezone: str, kid_ids: List[str]
+) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    """Map one VEVENT onto the POST /activities payload shape."""
+    if "RECURRENCE-ID" in event:
+        return None, "Recurrence overrides (RECURRENCE-ID) are not supported"
+    if "DTSTART" not in event:
+        return None, "DTSTART is required"
+
+    start, start_tz, is_date = _parse_ics_datetime(*event["DTSTART"])
+    if start is None:
+        return None, "DTSTART is not a valid date-time"
+    if is_date:
+        return None, "All-day events are not supported"
+    tz = default_timezone if start_tz in (None, "UTC") else start_tz
+    if not is_valid_timezone(tz):
+        return None, f"Unknown timezone {tz}"
+    start = _to_zone(start, start_tz or tz, tz)
+
+    if "DTEND" in event:
+        end, end_tz, _ = _parse_ics_datetime(*event["DTEND"])
+        if end is None:
+            return None, "DTEND is not a valid date-time"
+        if end_tz and end_tz != "UTC" and not is_valid_timezone(end_tz):
+            return None, f"Unknown timezone {end_tz}"
+        end = _to_zone(end, end_tz or tz, tz)
+    elif "DURATION" in event:
+        duration = _parse_duration(event["DURATION"][1])
+        if duration is None:
+            return None, "DURATION is not valid"
+        end = start + duration
+    else:
+        return None, "DTEND or DURATION is required"
+    if end.date() != start.date():
+        return None, "Events spanning midnight are not supported"
+
+    location = _unescape(event["LOCATION"][1]).strip() if "LOCATION" in event else ""
+    payload: Dict[str, object] = {
+        "name": _unescape(event.get("SUMMARY", ({}, ""))[1]).strip(),
+        "address": location or None,
+        "schedule_type": "one_time",
+        "start_date": start.date().isoformat(),
+        "end_date": start.date().isoformat(),
+        "timezone": tz,
+        "start_time": start.strftime("%H:%M"),
+        "end_time": end.strftime("%H:%M"),
+        "kid_ids": kid_ids,
+    }
+    if "RRULE" in event:
+        err = _apply_rrule(payload, event["RRULE"][1], start, tz)
+        if err:
+            return None, err
+    return payload, None
+
+
+def _import_row(
+    number: int, build: Callable[..., Tuple[Optional[Dict[str, object]], Optional[str]]], *args
+) -> ImportRow:
+    """Map one source row, reporting anything unexpected against that row instead of aborting the upload."""
+    try:
+        payload, err = build(*args)
+    except Exception:  # noqa: BLE001 - earlier chunks are already committed; one row must not stop the rest
+        return number, None, "Row could not be read"
+    return number, payload, err
+
+
+def iter_ics_rows(lines: Iterable[str], default_timezone: str, kid_ids: List[str]) -> Iterator[ImportRow]:
+    for number, event in enumerate(iter_vevents(lines), start=1):
+        yield _import_row(number, ics_event_payload, event, default_timezone, kid_ids)
+
+
+# --- CSV ---------------------------------------------------------------------------------
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in re.split(r"[;|]", value or "") if part.strip()]
+
+
+def _csv_weekdays(value: Optional[str]) -> Tuple[List[object], Optional[str]]:
+    weekdays: List[object] = []
+    for part in _split_list(value):
+        if part.isdigit():
+            weekdays.append(int(part))
+        elif part.lower() in CSV_WEEKDAYS:
+            weekdays.append(CSV_WEEKDAYS[part.lower()])
+        else:
+            return [], f"Unknown weekday {part}"
+    return weekdays, None
+
+
+def csv_row_payload(
+    row: Dict[str, Optional[str]], default_timezone: str, kid_ids: List[str]
+) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    """Map one CSV row (header names match the POST /activities fields) onto its payload shape.
+
+    ``weekdays`` and ``kid_ids`` hold ``;``-separated lists; weekdays may be numbers (0 = Monday)
+    or names. Missing ``timezone``/``kid_ids`` fall back to the values given for the whole upload.
+    """
+    if row.get(None):
+        # DictReader files fields beyond the header under the None key.
+        return None, "Row has more fields than the header"
+    values = {key.strip().lower(): (value or "").strip() or None for key, value in row.items() if key is not None}
+    weekdays, err = _csv_weekdays(values.get("weekdays"))
+    if err:
+        return None, err
+    fields = (
+        "name", "provider", "address", "location", "latitude", "longitude",
+        "start_date", "end_date", "start_time", "end_time",
+    )
+    payload: Dict[str, object] = {field: values.get(field) for field in fields}
+    payload.update(
+        {
+            "schedule_type": values.get("schedule_type") or ("recurring" if weekdays else "one_time"),
+            "timezone": values.get("timezone") or default_timezone,
+            "weekdays": weekdays,
+            "kid_ids": _split_list(values.get("kid_ids")) or kid_ids,
+        }
+    )
+    return payload, None
+
+
+def iter_csv_rows(lines: Iterable[str], default_timezone: str, kid_ids: List[str]) -> Iterator[ImportRow]:
+    reader = csv.DictReader(lines)
+    number = 0
+    while True:
+        number += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # The reader resumes at the next record, so one malformed record costs only its own row.
+            yield number, None, f"Malformed CSV row: {exc}"
+            continue
+        yield _import_row(number, csv_row_payload, row, default_timezone, kid_ids)
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    mimetype = (content_type or "").split(";")[0].strip().lower()
+    if name.endswith((".ics", ".ical", ".ifb")) or mimetype == "text/calendar":
+        return "ics"
+    if name.endswith(".csv") or mimetype in ("text/csv", "application/csv"):
+        return "csv"
+    return None
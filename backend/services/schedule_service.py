@@ -0,0 +1,203 @@
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+from models import ActivitySchedule
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_DAY_SECONDS = 86400
+
+
+class Occurrence(NamedTuple):
+    activity_id: str
+    date: date
+    start: datetime
+    end: datetime
+
+
+class ExpandedOccurrences(NamedTuple):
+    """Column-oriented occurrences sorted by UTC start.
+
+    ``*_local`` are wall-clock seconds since 1970-01-01 in the schedule's timezone and
+    ``*_offset`` the matching UTC offsets in seconds, so UTC = local - offset.
+    """
+
+    activity_index: np.ndarray
+    start_local: np.ndarray
+    start_offset: np.ndarray
+    end_local: np.ndarray
+    end_offset: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.activity_index)
+
+
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def weekday_times(schedule: ActivitySchedule) -> Dict[int, Tuple[time, time]]:
+    """Effective (start, end) wall-clock times per weekday: per-day overrides win over defaults."""
+    overrides = {dt.weekday: (dt.start_time, dt.end_time) for dt in schedule.day_times}
+    has_default = schedule.default_start_time is not None and schedule.default_end_time is not None
+    result: Dict[int, Tuple[time, time]] = {}
+    for weekday in schedule.recurrence_weekdays or sorted(overrides):
+        if weekday in overrides:
+            result[weekday] = overrides[weekday]
+        elif has_default:
+            result[weekday] = (schedule.default_start_time, schedule.default_end_time)
+    return result
+
+
+def _seconds(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+@lru_cache(maxsize=512)
+def _noon_offsets(tz_name: str, first_ordinal: int, last_ordinal: int) -> np.ndarray:
+    """UTC offset (seconds) at local noon for every day in [first_ordinal - 1, last_ordinal + 1]."""
+    tz = get_zone(tz_name)
+    return np.fromiter(
+        (
+            tz.utcoffset(datetime.fromordinal(ordinal) + timedelta(hours=12)).total_seconds()
+            for ordinal in range(first_ordinal - 1, last_ordinal + 2)
+        ),
+        dtype=np.int64,
+        count=last_ordinal - first_ordinal + 3,
+    )
+
+
+def _exact(tz: ZoneInfo, local_seconds: int) -> Tuple[int, int, bool]:
+    """Resolve one wall time near a DST transition; the flag says it fell in a spring-forward gap.
+
+    Ambiguous fall-back times take their first occurrence. Times inside a gap do not exist and
+    are read with the offset before the change, i.e. moved forward by the size of the gap.
+    """
+    naive = datetime(1970, 1, 1) + timedelta(seconds=local_seconds)
+    offset = int(tz.utcoffset(naive).total_seconds())
+    later_offset = int(tz.utcoffset(naive.replace(fold=1)).total_seconds())
+    if later_offset > offset:
+        return local_seconds + later_offset - offset, later_offset, True
+    return local_seconds, offset, False
+
+
+def _localize(
+    tz: ZoneInfo, ordinals: np.ndarray, wall_seconds: int, offsets: np.ndarray, risky: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    local = (ordinals - _EPOCH_ORDINAL) * _DAY_SECONDS + wall_seconds
+    offset = offsets.copy()
+    in_gap = np.zeros(len(ordinals), dtype=bool)
+    # Offsets are sampled at noon; only days adjacent to a transition need an exact lookup.
+    for idx in np.flatnonzero(risky):
+        local[idx], offset[idx], in_gap[idx] = _exact(tz, int(local[idx]))
+    return local, offset, in_gap
+
+
+def expand_schedules_columnar(
+    schedules: Sequence[ActivitySchedule], window_start: date, window_end: date
+) -> ExpandedOccurrences:
+    """Expand schedules into occurrences within [window_start, window_end] (inclusive, local dates).
+
+    Each weekday of a schedule becomes one arithmetic progression of day ordinals stepping a
+    week at a time, so the cost is a handful of NumPy operations per (schedule, weekday).
+    """
+    parts: List[Tuple[np.ndarray, ...]] = []
+    for index, schedule in enumerate(schedules):
+        first = max(schedule.start_date, window_start)
+        last = min(schedule.end_date, window_end)
+        if first > last:
+            continue
+        times = weekday_times(schedule)
+        if not times:
+            continue
+
+        tz = get_zone(schedule.timezone)
+        first_ordinal = first.toordinal()
+        last_ordinal = last.toordinal()
+        noon = _noon_offsets(tz.key, first_ordinal, last_ordinal)
+        for weekday, (start_time, end_time) in times.items():
+            step_from = first_ordinal + (weekday - first.weekday()) % 7
+            ordinals = np.arange(step_from, last_ordinal + 1, 7, dtype=np.int64)
+            if not len(ordinals):
+                continue
+            pos = ordinals - first_ordinal + 1
+            offsets = noon[pos]
+            risky = (noon[pos - 1] != offsets) | (noon[pos + 1] != offsets)
+            start_local, start_offset, start_in_gap = _localize(tz, ordinals, _seconds(start_time), offsets, risky)
+            end_local, end_offset, _ = _localize(tz, ordinals, _seconds(end_time), offsets, risky)
+            if start_in_gap.any():
+                # A start moved out of a gap keeps the scheduled length rather than shrinking
+                # against an end that was not moved (02:30-03:30 becomes 03:30-04:30, not 03:30-03:30).
+                end_local[start_in_gap] = start_local[start_in_gap] + _seconds(end_time) - _seconds(start_time)
+                end_offset[start_in_gap] = start_offset[start_in_gap]
+            parts.append(
+                (
+                    np.full(len(ordinals), index, dtype=np.int64),
+                    start_local,
+                    start_offset,
+                    end_local,
+                    end_offset,
+                )
+            )
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return ExpandedOccurrences(empty, empty, empty, empty, empty)
+
+    columns = [np.concatenate(column) for column in zip(*parts)]
+    order = np.lexsort((columns[0], columns[1] - columns[2]))
+    return ExpandedOccurrences(*(column[order] for column in columns))
+
+
+def _to_datetime(local_seconds: int, offset_seconds: int) -> datetime:
+    tz = timezone(timedelta(seconds=offset_seconds))
+    return datetime(1970, 1, 1, tzinfo=tz) + timedelta(seconds=local_seconds)
+
+
+def to_occurrences(expanded: ExpandedOccurrences, activity_ids: Sequence[str]) -> List[Occurrence]:
+    occurrences = []
+    for index, start_local, start_offset, end_local, end_offset in zip(
+        expanded.activity_index.tolist(),
+        expanded.start_local.tolist(),
+        expanded.start_offset.tolist(),
+        expanded.end_local.tolist(),
+        expanded.end_offset.tolist(),
+    ):
+        start = _to_datetime(start_local, start_offset)
+        occurrences.append(
+            Occurrence(activity_ids[index], start.date(), start, _to_datetime(end_local, end_offset))
+        )
+    return occurrences
+
+
+def expand_schedule(schedule: ActivitySchedule, window_start: date, window_end: date) -> List[Occurrence]:
+    return to_occurrences(expand_schedules_columnar([schedule], window_start, window_end), [schedule.activity_id])
+
+
+def _format_offsets(offsets: np.ndarray) -> List[str]:
+    labels = {}
+    for value in np.unique(offsets).tolist():
+        sign = "+" if value >= 0 else "-"
+        hours, minutes = divmod(abs(value) // 60, 60)
+        labels[value] = f"{sign}{hours:02d}:{minutes:02d}"
+    return [labels[value] for value in offsets.tolist()]
+
+
+def format_local_isoformat(local_seconds: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """ISO 8601 strings with UTC offset (``YYYY-MM-DDTHH:MM:SS+HH:MM``), formatted column-wise."""
+    stamps = np.datetime_as_string(local_seconds.astype("datetime64[s]"), unit="s")
+    return [stamp + label for stamp, label in zip(stamps.tolist(), _format_offsets(offsets))]
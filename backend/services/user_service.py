@@ -1,6 +1,96 @@
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
 
 from models import User, db
+from utils.cache import TTLCache
+
+
+def init_user_cache(app: Flask) -> TTLCache:
+    # firebase_uid -> the user's column values, so a warm request authenticates without a query.
+    # Only users already linked to a household are cached: household_id is set once (None ->
+    # id) and never changes afterwards, so another worker's copy cannot hold a stale household.
+    # Other columns are refreshed by writes in this process and by the TTL elsewhere.
+    cache = TTLCache(
+        max_size=app.config.get("USER_CACHE_MAX_SIZE", 4096),
+        default_ttl=app.config.get("USER_CACHE_TTL_SECONDS", 60),
+    )
+    app.extensions["user_cache"] = cache
+    return cache
+
+
+def _user_cache() -> Optional[TTLCache]:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("user_cache")
+
+
+def invalidate_user(firebase_uid: Optional[str]) -> None:
+    cache = _user_cache()
+    if cache is not None and firebase_uid:
+        cache.invalidate(firebase_uid)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_write(mapper, connection, target: User) -> None:
+    invalidate_user(target.firebase_uid)
+
+
+def _snapshot(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+def _from_snapshot(snapshot: Dict[str, Any]) -> User:
+    """A session-attached User built from cached values without a SELECT."""
+    identity_key = User.__mapper__.identity_key_from_primary_key([snapshot["id"]])
+    existing = db.session.identity_map.get(identity_key)
+    if existing is not None:
+        return existing
+    user = User(**snapshot)
+    # Persistent-but-detached, so adding it attaches the row instead of inserting it.
+    make_transient_to_detached(user)
+    db.session.add(user)
+    return user
+
+
+def _insert_for_dialect(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _find_user(firebase_uid: str) -> Optional[User]:
+    return db.session.execute(select(User).filter_by(firebase_uid=firebase_uid)).scalar_one_or_none()
+
+
+def _insert_user(values: Dict[str, Any]) -> User:
+    """Provision a first login; a concurrent login that inserted the row first wins and is read back."""
+    insert = _insert_for_dialect(db.session.get_bind(mapper=User).dialect.name)
+    if insert is None:
+        try:
+            with db.session.begin_nested():
+                user = User(**values)
+                db.session.add(user)
+            return user
+        except IntegrityError:
+            return _find_user(values["firebase_uid"])
+
+    stmt = (
+        insert(User)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[User.__table__.c.firebase_uid])
+        .returning(User)
+    )
+    user = db.session.execute(stmt).scalar_one_or_none()
+    return user if user is not None else _find_user(values["firebase_uid"])
 
 
 def get_or_create_user(
@@ -9,22 +99,39 @@ def get_or_create_user(
     first_name: Optional[str] = None,
     last_name: Optional[str] = None,
     avatar_url: Optional[str] = None,
+    defer_backfill: bool = False,
 ) -> User:
-    user = User.query.filter_by(firebase_uid=firebase_uid).first()
-    if user:
-        # Backfill avatar once if Firebase provides it later (e.g., after Google sign-in).
-        if avatar_url and not user.avatar_url:
-            user.avatar_url = avatar_url
-            db.session.commit()
-        return user
-
-    user = User(
-        firebase_uid=firebase_uid,
-        email=email,
-        first_name=first_name,
-        last_name=last_name,
-        avatar_url=avatar_url,
-    )
-    db.session.add(user)
-    db.session.commit()
+    cache = _user_cache()
+    wants_backfill = bool(avatar_url) and not defer_backfill
+
+    snapshot = cache.get(firebase_uid) if cache is not None else None
+    if snapshot is not None and not (wants_backfill and not snapshot["avatar_url"]):
+        return _from_snapshot(snapshot)
+
+    # Known users cost one plain SELECT; only a first login writes.
+    user = _find_user(firebase_uid)
+    wrote = False
+    if user is None:
+        user = _insert_user(
+            {
+                "firebase_uid": firebase_uid,
+                "email": email,
+                "first_name": first_name,
+                "last_name": last_name,
+                "avatar_url": avatar_url,
+            }
+        )
+        wrote = True
+    if wants_backfill and not user.avatar_url:
+        # Backfill the avatar once Firebase provides it (e.g. after Google sign-in).
+        user.avatar_url = avatar_url
+        wrote = True
+
+    if wrote:
+        db.session.flush()
+    snapshot = _snapshot(user)
+    if wrote:
+        db.session.commit()
+    if cache is not None and snapshot["household_id"] is not None:
+        cache.set(firebase_uid, snapshot)
     return user
@@ -0,0 +1,117 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+# Config reads the environment at import time, and importing app builds a default app.
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["AUTH_DEV_BYPASS"] = "false"
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+
+import pytest  # noqa: E402
+from flask_migrate import upgrade  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import middleware.firebase_auth as firebase_auth  # noqa: E402
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from models import db  # noqa: E402
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+def make_config(tmp_path, **overrides):
+    attrs = {
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "SQLALCHEMY_ENGINE_OPTIONS": {},
+        "SQLALCHEMY_BINDS": {},
+        **overrides,
+    }
+    return type("TestConfig", (Config,), attrs)
+
+
+def _fake_verify(token):
+    # Tests authenticate with "Bearer <uid>".
+    return {"uid": token, "email": f"{token}@example.com", "name": token, "picture": None}
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(firebase_auth, "_verify_token", _fake_verify)
+    apps = []
+
+    def factory(migrate=False, **overrides):
+        """A fresh app; ``migrate=True`` builds the schema with the Alembic revisions instead of create_all."""
+        app = create_app(make_config(tmp_path, **overrides))
+        with app.app_context():
+            if migrate:
+                upgrade(directory=str(MIGRATIONS_DIR))
+            else:
+                # Primary only: replica binds stay empty until a test copies the primary over them.
+                db.create_all(bind_key=None)
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth(uid):
+    return {"Authorization": f"Bearer {uid}"}
+
+
+@contextmanager
+def recorded_queries(app):
+    """Collect (statement, parameters) for every SQL statement the primary engine runs inside the block."""
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def record(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def create_household(client, uid, name="Fam"):
+    return client.post("/api/v1/households", json={"name": name}, headers=auth(uid)).json
+
+
+def create_kids(client, uid, count):
+    return [
+        client.post("/api/v1/kids", json={"first_name": f"kid{i}"}, headers=auth(uid)).json
+        for i in range(count)
+    ]
+
+
+def activity_payload(kid_ids, **overrides):
+    return {
+        "name": "Soccer",
+        "schedule_type": "recurring",
+        "start_date": "2026-09-07",
+        "end_date": "2026-12-18",
+        "weekdays": [0, 2],
+        "start_time": "16:00",
+        "end_time": "17:00",
+        "timezone": "America/New_York",
+        "kid_ids": kid_ids,
+        **overrides,
+    }
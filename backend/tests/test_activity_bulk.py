@@ -0,0 +1,134 @@
+from sqlalchemy import select
+
+from conftest import activity_payload, auth, create_household, create_kids, recorded_queries
+from models import Activity, ActivityInstance, KidActivityEnrollment, db
+
+# Statements per bulk request regardless of its size, auth lookup included.
+BULK_QUERY_BUDGET = 8
+
+
+def _bulk(client, activities, uid="u1"):
+    return client.post("/api/v1/activities/bulk", json={"activities": activities}, headers=auth(uid))
+
+
+def _activity_names(app):
+    with app.app_context():
+        return sorted(db.session.execute(select(Activity.name)).scalars())
+
+
+def _instances(app, activity_id):
+    with app.app_context():
+        rows = db.session.execute(
+            select(ActivityInstance.occurrence_date, ActivityInstance.start_at, ActivityInstance.end_at).where(
+                ActivityInstance.activity_id == activity_id
+            )
+        ).all()
+        return sorted(tuple(row) for row in rows)
+
+
+def _enrolled_kids(app, activity_id):
+    with app.app_context():
+        return sorted(
+            db.session.execute(
+                select(KidActivityEnrollment.kid_id).where(KidActivityEnrollment.activity_id == activity_id)
+            ).scalars()
+        )
+
+
+def test_invalid_items_are_reported_without_blocking_the_rest(app, client):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 2)]
+    create_household(client, "u2")
+    other_kid = create_kids(client, "u2", 1)[0]["id"]
+
+    response = _bulk(
+        client,
+        [
+            activity_payload(kid_ids, name="Soccer"),
+            activity_payload(kid_ids, name=""),
+            activity_payload([other_kid], name="Stolen"),
+            activity_payload(kid_ids, name="Backwards", start_date="2026-12-18", end_date="2026-09-07"),
+            "not an object",
+            activity_payload(kid_ids[:1], name="Piano"),
+        ],
+    )
+
+    assert response.status_code == 201, response.json
+    body = response.json
+    assert (body["created"], body["failed"]) == (2, 4)
+    assert [result["index"] for result in body["results"]] == list(range(6))
+    assert [("id" in result, "error" in result) for result in body["results"]] == [
+        (True, False),
+        (False, True),
+        (False, True),
+        (False, True),
+        (False, True),
+        (True, False),
+    ]
+    assert body["results"][1]["error"] == "name is required"
+    assert body["results"][2]["error"] == "All kids must belong to the current household"
+    assert _activity_names(app) == ["Piano", "Soccer"]
+
+
+def test_all_invalid_batch_is_a_400_and_inserts_nothing(app, client):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+
+    response = _bulk(client, [activity_payload(kid_ids, name=""), activity_payload([], name="No kids")])
+
+    assert response.status_code == 400
+    assert response.json["created"] == 0
+    assert _activity_names(app) == []
+
+
+def test_bulk_rows_match_single_create(app, client):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 3)]
+    payload = activity_payload(
+        kid_ids[:2], day_times=[{"weekday": 2, "start_time": "18:00", "end_time": "19:30"}]
+    )
+
+    single = client.post("/api/v1/activities", json=payload, headers=auth("u1"))
+    bulk = _bulk(client, [payload])
+
+    assert single.status_code == 201, single.json
+    assert bulk.status_code == 201, bulk.json
+    single_id, bulk_id = single.json["id"], bulk.json["results"][0]["id"]
+    assert _instances(app, bulk_id) == _instances(app, single_id)
+    assert len(_instances(app, bulk_id)) > 0
+    assert _enrolled_kids(app, bulk_id) == sorted(kid_ids[:2])
+
+    def detail(activity_id):
+        body = client.get(f"/api/v1/activities/{activity_id}", headers=auth("u1")).json
+        body["kids"].sort(key=lambda kid: kid["id"])
+        return {key: value for key, value in body.items() if key not in ("id", "created_at")}
+
+    assert detail(bulk_id) == detail(single_id)
+
+
+def test_batch_size_is_limited(app, client):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+
+    assert _bulk(client, []).status_code == 400
+    assert _bulk(client, {"name": "not a list"}).status_code == 400
+    too_many = _bulk(client, [activity_payload(kid_ids)] * 501)
+    assert too_many.status_code == 400
+    assert too_many.json["error"] == "At most 500 activities per request"
+    assert _activity_names(app) == []
+
+
+def test_query_count_does_not_grow_with_batch_size(app, client):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 4)]
+
+    counts = {}
+    for size in (2, 40):
+        with recorded_queries(app) as statements:
+            response = _bulk(client, [activity_payload(kid_ids, name=f"A{i}") for i in range(size)])
+        assert response.status_code == 201, response.json
+        assert response.json["created"] == size
+        counts[size] = len(statements)
+
+    assert counts[2] == counts[40]
+    assert counts[40] <= BULK_QUERY_BUDGET, counts
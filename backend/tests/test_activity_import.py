@@ -0,0 +1,149 @@
+import csv
+
+import pytest
+from sqlalchemy import event
+
+from conftest import auth, create_household, create_kids
+from models.routing import RoutingSession
+from routes import activity_routes
+
+ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+SUMMARY:Swim
+LOCATION:Pool
+DTSTART;TZID=America/Chicago:20260908T170000
+DTEND;TZID=America/Chicago:20260908T180000
+RRULE:FREQ=WEEKLY;BYDAY=TU,TH;UNTIL=20261217T235959Z
+BEGIN:VALARM
+ACTION:DISPLAY
+END:VALARM
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Chess
+DTSTART:20260907T200000Z
+DURATION:PT1H30M
+RRULE:FREQ=WEEKLY;COUNT=3
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Recital
+DTSTART:20261212T140000
+DTEND:20261212T153000
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Daily
+DTSTART:20261212T140000
+DTEND:20261212T150000
+RRULE:FREQ=DAILY;COUNT=3
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+@pytest.fixture
+def kid_id(client):
+    create_household(client, "u1")
+    return create_kids(client, "u1", 1)[0]["id"]
+
+
+def _import(client, body, content_type, kid_id, **params):
+    return client.post(
+        "/api/v1/activities/import",
+        data=body.encode(),
+        content_type=content_type,
+        query_string={"kid_ids": kid_id, "timezone": "America/New_York", **params},
+        headers=auth("u1"),
+    )
+
+
+def _schedules_by_name(client):
+    return {a["name"]: a["schedule"] for a in client.get("/api/v1/activities", headers=auth("u1")).json}
+
+
+def test_ics_events_and_weekly_rrules(client, kid_id):
+    response = _import(client, ICS, "text/calendar", kid_id)
+
+    assert response.status_code == 201, response.json
+    assert response.json["created"] == 3
+    assert response.json["results"][3] == {"row": 4, "error": "Only FREQ=WEEKLY recurrence rules are supported"}
+
+    schedules = _schedules_by_name(client)
+    swim = schedules["Swim"]
+    assert (swim["type"], swim["timezone"], swim["weekdays"]) == ("recurring", "America/Chicago", [1, 3])
+    assert (swim["start_date"], swim["end_date"], swim["default_start_time"]) == ("2026-09-08", "2026-12-17", "17:00")
+    chess = schedules["Chess"]
+    # A UTC start is read in the upload's timezone; COUNT=3 Mondays ends on the third.
+    assert (chess["timezone"], chess["default_start_time"], chess["default_end_time"]) == (
+        "America/New_York", "16:00", "17:30"
+    )
+    assert (chess["weekdays"], chess["end_date"]) == ([0], "2026-09-21")
+    assert schedules["Recital"]["type"] == "one_time"
+
+
+def test_csv_rows(client, kid_id):
+    body = (
+        "name,start_date,end_date,weekdays,start_time,end_time,timezone\n"
+        "Soccer,2026-09-07,2026-12-18,Mon;wed,16:00,17:00,\n"
+        "Recital,2026-12-12,2026-12-12,,14:00,15:30,America/Chicago\n"
+    )
+
+    response = _import(client, body, "text/csv", kid_id)
+
+    assert response.status_code == 201, response.json
+    assert [row["row"] for row in response.json["results"]] == [1, 2]
+    schedules = _schedules_by_name(client)
+    assert (schedules["Soccer"]["weekdays"], schedules["Soccer"]["timezone"]) == ([0, 2], "America/New_York")
+    assert (schedules["Recital"]["type"], schedules["Recital"]["timezone"]) == ("one_time", "America/Chicago")
+
+
+def test_malformed_csv_rows_are_reported_per_row(client, kid_id):
+    oversized = "x" * (csv.field_size_limit() + 1)
+    body = (
+        "name,start_date,end_date,weekdays,start_time,end_time\n"
+        "Soccer,2026-09-07,2026-12-18,Mon,16:00,17:00\n"
+        "Extra,2026-09-07,2026-12-18,Mon,16:00,17:00,surplus,fields\n"
+        "Short,2026-09-07\n"
+        "Bad day,2026-09-07,2026-12-18,Funday,16:00,17:00\n"
+        f'"{oversized}",2026-09-07,2026-12-18,Mon,16:00,17:00\n'
+        "Piano,2026-09-07,2026-12-18,Tue,16:00,17:00\n"
+    )
+
+    response = _import(client, body, "text/csv", kid_id)
+
+    assert response.status_code == 201, response.json
+    results = response.json["results"]
+    assert [("id" in row, row["row"]) for row in results] == [
+        (True, 1), (False, 2), (False, 3), (False, 4), (False, 5), (True, 6)
+    ]
+    assert results[1]["error"] == "Row has more fields than the header"
+    assert results[3]["error"] == "Unknown weekday Funday"
+    assert results[4]["error"].startswith("Malformed CSV row")
+    assert sorted(_schedules_by_name(client)) == ["Piano", "Soccer"]
+
+
+def test_rows_are_committed_in_chunks(client, kid_id, monkeypatch):
+    monkeypatch.setattr(activity_routes, "IMPORT_CHUNK_SIZE", 2)
+    commits = []
+    listener = lambda session: commits.append(session)  # noqa: E731
+    body = "name,start_date,end_date,weekdays,start_time,end_time\n" + "".join(
+        f"A{i},2026-09-07,2026-12-18,{'Mon' if i != 2 else 'Nope'},16:00,17:00\n" for i in range(5)
+    )
+
+    event.listen(RoutingSession, "after_commit", listener)
+    try:
+        response = _import(client, body, "text/csv", kid_id)
+    finally:
+        event.remove(RoutingSession, "after_commit", listener)
+
+    assert response.status_code == 201, response.json
+    assert (response.json["created"], response.json["failed"]) == (4, 1)
+    assert [row["row"] for row in response.json["results"]] == [1, 2, 3, 4, 5]
+    assert "error" in response.json["results"][2]
+    assert len(commits) == 3
+    assert sorted(_schedules_by_name(client)) == ["A0", "A1", "A3", "A4"]
+
+
+def test_unknown_formats_are_rejected(client, kid_id):
+    response = _import(client, "hello", "text/plain", kid_id)
+
+    assert response.status_code == 400
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from conftest import activity_payload, auth, create_household, create_kids
+from models import Activity, db
+from utils.helpers import NEXT_CURSOR_HEADER
+
+
+def _ids(client, query="", limit=3, uid="u1"):
+    """Every activity id across all pages of GET /activities?<query>, checking page sizes on the way."""
+    ids, cursor = [], None
+    while True:
+        url = f"/api/v1/activities?limit={limit}{'&' + query if query else ''}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=auth(uid))
+        assert response.status_code == 200, response.json
+        assert len(response.json) <= limit
+        ids.extend(activity["id"] for activity in response.json)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            assert len(ids) == len(set(ids)), "a row was returned twice"
+            return ids
+
+
+def _seed(app, client):
+    create_household(client, "u1")
+    anna, ben = (kid["id"] for kid in create_kids(client, "u1", 2))
+    specs = {
+        "fall-anna": activity_payload([anna], start_date="2026-09-07", end_date="2026-12-18"),
+        "fall-both": activity_payload([anna, ben], start_date="2026-09-07", end_date="2026-12-18"),
+        "spring-ben": activity_payload([ben], start_date="2027-01-11", end_date="2027-05-28"),
+        "spring-anna": activity_payload([anna], start_date="2027-01-11", end_date="2027-05-28"),
+        "recital-ben": activity_payload(
+            [ben], schedule_type="one_time", weekdays=[], start_date="2026-12-20", end_date="2026-12-20"
+        ),
+        "recital-anna": activity_payload(
+            [anna], schedule_type="one_time", weekdays=[], start_date="2027-06-05", end_date="2027-06-05"
+        ),
+        "summer-both": activity_payload([anna, ben], start_date="2027-06-14", end_date="2027-08-20"),
+    }
+    ids = {}
+    for name, payload in specs.items():
+        response = client.post("/api/v1/activities", json={**payload, "name": name}, headers=auth("u1"))
+        assert response.status_code == 201, response.json
+        ids[name] = response.json["id"]
+    with app.app_context():
+        # Same created_at everywhere, so only the id tie-breaker orders the pages.
+        db.session.execute(update(Activity).values(created_at=datetime(2026, 1, 1)))
+        db.session.commit()
+    return ids, anna, ben
+
+
+def test_pages_through_created_at_ties_without_gaps_or_repeats(app, client):
+    ids, _, _ = _seed(app, client)
+    for limit in (1, 2, 3, 7, 50):
+        listed = _ids(client, limit=limit)
+        assert sorted(listed) == sorted(ids.values())
+        assert listed == sorted(listed, reverse=True)
+
+
+def test_filters_combine_with_the_cursor(app, client):
+    ids, anna, ben = _seed(app, client)
+
+    def names(query):
+        by_id = {v: k for k, v in ids.items()}
+        return {by_id[i] for i in _ids(client, query, limit=2)}
+
+    assert names(f"kid_id={anna}") == {"fall-anna", "fall-both", "spring-anna", "recital-anna", "summer-both"}
+    assert names("schedule_type=one_time") == {"recital-ben", "recital-anna"}
+    # The window keeps schedules that overlap it; touching on the last day counts.
+    assert names("from=2026-12-18&to=2027-01-10") == {"fall-anna", "fall-both", "recital-ben"}
+    assert names("from=2027-05-28") == {"spring-ben", "spring-anna", "recital-anna", "summer-both"}
+    assert names("to=2026-09-07") == {"fall-anna", "fall-both"}
+    assert names(f"kid_id={ben}&schedule_type=recurring&from=2027-01-01") == {"spring-ben", "summer-both"}
+
+
+def test_listing_is_scoped_to_the_callers_household(app, client):
+    _seed(app, client)
+    create_household(client, "u2")
+    assert _ids(client, uid="u2") == []
+
+
+def test_rejects_bad_parameters(app, client):
+    _seed(app, client)
+    for query in (
+        "cursor=not-a-cursor",
+        "cursor=WyJ4Il0",
+        "schedule_type=weekly",
+        "from=2027-01-01&to=2026-01-01",
+        "from=soon",
+        "limit=0",
+    ):
+        response = client.get(f"/api/v1/activities?{query}", headers=auth("u1"))
+        assert response.status_code == 400, query
+    assert client.get("/api/v1/activities?cursor=%%%", headers=auth("u1")).json["error"] == "cursor is invalid"
@@ -0,0 +1,44 @@
+from conftest import activity_payload, auth, create_household, create_kids, recorded_queries
+
+# Per request, auth lookup included; raising one means a new query was added on purpose.
+QUERY_BUDGET = {"create": 15, "detail": 4, "list": 4, "update": 13}
+
+
+def _query_count(app, request):
+    with recorded_queries(app) as statements:
+        response = request()
+    assert response.status_code < 400, response.json
+    return len(statements)
+
+
+def _queries_per_endpoint(app, kid_count):
+    client = app.test_client()
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", kid_count)]
+    activity_id = client.post("/api/v1/activities", json=activity_payload(kid_ids), headers=auth("u1")).json["id"]
+
+    return {
+        "create": _query_count(
+            app, lambda: client.post("/api/v1/activities", json=activity_payload(kid_ids), headers=auth("u1"))
+        ),
+        "detail": _query_count(app, lambda: client.get(f"/api/v1/activities/{activity_id}", headers=auth("u1"))),
+        "list": _query_count(app, lambda: client.get("/api/v1/activities", headers=auth("u1"))),
+        "update": _query_count(
+            app,
+            lambda: client.patch(
+                f"/api/v1/activities/{activity_id}", json={"name": "Renamed"}, headers=auth("u1")
+            ),
+        ),
+    }
+
+
+def test_query_count_does_not_grow_with_enrolled_kids(make_app, tmp_path_factory):
+    one_kid = _queries_per_endpoint(make_app(SQLALCHEMY_DATABASE_URI=_fresh_db(tmp_path_factory)), 1)
+    many_kids = _queries_per_endpoint(make_app(SQLALCHEMY_DATABASE_URI=_fresh_db(tmp_path_factory)), 6)
+    assert many_kids == one_kid
+    for endpoint, budget in QUERY_BUDGET.items():
+        assert many_kids[endpoint] <= budget, f"{endpoint} ran {many_kids[endpoint]} queries (budget {budget})"
+
+
+def _fresh_db(tmp_path_factory):
+    return f"sqlite:///{tmp_path_factory.mktemp('db') / 'primary.db'}"
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("a", 1)
+    clock[0] += 9.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a", "gone") == "gone"
+    assert len(cache) == 0
+
+
+def test_per_key_ttl_and_absolute_expiry(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("default", 2, ttl=None)
+    cache.set("until", 3, expires_at=clock[0] + 5)
+    cache_without_default = TTLCache()
+    cache_without_default.set("kept", 4)
+
+    clock[0] += 2
+    assert cache.get("short") is None
+    assert cache.get("until") == 3
+    clock[0] += 1000
+    assert cache.get("default") is None  # ttl=None falls back to the cache default
+    assert cache.get("until") is None
+    assert cache_without_default.get("kept") == 4
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_clear_and_stats(clock):
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats() == {"size": 0, "max_size": 1024, "hits": 1, "misses": 1, "evictions": 0}
@@ -0,0 +1,39 @@
+import re
+
+from conftest import activity_payload, auth, create_household, create_kids
+
+
+def _feed(client, uid, household_id):
+    url = client.get(f"/api/v1/households/{household_id}/calendar-feed", headers=auth(uid)).json["url"]
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+
+def _components(body, name):
+    return re.findall(rf"BEGIN:{name}\r\n(.*?)END:{name}\r\n", body, re.S)
+
+
+def test_every_tzid_has_a_vtimezone(client):
+    household = create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+    # Fall 2026: New York leaves DST on Nov 1; Sydney enters it on Oct 4.
+    for timezone in ("America/New_York", "Australia/Sydney", "UTC"):
+        response = client.post("/api/v1/activities", json=activity_payload(kid_ids, timezone=timezone), headers=auth("u1"))
+        assert response.status_code == 201, response.json
+
+    body = _feed(client, "u1", household["id"])
+
+    used = set(re.findall(r"^DT(?:START|END);TZID=([^:]+):", body, re.M))
+    zones = {re.search(r"^TZID:(.+)\r$", block, re.M).group(1): block for block in _components(body, "VTIMEZONE")}
+    assert used == set(zones) == {"America/New_York", "Australia/Sydney", "UTC"}
+
+    new_york = zones["America/New_York"]
+    assert _components(new_york, "DAYLIGHT") == [
+        "DTSTART:20260906T000000\r\nTZOFFSETFROM:-0400\r\nTZOFFSETTO:-0400\r\nTZNAME:EDT\r\n"
+    ]
+    assert _components(new_york, "STANDARD") == [
+        "DTSTART:20261101T020000\r\nTZOFFSETFROM:-0400\r\nTZOFFSETTO:-0500\r\nTZNAME:EST\r\n"
+    ]
+    assert "DTSTART:20261004T020000\r\nTZOFFSETFROM:+1000\r\nTZOFFSETTO:+1100\r\nTZNAME:AEDT" in zones["Australia/Sydney"]
+    assert _components(zones["UTC"], "DAYLIGHT") == []
@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+
+from conftest import activity_payload, auth, create_household, create_kids
+
+
+def _calendar(client, date_from, date_to):
+    response = client.get(
+        f"/api/v1/activities/calendar?from={date_from.isoformat()}&to={date_to.isoformat()}", headers=auth("u1")
+    )
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_schedules_ending_inside_the_window_read_materialized_instances(client):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+    start = date.today() + timedelta(days=7)
+    one_time = activity_payload(
+        kid_ids, name="Recital", schedule_type="one_time", weekdays=[], start_date=start.isoformat(), end_date=start.isoformat()
+    )
+    recurring = activity_payload(
+        kid_ids, name="Swim", start_date=start.isoformat(), end_date=(start + timedelta(days=20)).isoformat()
+    )
+    for payload in (one_time, recurring):
+        response = client.post("/api/v1/activities", json=payload, headers=auth("u1"))
+        assert response.status_code == 201, response.json
+
+    # The window runs well past both schedules' end dates.
+    occurrences = _calendar(client, start - timedelta(days=1), start + timedelta(days=60))
+
+    assert {o["name"] for o in occurrences} == {"Recital", "Swim"}
+    assert all(o["instance_id"] for o in occurrences)
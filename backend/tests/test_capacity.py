@@ -0,0 +1,50 @@
+from conftest import activity_payload, auth, create_household, create_kids
+from models import KidActivityEnrollment, Vehicle, db
+
+WINDOW = "from=2026-11-02&to=2026-11-08"
+
+
+def _capacity(client, uid):
+    response = client.get(f"/api/v1/activities/capacity?{WINDOW}", headers=auth(uid))
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_capacity_covers_every_enrolled_household(app, client):
+    owner = create_household(client, "u1", "Owner")
+    member = create_household(client, "u2", "Member")
+    create_household(client, "u3", "Stranger")
+    owner_kids = [kid["id"] for kid in create_kids(client, "u1", 3)]
+    member_kids = [kid["id"] for kid in create_kids(client, "u2", 2)]
+    activity = client.post("/api/v1/activities", json=activity_payload(owner_kids), headers=auth("u1")).json
+    with app.app_context():
+        db.session.add_all(KidActivityEnrollment(kid_id=kid_id, activity_id=activity["id"]) for kid_id in member_kids)
+        # Owner: 3 passenger seats; member: 6, enough for all five kids in one car.
+        db.session.add(Vehicle(household_id=owner["id"], seat_count=4))
+        db.session.add(Vehicle(household_id=member["id"], seat_count=7))
+        db.session.commit()
+
+    for uid in ("u1", "u2"):
+        plans = _capacity(client, uid)
+        assert [p["date"] for p in plans] == ["2026-11-02", "2026-11-04"]
+        for plan in plans:
+            assert plan["unplaced"] == []
+            (car,) = plan["cars"]
+            assert car["household_id"] == member["id"]
+            assert sorted(car["kid_ids"]) == sorted(owner_kids + member_kids)
+
+    assert _capacity(client, "u3") == []
+
+
+def test_capacity_explains_kids_without_a_seat(app, client):
+    owner = create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 3)]
+    client.post("/api/v1/activities", json=activity_payload(kid_ids), headers=auth("u1"))
+    with app.app_context():
+        db.session.add(Vehicle(household_id=owner["id"], seat_count=3))
+        db.session.commit()
+
+    plan = _capacity(client, "u1")[0]
+    assert sum(len(car["kid_ids"]) for car in plan["cars"]) == 2
+    (unplaced,) = plan["unplaced"]
+    assert unplaced["reason"].startswith("Not enough seats")
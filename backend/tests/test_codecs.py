@@ -0,0 +1,72 @@
+import decimal
+import uuid
+from datetime import date, datetime, time
+
+import numpy as np
+import orjson
+import pytest
+
+from conftest import auth, create_household, create_kids
+from utils import codecs
+from utils.json_provider import OrjsonProvider
+
+MEDIA_TYPES = codecs.binary_media_types()
+pytestmark = pytest.mark.skipif(not MEDIA_TYPES, reason="neither msgpack nor cbor2 is installed")
+
+PAYLOAD = {
+    "id": uuid.UUID(int=7),
+    "dob": date(2015, 3, 4),
+    "created_at": datetime(2026, 1, 1, 12, 30, 15, 250000),
+    "time": time(7, 45),
+    "price": decimal.Decimal("12.50"),
+    "unicode": "Zoë’s ⚽ practice",
+    "numbers": [0, -1, 2**53, 1.5, -0.25],
+    "flags": [True, False],
+    "nested": {"a": None, "b": [None, {"c": None}]},
+    "tuple": (1, "a"),
+    "set": {"only"},
+    "numpy": {"scalar": np.float64(2.5), "array": np.array([1, 2, 3])},
+    "empty": {"list": [], "dict": {}},
+}
+
+
+@pytest.mark.parametrize("media_type", MEDIA_TYPES)
+def test_round_trip_matches_json(media_type):
+    dumpb = OrjsonProvider.dumpb.__get__(object.__new__(OrjsonProvider))
+    expected = orjson.loads(dumpb(PAYLOAD))
+
+    assert codecs.decode(codecs.encode(PAYLOAD, media_type), media_type) == expected
+
+
+def test_media_type_aliases():
+    assert codecs.canonical_media_type("application/x-msgpack") == codecs.MSGPACK
+    assert codecs.canonical_media_type("Application/VND.msgpack") == codecs.MSGPACK
+    assert codecs.canonical_media_type("application/json") is None
+    assert codecs.canonical_media_type(None) is None
+
+
+@pytest.mark.parametrize("media_type", MEDIA_TYPES)
+def test_responses_follow_the_accept_header(client, media_type):
+    create_household(client, "u1")
+    create_kids(client, "u1", 2)
+    as_json = client.get("/api/v1/kids", headers=auth("u1"))
+
+    response = client.get("/api/v1/kids", headers={**auth("u1"), "Accept": media_type})
+
+    assert response.mimetype == media_type
+    assert "Accept" in response.vary
+    assert codecs.decode(response.get_data(), media_type) == as_json.json
+    assert as_json.mimetype == "application/json"
+
+
+@pytest.mark.parametrize("media_type", MEDIA_TYPES)
+def test_request_bodies_follow_the_content_type(client, media_type):
+    create_household(client, "u1")
+    headers = {**auth("u1"), "Content-Type": media_type}
+
+    created = client.post("/api/v1/kids", data=codecs.encode({"first_name": "Zoë"}, media_type), headers=headers)
+    assert created.status_code == 201
+    assert created.json["first_name"] == "Zoë"
+
+    malformed = client.post("/api/v1/kids", data=b"\xc1\xff", headers=headers)
+    assert malformed.status_code == 400
@@ -0,0 +1,165 @@
+import gzip
+import json
+
+import pytest
+from flask import Response
+from werkzeug.http import parse_accept_header
+
+from middleware import compression
+from middleware.compression import choose_encoding, compression_level
+from utils.helpers import conditional_json_response, json_response
+
+PAYLOAD = {"items": [{"id": index, "name": f"activity {index}", "kid_ids": ["a", "b"]} for index in range(200)]}
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    app.add_url_rule("/t/large", "large", lambda: json_response(PAYLOAD))
+    app.add_url_rule("/t/small", "small", lambda: json_response({"ok": True}))
+    app.add_url_rule("/t/etag", "etag", lambda: conditional_json_response(PAYLOAD))
+    app.add_url_rule("/t/fast", "fast", compression_level(1)(lambda: json_response(PAYLOAD)))
+    app.add_url_rule("/t/off", "off", compression_level(0)(lambda: json_response(PAYLOAD)))
+    app.add_url_rule(
+        "/t/streamed",
+        "streamed",
+        lambda: Response((json.dumps(item) + "\n" for item in PAYLOAD["items"]), mimetype="application/json"),
+    )
+    app.add_url_rule(
+        "/t/encoded",
+        "encoded",
+        lambda: Response(
+            gzip.compress(json.dumps(PAYLOAD).encode()), mimetype="application/json", headers={"Content-Encoding": "gzip"}
+        ),
+    )
+    return app
+
+
+def _get(client, path, accept_encoding=None, **headers):
+    if accept_encoding is not None:
+        headers["Accept-Encoding"] = accept_encoding
+    return client.get(path, headers=headers)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("gzip", "gzip"),
+        ("GZIP", "gzip"),
+        ("zstd;q=0.5, gzip", "gzip"),
+        ("zstd;q=0, br;q=0, gzip", "gzip"),
+        ("gzip;q=0, *", "zstd"),
+        ("*", "zstd"),
+        ("*;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiation_prefers_zstd_then_br_then_gzip(header, expected):
+    assert choose_encoding(parse_accept_header(header), ("zstd", "br", "gzip")) == expected
+
+
+def test_negotiation_only_offers_installed_encodings(monkeypatch):
+    monkeypatch.setattr(compression, "zstandard", None)
+    monkeypatch.setattr(compression, "brotli", None)
+
+    assert compression.available_encodings() == ("gzip",)
+    assert choose_encoding(parse_accept_header("zstd, br")) is None
+    assert choose_encoding(parse_accept_header("zstd, br, gzip;q=0.1")) == "gzip"
+
+
+def test_gzip_round_trips_and_varies_on_accept_encoding(client):
+    response = _get(client, "/t/large", "gzip")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.get_data())) == PAYLOAD
+    assert int(response.headers["Content-Length"]) == len(response.get_data())
+
+
+@pytest.mark.parametrize("header", [None, "identity", "gzip;q=0", "*;q=0"])
+def test_identity_when_nothing_acceptable(client, header):
+    response = _get(client, "/t/large", header)
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.get_json() == PAYLOAD
+
+
+@pytest.mark.parametrize("module, encoding", [("zstandard", "zstd"), ("brotli", "br")])
+def test_optional_encodings_round_trip(client, module, encoding):
+    library = pytest.importorskip(module)
+
+    response = _get(client, "/t/large", f"gzip;q=0.5, {encoding}")
+
+    assert response.headers["Content-Encoding"] == encoding
+    data = response.get_data()
+    decoded = library.ZstdDecompressor().decompress(data) if encoding == "zstd" else library.decompress(data)
+    assert json.loads(decoded) == PAYLOAD
+
+
+def test_responses_under_the_threshold_are_sent_as_is(client):
+    response = _get(client, "/t/small", "gzip")
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" not in response.headers.get("Vary", "")
+
+
+def test_threshold_is_configurable(make_app):
+    app = make_app(COMPRESSION_MIN_SIZE=1)
+    app.add_url_rule("/t/tiny", "tiny", lambda: json_response({"message": "x" * 200}))
+
+    assert app.test_client().get("/t/tiny", headers={"Accept-Encoding": "gzip"}).headers["Content-Encoding"] == "gzip"
+
+
+def test_route_levels_override_the_default(client):
+    default = _get(client, "/t/large", "gzip").get_data()
+    fast = _get(client, "/t/fast", "gzip").get_data()
+
+    assert gzip.decompress(default) == gzip.decompress(fast) == _get(client, "/t/large").get_data()
+    assert fast == gzip.compress(gzip.decompress(fast), compresslevel=1, mtime=0)
+    assert default == gzip.compress(gzip.decompress(default), compresslevel=6, mtime=0)
+    assert fast != default
+
+    off = _get(client, "/t/off", "gzip")
+    assert "Content-Encoding" not in off.headers
+
+
+def test_compressed_etag_is_weak_and_revalidates(client):
+    plain = _get(client, "/t/etag")
+    compressed = _get(client, "/t/etag", "gzip")
+
+    assert not plain.headers["ETag"].startswith("W/")
+    assert compressed.headers["ETag"] == f"W/{plain.headers['ETag']}"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+
+    repeat = _get(client, "/t/etag", "gzip", **{"If-None-Match": compressed.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert _get(client, "/t/etag", **{"If-None-Match": compressed.headers["ETag"]}).status_code == 304
+
+
+def test_compressed_bodies_are_cached_by_etag(app, client):
+    cache = app.extensions["compression_cache"]
+    first = _get(client, "/t/etag", "gzip").get_data()
+    second = _get(client, "/t/etag", "gzip").get_data()
+
+    assert first == second
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("path", ["/t/streamed", "/t/encoded"])
+def test_streamed_and_already_encoded_responses_are_left_alone(client, path):
+    untouched = _get(client, path)
+    response = _get(client, path, "gzip")
+
+    assert response.get_data() == untouched.get_data()
+    assert response.headers.get("Content-Encoding") == untouched.headers.get("Content-Encoding")
+    assert "Accept-Encoding" not in response.headers.get("Vary", "")
+
+
+def test_head_requests_are_not_compressed(client):
+    response = client.head("/t/large", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import auth, create_household
+from models import Household, User, db
+
+ENDPOINTS = ["/api/v1/users/me", "/api/v1/households/me"]
+
+
+def _get(client, path, etag=None):
+    headers = auth("u1")
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    return client.get(path, headers=headers)
+
+
+def _rename(app, path):
+    with app.app_context():
+        if path.endswith("users/me"):
+            user = User.query.filter_by(firebase_uid="u1").one()
+            user.first_name = "Renamed"
+        else:
+            household = Household.query.one()
+            household.name = "Renamed"
+        db.session.commit()
+
+
+@pytest.fixture
+def seeded(client):
+    create_household(client, "u1")
+    return client
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_matching_etag_is_answered_with_304(seeded, path):
+    first = _get(seeded, path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    repeat = _get(seeded, path, etag)
+
+    assert repeat.status_code == 304
+    assert repeat.get_data() == b""
+    assert repeat.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_weak_and_listed_etags_match(seeded, path):
+    etag = _get(seeded, path).headers["ETag"]
+
+    assert _get(seeded, path, f"W/{etag}").status_code == 304
+    assert _get(seeded, path, f'"other", {etag}').status_code == 304
+    assert _get(seeded, path, "*").status_code == 304
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_stale_etag_gets_the_new_body(app, seeded, path):
+    etag = _get(seeded, path).headers["ETag"]
+    _rename(app, path)
+
+    response = _get(seeded, path, etag)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Renamed" in response.get_data(as_text=True)
+    assert _get(seeded, path, response.headers["ETag"]).status_code == 304
@@ -0,0 +1,126 @@
+from conftest import activity_payload, auth, create_household, create_kids
+
+WINDOW = "from=2026-09-01&to=2026-12-31"
+
+
+def _create(client, kid_ids, **overrides):
+    response = client.post("/api/v1/activities", json=activity_payload(kid_ids, **overrides), headers=auth("u1"))
+    assert response.status_code == 201, response.json
+    return response.json
+
+
+def _kid_conflicts(client, kid_id, query=WINDOW):
+    response = client.get(f"/api/v1/kids/{kid_id}/conflicts?{query}", headers=auth("u1"))
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def _slots(conflicts):
+    return [(c["weekday"], c["overlap_start"], c["overlap_end"], c["first_date"], c["last_date"]) for c in conflicts]
+
+
+def _kid(client):
+    create_household(client, "u1")
+    return create_kids(client, "u1", 1)[0]["id"]
+
+
+def test_every_overlapping_slot_is_reported(client):
+    kid_id = _kid(client)
+    _create(client, [kid_id], name="Soccer")
+    _create(client, [kid_id], name="Piano", start_time="16:30", end_time="17:30")
+
+    assert _slots(_kid_conflicts(client, kid_id)) == [
+        (0, "16:30", "17:00", "2026-09-07", "2026-12-14"),
+        (2, "16:30", "17:00", "2026-09-09", "2026-12-16"),
+    ]
+
+
+def test_touching_and_separate_slots_do_not_conflict(client):
+    kid_id = _kid(client)
+    _create(client, [kid_id], name="Soccer")
+    _create(client, [kid_id], name="Piano", start_time="17:00", end_time="18:00")
+    _create(client, [kid_id], name="Chess", weekdays=[1, 3])
+    _create(client, [kid_id], name="Art", start_date="2027-01-04", end_date="2027-03-01")
+
+    assert _kid_conflicts(client, kid_id) == []
+
+
+def test_activity_responses_carry_conflicts(client):
+    kid_id = _kid(client)
+    soccer = _create(client, [kid_id], name="Soccer", start_date="2027-01-04", end_date="2027-03-01")
+    piano = _create(
+        client, [kid_id], name="Piano", weekdays=[2], start_time="15:30", end_time="16:15",
+        start_date="2027-01-04", end_date="2027-03-01",
+    )
+
+    assert soccer["conflicts"] == []
+    assert [(c["kid_id"], c["weekday"], c["overlap_start"], c["overlap_end"]) for c in piano["conflicts"]] == [
+        (kid_id, 2, "16:00", "16:15")
+    ]
+
+
+def test_timezones_are_compared_in_utc(client):
+    kid_id = _kid(client)
+    _create(client, [kid_id], name="Soccer")
+    # Same wall-clock time an hour west: never at the same moment.
+    _create(client, [kid_id], name="Online class", timezone="America/Chicago")
+    # 15:00 in Chicago is 16:00 in New York.
+    _create(client, [kid_id], name="Tutor", timezone="America/Chicago", weekdays=[0], start_time="15:00", end_time="15:30")
+
+    conflicts = _kid_conflicts(client, kid_id)
+
+    assert [{c["activity_name"], c["other_activity_name"]} for c in conflicts] == [{"Soccer", "Tutor"}]
+    assert conflicts[0]["weekday"] == 0
+
+
+def test_dst_changes_are_applied_per_timezone(client):
+    kid_id = _kid(client)
+    _create(client, [kid_id], name="Soccer", weekdays=[0])
+    # Phoenix keeps UTC-7: 13:00-14:00 there is 16:00-17:00 in New York only while it is on EDT.
+    _create(client, [kid_id], name="Swim", weekdays=[0], timezone="America/Phoenix", start_time="13:00", end_time="14:00")
+
+    conflicts = _kid_conflicts(client, kid_id)
+
+    assert [(c["first_date"], c["last_date"]) for c in conflicts] == [("2026-09-07", "2026-10-26")]
+
+
+def test_window_bounds_the_reported_dates(client):
+    kid_id = _kid(client)
+    _create(client, [kid_id], name="Soccer")
+    _create(client, [kid_id], name="Piano", weekdays=[0], start_time="16:30", end_time="17:30")
+
+    assert _slots(_kid_conflicts(client, kid_id, "from=2026-10-06&to=2026-10-20")) == [
+        (0, "16:30", "17:00", "2026-10-12", "2026-10-19")
+    ]
+    assert _kid_conflicts(client, kid_id, "from=2026-12-19&to=2027-01-31") == []
+
+
+def test_invalid_windows_are_rejected(client):
+    kid_id = _kid(client)
+    for query in ("from=2026-13-01", "from=2026-10-01&to=2026-09-01", "from=2026-01-01&to=2027-01-31"):
+        response = client.get(f"/api/v1/kids/{kid_id}/conflicts?{query}", headers=auth("u1"))
+        assert response.status_code == 400, query
+
+
+def test_household_conflicts_cover_every_kid(client):
+    household_id = create_household(client, "u1")["id"]
+    first, second = (kid["id"] for kid in create_kids(client, "u1", 2))
+    _create(client, [first, second], name="Soccer")
+    _create(client, [first], name="Piano", weekdays=[0], start_time="16:30", end_time="17:30")
+    _create(client, [second], name="Chess", weekdays=[2], start_time="15:00", end_time="16:30")
+
+    response = client.get(f"/api/v1/households/{household_id}/conflicts?{WINDOW}", headers=auth("u1"))
+
+    assert response.status_code == 200, response.json
+    assert sorted((c["kid_id"], c["weekday"], c["overlap_start"], c["overlap_end"]) for c in response.json) == sorted(
+        [(first, 0, "16:30", "17:00"), (second, 2, "16:00", "16:30")]
+    )
+
+
+def test_household_conflicts_are_private(client):
+    household_id = create_household(client, "u1")["id"]
+    create_household(client, "u2")
+
+    response = client.get(f"/api/v1/households/{household_id}/conflicts", headers=auth("u2"))
+
+    assert response.status_code == 403
@@ -0,0 +1,101 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from utils.db_pool import InstrumentedQueuePool, engine_options, pool_snapshot, replica_binds
+
+POSTGRES = "postgresql+psycopg2://kidride:secret@db:5432/kidride"
+
+
+def test_sqlite_keeps_sqlalchemy_defaults():
+    assert engine_options("sqlite:///kidride_dev.db", pool_size=20) == {}
+    assert engine_options("sqlite://") == {}
+
+
+def test_server_databases_get_the_instrumented_queue_pool():
+    options = engine_options(
+        POSTGRES, pool_size=8, max_overflow=4, pool_timeout=2.5, pool_recycle=600, pool_pre_ping=False
+    )
+
+    assert options == {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": 8,
+        "max_overflow": 4,
+        "pool_timeout": 2.5,
+        "pool_recycle": 600,
+        "pool_pre_ping": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "url, connect_args",
+    [
+        ("postgresql+psycopg://u@db/kidride", {"prepare_threshold": None}),
+        (POSTGRES, None),
+        ("postgresql+pg8000://u@db/kidride", None),
+    ],
+)
+def test_pgbouncer_disables_server_side_prepares_where_the_driver_uses_them(url, connect_args):
+    assert engine_options(url, pgbouncer=True).get("connect_args") == connect_args
+    assert "connect_args" not in engine_options(url)
+
+
+def test_replica_binds_are_numbered_from_one():
+    binds = replica_binds([POSTGRES, "sqlite:///replica.db"], pool_size=3)
+
+    assert list(binds) == ["replica_1", "replica_2"]
+    assert binds["replica_1"]["url"] == POSTGRES
+    assert binds["replica_1"]["pool_size"] == 3
+    assert binds["replica_2"] == {"url": "sqlite:///replica.db"}
+    assert replica_binds([]) == {}
+
+
+def _engine(tmp_path, connect_delay=0.0, **pool):
+    def connect():
+        time.sleep(connect_delay)
+        return sqlite3.connect(tmp_path / "pool.db", check_same_thread=False)
+
+    return create_engine("sqlite://", creator=connect, poolclass=InstrumentedQueuePool, **pool)
+
+
+def test_timed_out_checkouts_are_counted(tmp_path):
+    engine = _engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_snapshot(engine)
+    assert (stats["checkouts"], stats["timeouts"]) == (2, 1)
+    assert stats["wait_seconds_max"] >= 0.05
+
+
+def test_connect_time_is_not_counted_as_waiting(tmp_path):
+    engine = _engine(tmp_path, connect_delay=0.2, pool_size=1, max_overflow=1, pool_timeout=5)
+
+    with engine.connect(), engine.connect():
+        pass
+
+    stats = pool_snapshot(engine)
+    assert stats["checkouts"] == 2
+    assert stats["connect_seconds_total"] >= 0.4
+    assert stats["wait_seconds_max"] < 0.1
+
+
+def test_queueing_for_a_busy_pool_is_counted_as_waiting(tmp_path):
+    engine = _engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=5)
+    held = engine.connect()
+    releaser = threading.Timer(0.2, held.close)
+    releaser.start()
+
+    with engine.connect():
+        pass
+    releaser.join()
+
+    stats = pool_snapshot(engine)
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 0
+    assert stats["wait_seconds_max"] >= 0.15
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.distance import as_coordinates, haversine_matrix, haversine_one_to_many, top_k
+from utils.geohash import EARTH_RADIUS_KM
+
+
+def _reference(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(
+        math.radians(lon2 - lon1) / 2
+    ) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(7)
+    return as_coordinates(rng.uniform(-80, 80, 500)), as_coordinates(rng.uniform(-180, 180, 500))
+
+
+def test_one_to_many_matches_scalar_formula(points):
+    lats, lons = points
+    expected = [_reference(40.7, -74.0, lat, lon) for lat, lon in zip(lats, lons)]
+    np.testing.assert_allclose(haversine_one_to_many(40.7, -74.0, lats, lons), expected, rtol=1e-12)
+
+
+def test_known_distance():
+    # New York to Los Angeles is about 3,936 km on a 6,371 km sphere.
+    (distance,) = haversine_one_to_many(40.7128, -74.0060, as_coordinates([34.0522]), as_coordinates([-118.2437]))
+    assert distance == pytest.approx(3936, abs=5)
+
+
+def test_matrix_rows_match_one_to_many(points):
+    lats, lons = points
+    matrix = haversine_matrix(lats[:5], lons[:5], lats, lons)
+    assert matrix.shape == (5, len(lats))
+    for row in range(5):
+        np.testing.assert_allclose(matrix[row], haversine_one_to_many(lats[row], lons[row], lats, lons))
+
+
+def test_top_k_is_the_k_nearest_in_order(points):
+    lats, lons = points
+    distances = haversine_one_to_many(0.0, 0.0, lats, lons)
+    indices, nearest = top_k(distances, 10)
+    np.testing.assert_array_equal(indices, np.argsort(distances, kind="stable")[:10])
+    np.testing.assert_allclose(nearest, np.sort(distances)[:10])
+
+
+def test_top_k_skips_missing_coordinates_and_far_points():
+    distances = np.array([5.0, np.nan, 1.0, 50.0, 3.0])
+    indices, nearest = top_k(distances, 10, max_distance=10)
+    assert indices.tolist() == [2, 4, 0]
+    assert nearest.tolist() == [1.0, 3.0, 5.0]
+    assert top_k(distances, 0)[0].size == 0
@@ -0,0 +1,101 @@
+from datetime import date, time, timedelta
+
+from conftest import activity_payload, auth, create_household, create_kids
+from models import KidActivityEnrollment, db
+from services.driver_rotation import FROM_LEG, TO_LEG, AvailabilitySlot, Leg, plan_rotation, replan_without
+
+
+def _slot(household_id, weekday, start="15:00", end="18:00"):
+    return {"household_id": household_id, "weekday": weekday, "start_time": start, "end_time": end}
+
+
+def _carpool(app, client):
+    """An activity of u1's household (Mon/Wed 16:00-17:00) with a kid of u2's household enrolled too."""
+    first = create_household(client, "u1", "First")
+    second = create_household(client, "u2", "Second")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+    (other_kid,) = create_kids(client, "u2", 1)
+    activity = client.post("/api/v1/activities", json=activity_payload(kid_ids), headers=auth("u1")).json
+    with app.app_context():
+        db.session.add(KidActivityEnrollment(kid_id=other_kid["id"], activity_id=activity["id"]))
+        db.session.commit()
+    return activity["id"], first["id"], second["id"]
+
+
+def test_rotation_endpoint_respects_availability_and_balances_load(app, client):
+    activity_id, first, second = _carpool(app, client)
+    body = {
+        "from": "2026-11-02",
+        "to": "2026-11-15",
+        # First can only drive on Mondays; Second can drive either day.
+        "availability": [_slot(first, 0), _slot(second, 0), _slot(second, 2)],
+    }
+    response = client.post(f"/api/v1/activities/{activity_id}/driver-rotation", json=body, headers=auth("u1"))
+
+    assert response.status_code == 200, response.json
+    plan = response.json
+    assert plan["unassigned"] == []
+    assert len(plan["assignments"]) == 8  # four instances, a drop-off and a pick-up each
+    for assignment in plan["assignments"]:
+        if date.fromisoformat(assignment["date"]).weekday() == 2:
+            assert assignment["household_id"] == second
+    assert plan["load"] == {first: 4, second: 4}
+
+
+def test_rotation_reports_legs_nobody_can_drive(app, client):
+    activity_id, first, _ = _carpool(app, client)
+    body = {"from": "2026-11-02", "to": "2026-11-04", "availability": [_slot(first, 0)]}
+    plan = client.post(f"/api/v1/activities/{activity_id}/driver-rotation", json=body, headers=auth("u1")).json
+
+    assert {a["date"] for a in plan["assignments"]} == {"2026-11-02"}
+    assert {(leg["date"], leg["direction"]) for leg in plan["unassigned"]} == {("2026-11-04", TO_LEG), ("2026-11-04", FROM_LEG)}
+
+
+def test_rotation_validates_input(app, client):
+    activity_id, first, _ = _carpool(app, client)
+    url = f"/api/v1/activities/{activity_id}/driver-rotation"
+    bad_weekday = {"from": "2026-11-02", "to": "2026-11-04", "availability": [_slot(first, 7)]}
+    assert client.post(url, json=bad_weekday, headers=auth("u1")).status_code == 400
+    assert client.post(url, json={"from": "2026-11-02"}, headers=auth("u1")).status_code == 400
+    assert client.post("/api/v1/activities/missing/driver-rotation", json={}, headers=auth("u1")).status_code == 404
+
+
+def _season(instances):
+    start = date(2026, 9, 7)
+    legs = []
+    for i in range(instances):
+        day = start + timedelta(days=7 * (i // 2) + 2 * (i % 2))
+        legs.append(Leg(f"i{i}", "a", day, TO_LEG, day.weekday(), 15 * 60 + 30, 16 * 60))
+        legs.append(Leg(f"i{i}", "a", day, FROM_LEG, day.weekday(), 17 * 60, 17 * 60 + 30))
+    return legs
+
+
+def test_replan_only_moves_the_dropped_households_legs():
+    households = [f"h{i}" for i in range(6)]
+    availability = [AvailabilitySlot(h, weekday, time(15), time(18)) for h in households for weekday in (0, 2)]
+    legs = _season(80)
+    plan = plan_rotation(legs, households, availability)
+    assert plan.unassigned == []
+    assert max(plan.load.values()) - min(plan.load.values()) <= 1
+
+    dropped = next(a for a in plan.assignments if a.household_id == "h0")
+    replanned = replan_without(plan, legs, households, availability, "h0", dropped.date)
+
+    before = {(a.instance_id, a.direction): a.household_id for a in plan.assignments}
+    after = {(a.instance_id, a.direction): a.household_id for a in replanned.assignments}
+    assert after.keys() == before.keys()
+    for key, household_id in after.items():
+        if before[key] == "h0" and key[0] in {a.instance_id for a in plan.assignments if a.date == dropped.date}:
+            assert household_id != "h0"
+        else:
+            assert household_id == before[key]
+
+
+def test_member_households_can_plan_the_rotation(app, client):
+    activity_id, first, second = _carpool(app, client)
+    create_household(client, "u3", "Stranger")
+    body = {"from": "2026-11-02", "to": "2026-11-04", "availability": [_slot(second, 0), _slot(second, 2)]}
+    url = f"/api/v1/activities/{activity_id}/driver-rotation"
+
+    assert client.post(url, json=body, headers=auth("u2")).json["load"] == {first: 0, second: 4}
+    assert client.post(url, json=body, headers=auth("u3")).status_code == 404
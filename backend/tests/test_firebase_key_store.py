@@ -0,0 +1,58 @@
+import json
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from services.firebase_key_store import FirebaseKeyStore
+
+PROJECT = "demo-project"
+
+
+def _signing_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _write_jwks(path, private_key, kid):
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    path.write_text(json.dumps({"keys": [jwk]}))
+
+
+def _token(private_key, kid, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{PROJECT}",
+        "aud": PROJECT,
+        "sub": "user-1",
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_verifies_against_local_jwks(tmp_path):
+    key = _signing_key()
+    _write_jwks(tmp_path / "jwks.json", key, "k1")
+    store = FirebaseKeyStore(PROJECT, jwks_path=str(tmp_path / "jwks.json"))
+    store.start()
+    try:
+        decoded = store.verify(_token(key, "k1"))
+        assert decoded["uid"] == "user-1"
+        # Unknown key ids fall back to the caller instead of failing.
+        assert store.verify(_token(key, "other")) is None
+    finally:
+        store.stop()
+
+
+def test_start_does_not_block_on_the_network():
+    # Non-routable address: a synchronous fetch would hang until the timeout.
+    store = FirebaseKeyStore(PROJECT, jwks_url="http://10.255.255.1/jwks", fetch_timeout=2)
+    started = time.perf_counter()
+    store.start()
+    try:
+        assert time.perf_counter() - started < 0.5
+        assert store.verify(_token(_signing_key(), "k1")) is None
+    finally:
+        store.stop()
@@ -0,0 +1,169 @@
+import importlib.util
+import math
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import activity_payload, auth, create_household, create_kids
+from models import Household, db
+from services.geo_service import households_near
+from utils.geohash import EARTH_RADIUS_KM, covering_cells, encode
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def _offset(latitude, longitude, distance_km, bearing_degrees):
+    """Point distance_km away on the given bearing (great-circle destination formula)."""
+    phi, lam, theta = math.radians(latitude), math.radians(longitude), math.radians(bearing_degrees)
+    delta = distance_km / EARTH_RADIUS_KM
+    phi2 = math.asin(math.sin(phi) * math.cos(delta) + math.cos(phi) * math.sin(delta) * math.cos(theta))
+    lam2 = lam + math.atan2(
+        math.sin(theta) * math.sin(delta) * math.cos(phi), math.cos(delta) - math.sin(phi) * math.sin(phi2)
+    )
+    return math.degrees(phi2), ((math.degrees(lam2) + 180.0) % 360.0) - 180.0
+
+
+def test_encode_known_values():
+    assert encode(42.6, -5.6, 5) == "ezs42"
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert encode(-90.0, -180.0, 3) == "000"
+    assert encode(89.999999, 179.999999, 3) == "zzz"
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude",
+    [(40.7128, -74.006), (0.0, 179.99), (0.0, -179.99), (-33.86, 151.2), (89.99, 12.0), (-89.99, -60.0)],
+    ids=["nyc", "antimeridian-east", "antimeridian-west", "sydney", "north-pole", "south-pole"],
+)
+def test_covering_cells_contain_every_point_in_the_radius(latitude, longitude):
+    rng = random.Random(3)
+    for radius_km in (0.5, 5.0, 50.0):
+        cells = covering_cells(latitude, longitude, radius_km)
+        assert 0 < len(cells) <= 32
+        for _ in range(200):
+            point = _offset(latitude, longitude, rng.uniform(0, radius_km), rng.uniform(0, 360))
+            assert encode(*point).startswith(tuple(cells)), (radius_km, point)
+
+
+def test_covering_cells_span_the_antimeridian():
+    cells = covering_cells(0.0, 179.99, 5.0)
+
+    assert encode(0.0, 179.99).startswith(tuple(cells))
+    assert encode(0.0, -179.99).startswith(tuple(cells))
+
+
+def test_geohash_is_kept_in_sync_on_write(app):
+    with app.app_context():
+        household = Household(name="Fam", latitude=40.7128, longitude=-74.006)
+        db.session.add(household)
+        db.session.commit()
+        assert household.geohash == encode(40.7128, -74.006)
+
+        household.latitude, household.longitude = 51.5074, -0.1278
+        db.session.commit()
+        assert household.geohash == encode(51.5074, -0.1278)
+
+        household.latitude = None
+        db.session.commit()
+        assert household.geohash is None
+
+
+def test_geohash_listener_does_not_depend_on_the_geo_service():
+    script = (
+        "import sys\n"
+        "from flask import Flask\n"
+        "from models import Household, db\n"
+        "app = Flask(__name__)\n"
+        "app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'\n"
+        "db.init_app(app)\n"
+        "with app.app_context():\n"
+        "    db.create_all(bind_key=None)\n"
+        "    household = Household(name='Fam', latitude=40.7128, longitude=-74.006)\n"
+        "    db.session.add(household)\n"
+        "    db.session.commit()\n"
+        "    assert 'services.geo_service' not in sys.modules\n"
+        "    print(household.geohash)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=BACKEND, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == encode(40.7128, -74.006)
+
+
+def test_migration_backfill_uses_the_same_encoding():
+    path = next((BACKEND / "migrations" / "versions").glob("c9d0e1f2a3b4_*.py"))
+    spec = importlib.util.spec_from_file_location("geohash_migration", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    rng = random.Random(5)
+    for _ in range(500):
+        latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        assert migration._encode(latitude, longitude) == encode(latitude, longitude)
+
+
+def _seed_households(app, points):
+    with app.app_context():
+        households = [Household(name=name, latitude=lat, longitude=lon) for name, (lat, lon) in points.items()]
+        db.session.add_all(households)
+        db.session.commit()
+        return {household.name: household.id for household in households}
+
+
+def test_households_near_orders_by_distance_and_honours_radius(app):
+    origin = (40.7128, -74.006)
+    ids = _seed_households(
+        app,
+        {
+            "one": _offset(*origin, 1.0, 10),
+            "three": _offset(*origin, 3.0, 200),
+            "four": _offset(*origin, 4.9, 300),
+            "six": _offset(*origin, 6.0, 90),
+            "far": (34.05, -118.24),
+        },
+    )
+
+    with app.app_context():
+        near = households_near(*origin, 5.0, limit=10)
+        assert [row["name"] for row in near] == ["one", "three", "four"]
+        assert [round(row["distance_km"], 1) for row in near] == [1.0, 3.0, 4.9]
+
+        assert [row["name"] for row in households_near(*origin, 5.0, limit=2)] == ["one", "three"]
+        excluded = households_near(*origin, 5.0, limit=10, exclude_household_id=ids["one"])
+        assert [row["name"] for row in excluded] == ["three", "four"]
+
+
+def test_households_near_across_the_antimeridian(app):
+    _seed_households(app, {"east": (-17.0, 179.98), "west": (-17.0, -179.98)})
+
+    with app.app_context():
+        assert [row["name"] for row in households_near(-17.0, 179.99, 5.0, limit=10)] == ["east", "west"]
+
+
+def test_nearby_households_endpoint(app, client):
+    own_household = create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+    origin = (40.7128, -74.006)
+    activity = client.post(
+        "/api/v1/activities",
+        json=activity_payload(kid_ids, latitude=origin[0], longitude=origin[1]),
+        headers=auth("u1"),
+    ).json
+    _seed_households(app, {"near": _offset(*origin, 2.0, 45), "far": _offset(*origin, 20.0, 45)})
+    with app.app_context():
+        own = db.session.get(Household, own_household["id"])
+        own.latitude, own.longitude = origin
+        db.session.commit()
+
+    response = client.get(f"/api/v1/activities/{activity['id']}/nearby-households", headers=auth("u1"))
+    assert response.status_code == 200, response.json
+    assert [row["name"] for row in response.json] == ["near"]
+
+    response = client.get(f"/api/v1/activities/{activity['id']}/nearby-households?radius_km=25", headers=auth("u1"))
+    assert [row["name"] for row in response.json] == ["near", "far"]
+
+    response = client.get(f"/api/v1/activities/{activity['id']}/nearby-households?radius_km=51", headers=auth("u1"))
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+import pytest
+
+from conftest import activity_payload, auth, create_household, create_kids
+from models import GeocodeCache, db
+from services.geocoding_service import GeocodingProvider, geocode
+
+
+class DictProvider(GeocodingProvider):
+    name = "test"
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.calls = 0
+
+    def geocode(self, normalized_address):
+        self.calls += 1
+        return self.entries.get(normalized_address)
+
+
+@pytest.fixture
+def provider(app):
+    provider = DictProvider({"9 park ave": (40.75, -73.98)})
+    app.extensions["geocoder"] = provider
+    return provider
+
+
+def test_providers_must_implement_geocode():
+    with pytest.raises(TypeError):
+        GeocodingProvider()
+
+    class Incomplete(GeocodingProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_cached_answers_survive_a_request_rollback(app, provider):
+    with app.test_request_context():
+        assert geocode("9 Park Avenue") == (40.75, -73.98)
+        assert geocode("Nowhere Lane") is None
+        db.session.rollback()
+
+    with app.app_context():
+        rows = {row.address: (row.latitude, row.longitude) for row in GeocodeCache.query}
+    assert rows == {"9 park ave": (40.75, -73.98), "nowhere ln": (None, None)}
+
+
+def test_known_addresses_are_filled_in(client, provider):
+    household = client.post("/api/v1/households", json={"name": "Fam", "address": "9 Park Ave."}, headers=auth("u1"))
+    assert (household.json["latitude"], household.json["longitude"]) == (40.75, -73.98)
+
+
+def test_half_a_coordinate_pair_is_rejected(client, provider):
+    response = client.post("/api/v1/households", json={"name": "Fam", "latitude": 40.1}, headers=auth("u1"))
+    assert response.status_code == 400
+    assert response.json["error"] == "latitude and longitude must be provided together"
+
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+    payload = activity_payload(kid_ids, address="9 Park Ave", longitude=-73.0)
+    assert client.post("/api/v1/activities", json=payload, headers=auth("u1")).status_code == 400
+
+    bulk = client.post("/api/v1/activities/bulk", json={"activities": [payload]}, headers=auth("u1"))
+    assert bulk.json["results"] == [{"index": 0, "error": "latitude and longitude must be provided together"}]
+    assert provider.calls == 0
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from conftest import activity_payload, auth, create_household, create_kids
+from models import ActivityInstance
+
+TODAY = date.today()
+
+
+def _create(client, **overrides):
+    create_household(client, "u1")
+    kid_ids = [kid["id"] for kid in create_kids(client, "u1", 1)]
+    payload = activity_payload(kid_ids, weekdays=list(range(7)), **overrides)
+    response = client.post("/api/v1/activities", json=payload, headers=auth("u1"))
+    assert response.status_code == 201, response.json
+    return response.json["id"]
+
+
+def _patch(client, activity_id, **changes):
+    response = client.patch(f"/api/v1/activities/{activity_id}", json=changes, headers=auth("u1"))
+    assert response.status_code == 200, response.json
+
+
+def _instance_dates(app, activity_id):
+    with app.app_context():
+        rows = ActivityInstance.query.filter_by(activity_id=activity_id, cancelled_at=None).all()
+        return sorted(row.occurrence_date for row in rows)
+
+
+def _days(first, last, weekdays=range(7)):
+    days = (first + timedelta(days=n) for n in range((last - first).days + 1))
+    return [day for day in days if day.weekday() in weekdays]
+
+
+def test_first_materialization_covers_past_dates(app, client):
+    activity_id = _create(
+        client, start_date=(TODAY - timedelta(days=14)).isoformat(), end_date=(TODAY + timedelta(days=14)).isoformat()
+    )
+
+    assert _instance_dates(app, activity_id) == _days(TODAY - timedelta(days=14), TODAY + timedelta(days=14))
+
+
+def test_moving_start_date_earlier_fills_the_uncovered_past(app, client):
+    activity_id = _create(
+        client, start_date=(TODAY - timedelta(days=14)).isoformat(), end_date=(TODAY + timedelta(days=14)).isoformat()
+    )
+
+    _patch(client, activity_id, start_date=(TODAY - timedelta(days=28)).isoformat())
+
+    assert _instance_dates(app, activity_id) == _days(TODAY - timedelta(days=28), TODAY + timedelta(days=14))
+
+
+def test_history_between_the_oldest_instance_and_today_is_left_alone(app, client):
+    activity_id = _create(
+        client, start_date=(TODAY - timedelta(days=14)).isoformat(), end_date=(TODAY + timedelta(days=14)).isoformat()
+    )
+
+    _patch(client, activity_id, start_date=(TODAY - timedelta(days=28)).isoformat(), weekdays=[TODAY.weekday()])
+
+    assert _instance_dates(app, activity_id) == (
+        _days(TODAY - timedelta(days=28), TODAY - timedelta(days=15), [TODAY.weekday()])
+        + _days(TODAY - timedelta(days=14), TODAY - timedelta(days=1))
+        + _days(TODAY, TODAY + timedelta(days=14), [TODAY.weekday()])
+    )
+
+
+def test_moving_start_date_later_keeps_history(app, client):
+    activity_id = _create(
+        client, start_date=(TODAY - timedelta(days=14)).isoformat(), end_date=(TODAY + timedelta(days=14)).isoformat()
+    )
+
+    _patch(client, activity_id, start_date=(TODAY + timedelta(days=7)).isoformat())
+
+    assert _instance_dates(app, activity_id) == (
+        _days(TODAY - timedelta(days=14), TODAY - timedelta(days=1))
+        + _days(TODAY + timedelta(days=7), TODAY + timedelta(days=14))
+    )
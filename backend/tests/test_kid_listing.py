@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from conftest import auth, create_household
+from models import Kid, db
+from models.db import default_uuid
+from utils.helpers import NEXT_CURSOR_HEADER
+
+
+def _seed_kids(app, household_id, count, created_at=datetime(2026, 1, 1)):
+    with app.app_context():
+        db.session.execute(
+            insert(Kid),
+            [{"id": default_uuid(), "first_name": f"kid{i}", "household_id": household_id, "created_at": created_at}
+             for i in range(count)],
+        )
+        db.session.commit()
+
+
+def _pages(client, limit):
+    pages, cursor = [], None
+    while True:
+        query = f"/api/v1/kids?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(query, headers=auth("u1"))
+        assert response.status_code == 200
+        pages.append(response.json)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_pages_through_created_at_ties_without_gaps_or_repeats(app, client):
+    household = create_household(client, "u1")
+    # Every row shares created_at, so only the id tie-breaker orders them.
+    _seed_kids(app, household["id"], 7)
+
+    pages = _pages(client, limit=3)
+    ids = [kid["id"] for page in pages for kid in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert len(set(ids)) == 7
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_rejects_a_malformed_cursor(client):
+    create_household(client, "u1")
+    for cursor in ("not-a-cursor", "WyJ4Il0", "%%%"):
+        response = client.get(f"/api/v1/kids?cursor={cursor}", headers=auth("u1"))
+        assert response.status_code == 400
+        assert response.json["error"] == "cursor is invalid"
+
+
+def test_limit_bounds(app, client):
+    household = create_household(client, "u1")
+    _seed_kids(app, household["id"], 205)
+
+    assert len(client.get("/api/v1/kids", headers=auth("u1")).json) == 50
+    assert len(client.get("/api/v1/kids?limit=1", headers=auth("u1")).json) == 1
+    assert len(client.get("/api/v1/kids?limit=1000", headers=auth("u1")).json) == 200
+    for bad in ("0", "-5", "abc"):
+        assert client.get(f"/api/v1/kids?limit={bad}", headers=auth("u1")).status_code == 400
+
+
+def test_other_households_are_forbidden(client):
+    create_household(client, "u1")
+    other = create_household(client, "u2")
+
+    response = client.get(f"/api/v1/kids?household_id={other['id']}", headers=auth("u1"))
+    assert response.status_code == 403
@@ -0,0 +1,14 @@
+def test_metrics_are_hidden_without_a_configured_token(client):
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer anything"}).status_code == 404
+
+
+def test_metrics_require_the_token(make_app):
+    client = make_app(METRICS_TOKEN="s3cret").test_client()
+
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "db.pool.default" in response.json["gauges"]
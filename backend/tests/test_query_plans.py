@@ -0,0 +1,42 @@
+"""EXPLAIN QUERY PLAN for the hot lookups; a full table scan means an index went missing."""
+from datetime import datetime
+
+import pytest
+
+from conftest import recorded_queries
+from models import KidActivityEnrollment, User, Vehicle, db
+from services.activity_service import list_activities_for_household, load_activity
+from services.kid_service import list_kids_for_user
+
+AFTER = (datetime(2026, 1, 1), "ffffffff-0000-0000-0000-000000000000")
+
+HOT_QUERIES = {
+    "kids by household": lambda: list_kids_for_user("h1", None, limit=50, after=AFTER),
+    "kids by parent": lambda: list_kids_for_user(None, "u1", limit=50, after=AFTER),
+    "activity for household": lambda: load_activity("a1", household_id="h1"),
+    "activities page": lambda: list_activities_for_household("h1", limit=50, after=AFTER),
+    "household members": lambda: User.query.filter_by(household_id="h1").all(),
+    "household vehicles": lambda: Vehicle.query.filter_by(household_id="h1").all(),
+    "enrollments of activity": lambda: KidActivityEnrollment.query.filter_by(activity_id="a1").delete(),
+    "enrollments of kid": lambda: KidActivityEnrollment.query.filter_by(kid_id="k1").all(),
+}
+
+
+def _full_scans(app, run):
+    with recorded_queries(app) as statements:
+        with app.app_context():
+            run()
+            db.session.rollback()
+    scans = []
+    with app.app_context():
+        for statement, parameters in statements:
+            rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            scans += [row[-1] for row in rows if row[-1].startswith("SCAN ") and " USING " not in row[-1]]
+    return scans
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(make_app, name):
+    # The schema the migrations build, not create_all, is what production runs.
+    app = make_app(migrate=True)
+    assert _full_scans(app, HOT_QUERIES[name]) == []
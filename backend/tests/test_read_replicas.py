@@ -0,0 +1,71 @@
+import shutil
+import time
+
+import pytest
+
+from conftest import auth, create_household, create_kids
+from models import db
+from models.routing import READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER, read_primary_marker
+
+
+@pytest.fixture
+def workers(make_app, tmp_path):
+    """Two apps standing in for two gunicorn workers, sharing a primary and a lagging replica file."""
+    binds = {"replica_1": f"sqlite:///{tmp_path / 'replica.db'}"}
+    apps = [make_app(SQLALCHEMY_BINDS=binds), make_app(SQLALCHEMY_BINDS=binds)]
+    with apps[0].app_context():
+        db.metadata.create_all(db.engines["replica_1"])
+    return apps
+
+
+def _replicate(apps, tmp_path):
+    for app in apps:
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+    shutil.copyfile(tmp_path / "primary.db", tmp_path / "replica.db")
+
+
+def _kid_names(client, headers):
+    response = client.get("/api/v1/kids", headers=headers)
+    assert response.status_code == 200, response.json
+    return {kid["first_name"] for kid in response.json}
+
+
+def test_a_write_is_read_back_from_the_primary_on_another_worker(workers, tmp_path):
+    writer, reader = (app.test_client() for app in workers)
+    create_household(writer, "u1")
+    create_kids(writer, "u1", 1)
+    _replicate(workers, tmp_path)
+
+    created = writer.post("/api/v1/kids", json={"first_name": "New"}, headers=auth("u1"))
+    assert created.status_code == 201
+    marker = created.headers[READ_PRIMARY_HEADER]
+    assert READ_PRIMARY_COOKIE in created.headers["Set-Cookie"]
+
+    # Without the marker the other worker reads the replica, which has not caught up yet.
+    assert _kid_names(reader, auth("u1")) == {"kid0"}
+    assert _kid_names(reader, {**auth("u1"), READ_PRIMARY_HEADER: marker}) == {"kid0", "New"}
+    reader.set_cookie(READ_PRIMARY_COOKIE, marker)
+    assert _kid_names(reader, auth("u1")) == {"kid0", "New"}
+
+
+def test_forged_or_expired_markers_are_ignored(workers, tmp_path):
+    client = workers[0].test_client()
+    create_household(client, "u1")
+    create_household(client, "u2")
+    _replicate(workers, tmp_path)
+    created = client.post("/api/v1/kids", json={"first_name": "New"}, headers=auth("u1"))
+    marker = created.headers[READ_PRIMARY_HEADER]
+    until, _, signature = marker.partition(".")
+    user_id = created.json["parent_user_id"]
+
+    with workers[0].app_context():
+        expired = read_primary_marker(user_id, int(time.time()) - 1)
+    stretched = f"{int(until) + 3600}.{signature}"
+    for bad in (expired, stretched, "garbage", f"{until}.0"):
+        assert _kid_names(client, {**auth("u1"), READ_PRIMARY_HEADER: bad}) == set()
+
+    # Another user's marker does not carry over.
+    other = client.post("/api/v1/kids", json={"first_name": "Theirs"}, headers=auth("u2"))
+    assert _kid_names(client, {**auth("u1"), READ_PRIMARY_HEADER: other.headers[READ_PRIMARY_HEADER]}) == set()
@@ -0,0 +1,120 @@
+import random
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from models import ActivityDayTime, ActivitySchedule
+from services.schedule_service import expand_schedule, expand_schedules_columnar, to_occurrences
+
+
+def _schedule(weekdays, start="16:00", end="17:00", tz="America/New_York", first=date(2026, 9, 1),
+              last=date(2027, 6, 30), day_times=(), activity_id="a"):
+    schedule = ActivitySchedule(
+        activity_id=activity_id,
+        schedule_type="recurring",
+        start_date=first,
+        end_date=last,
+        timezone=tz,
+        recurrence_weekdays=list(weekdays),
+        default_start_time=time.fromisoformat(start),
+        default_end_time=time.fromisoformat(end),
+    )
+    schedule.day_times = [
+        ActivityDayTime(weekday=w, start_time=time.fromisoformat(s), end_time=time.fromisoformat(e))
+        for w, s, e in day_times
+    ]
+    return schedule
+
+
+def _iso(occurrences):
+    return [(o.start.isoformat(), o.end.isoformat()) for o in occurrences]
+
+
+def test_weekly_occurrences_stay_inside_schedule_and_window():
+    schedule = _schedule([0, 2], first=date(2026, 9, 2), last=date(2026, 9, 21))
+    occurrences = expand_schedule(schedule, date(2026, 8, 1), date(2026, 9, 16))
+
+    assert [o.date for o in occurrences] == [date(2026, 9, 2), date(2026, 9, 7), date(2026, 9, 9), date(2026, 9, 14), date(2026, 9, 16)]
+    assert expand_schedule(schedule, date(2026, 10, 1), date(2026, 10, 31)) == []
+
+
+def test_per_weekday_overrides_win_over_defaults():
+    schedule = _schedule([0, 2], day_times=[(2, "17:30", "19:00")], first=date(2026, 9, 7), last=date(2026, 9, 9))
+    assert _iso(expand_schedule(schedule, schedule.start_date, schedule.end_date)) == [
+        ("2026-09-07T16:00:00-04:00", "2026-09-07T17:00:00-04:00"),
+        ("2026-09-09T17:30:00-04:00", "2026-09-09T19:00:00-04:00"),
+    ]
+
+    # Without recurrence_weekdays the override days themselves are the schedule.
+    only_overrides = _schedule([], day_times=[(4, "08:00", "09:00")], first=date(2026, 9, 7), last=date(2026, 9, 13))
+    assert [o.date.weekday() for o in expand_schedule(only_overrides, date(2026, 9, 7), date(2026, 9, 13))] == [4]
+
+
+def test_offsets_follow_dst_on_both_sides_of_a_change():
+    schedule = _schedule([5, 6], first=date(2026, 10, 31), last=date(2026, 11, 1))
+    assert _iso(expand_schedule(schedule, schedule.start_date, schedule.end_date)) == [
+        ("2026-10-31T16:00:00-04:00", "2026-10-31T17:00:00-04:00"),
+        ("2026-11-01T16:00:00-05:00", "2026-11-01T17:00:00-05:00"),
+    ]
+
+
+def test_spring_forward_gap_moves_the_occurrence_forward_keeping_its_length():
+    # New York skips 02:00-03:00 on 2027-03-14.
+    day = date(2027, 3, 14)
+    starts_in_gap = _schedule([6], start="02:30", end="03:30", first=day, last=day)
+    assert _iso(expand_schedule(starts_in_gap, day, day)) == [("2027-03-14T03:30:00-04:00", "2027-03-14T04:30:00-04:00")]
+
+    ends_in_gap = _schedule([6], start="01:30", end="02:30", first=day, last=day)
+    assert _iso(expand_schedule(ends_in_gap, day, day)) == [("2027-03-14T01:30:00-05:00", "2027-03-14T03:30:00-04:00")]
+
+
+def test_fall_back_ambiguous_times_take_the_first_occurrence():
+    # 01:00-02:00 happens twice in New York on 2026-11-01.
+    day = date(2026, 11, 1)
+    schedule = _schedule([6], start="01:30", end="02:30", first=day, last=day)
+    (occurrence,) = expand_schedule(schedule, day, day)
+    assert (occurrence.start.isoformat(), occurrence.end.isoformat()) == ("2026-11-01T01:30:00-04:00", "2026-11-01T02:30:00-05:00")
+    assert occurrence.end - occurrence.start == timedelta(hours=2)
+
+
+def _reference(schedule, window_start, window_end):
+    """Day-by-day expansion with zoneinfo, valid for wall times that exist on every day."""
+    tz = ZoneInfo(schedule.timezone)
+    overrides = {dt.weekday: (dt.start_time, dt.end_time) for dt in schedule.day_times}
+    day = max(schedule.start_date, window_start)
+    rows = []
+    while day <= min(schedule.end_date, window_end):
+        if day.weekday() in schedule.recurrence_weekdays:
+            start, end = overrides.get(day.weekday(), (schedule.default_start_time, schedule.default_end_time))
+            rows.append((datetime.combine(day, start, tz), datetime.combine(day, end, tz)))
+        day += timedelta(days=1)
+    return rows
+
+
+def test_columnar_expansion_matches_a_day_by_day_loop():
+    rng = random.Random(3)
+    zones = ["America/New_York", "Europe/London", "Australia/Sydney", "Asia/Kolkata", "UTC"]
+    schedules = []
+    for i in range(40):
+        start_hour = rng.randint(5, 20)
+        first = date(2026, 1, 1) + timedelta(days=rng.randint(0, 300))
+        schedules.append(
+            _schedule(
+                rng.sample(range(7), rng.randint(1, 4)),
+                start=f"{start_hour:02d}:{rng.choice(['00', '15', '45'])}",
+                end=f"{start_hour + 1:02d}:30",
+                tz=rng.choice(zones),
+                first=first,
+                last=first + timedelta(days=rng.randint(0, 400)),
+                day_times=[(rng.randint(0, 6), "07:00", "08:00")],
+                activity_id=f"a{i:02d}",
+            )
+        )
+    window = (date(2026, 3, 1), date(2027, 2, 28))
+    expanded = to_occurrences(expand_schedules_columnar(schedules, *window), [s.activity_id for s in schedules])
+
+    expected = sorted(
+        (start, s.activity_id, end) for s in schedules for start, end in _reference(s, *window)
+    )
+    assert [(o.start, o.activity_id, o.end) for o in expanded] == expected
+    # Sorted by instant, not by wall clock.
+    assert all(a.start <= b.start for a, b in zip(expanded, expanded[1:]))
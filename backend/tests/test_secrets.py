@@ -0,0 +1,47 @@
+import pytest
+
+from app import create_app
+from conftest import auth, create_household, make_config
+
+
+def _production_config(tmp_path, **overrides):
+    return make_config(tmp_path, DEBUG=False, TESTING=False, **overrides)
+
+
+@pytest.mark.parametrize("missing", ["SECRET_KEY", "CALENDAR_FEED_SECRET"])
+def test_signing_secrets_are_required_outside_development(tmp_path, missing):
+    secrets = {"SECRET_KEY": "s3cret", "CALENDAR_FEED_SECRET": "f33d", missing: None}
+
+    with pytest.raises(RuntimeError, match=missing):
+        create_app(_production_config(tmp_path, **secrets))
+
+
+def test_configured_secrets_are_used(tmp_path):
+    app = create_app(_production_config(tmp_path, SECRET_KEY="s3cret", CALENDAR_FEED_SECRET="f33d"))
+
+    assert (app.config["SECRET_KEY"], app.config["CALENDAR_FEED_SECRET"]) == ("s3cret", "f33d")
+
+
+def test_development_falls_back_to_fixed_values(tmp_path):
+    app = create_app(make_config(tmp_path, SECRET_KEY=None, CALENDAR_FEED_SECRET=None))
+
+    assert app.config["SECRET_KEY"] and app.config["CALENDAR_FEED_SECRET"]
+    assert app.config["SECRET_KEY"] != app.config["CALENDAR_FEED_SECRET"]
+
+
+def _feed_url(app):
+    client = app.test_client()
+    household_id = create_household(client, "u1")["id"]
+    return client, client.get(f"/api/v1/households/{household_id}/calendar-feed", headers=auth("u1")).json["url"]
+
+
+def test_feed_tokens_are_signed_with_the_feed_secret(make_app):
+    app = make_app(SECRET_KEY="one", CALENDAR_FEED_SECRET="feed-a")
+    client, url = _feed_url(app)
+    assert client.get(url).status_code == 200
+
+    # Rotating SECRET_KEY leaves subscriptions working; rotating the feed secret revokes them.
+    app.config["SECRET_KEY"] = "two"
+    assert client.get(url).status_code == 200
+    app.config["CALENDAR_FEED_SECRET"] = "feed-b"
+    assert client.get(url).status_code == 404
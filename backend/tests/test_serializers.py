@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+
+from conftest import activity_payload, auth, create_household
+from models import Activity, db
+from utils.serializers import Serializer
+
+
+class Thing:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+    @property
+    def label(self):
+        return f"<{self.name}>"
+
+
+def test_field_specs():
+    serializer = Serializer(
+        "Thing",
+        ["id", ("title", "name"), ("shout", lambda t: t.name.upper()), ("year", "born", lambda d: d.year), "label"],
+    )
+    thing = Thing(id=1, name="ada", born=date(1815, 12, 10))
+
+    assert serializer(thing) == {"id": 1, "title": "ada", "shout": "ADA", "year": 1815, "label": "<ada>"}
+    assert serializer.keys == ["id", "title", "shout", "year", "label"]
+    assert serializer.many([thing, Thing(id=2, name="bo", born=date(2000, 1, 1))])[1]["label"] == "<bo>"
+    assert serializer.optional(None) is None
+
+
+def test_field_names_must_be_attributes():
+    with pytest.raises(ValueError):
+        Serializer("Thing", [("id", "id); import os; (x")])
+
+
+def test_activity_and_kid_json_keep_their_shape(app, client):
+    household = create_household(client, "u1")
+    kid = client.post("/api/v1/kids", json={"first_name": "Zoë", "dob": "2015-03-04"}, headers=auth("u1")).json
+    payload = activity_payload(
+        [kid["id"]],
+        address="9 Park Ave",
+        latitude=40.7,
+        longitude=-74.0,
+        day_times=[{"weekday": 2, "start_time": "17:00", "end_time": "18:30"}],
+    )
+    created = client.post("/api/v1/activities", json=payload, headers=auth("u1")).json
+    with app.app_context():
+        activity = db.session.get(Activity, created["id"])
+        created_at, user_id = activity.created_at, activity.created_by_user_id
+
+    assert client.get(f"/api/v1/activities/{created['id']}", headers=auth("u1")).json == {
+        "id": created["id"],
+        "name": "Soccer",
+        "provider": None,
+        "address": "9 Park Ave",
+        "location": None,
+        "latitude": 40.7,
+        "longitude": -74.0,
+        "household_id": household["id"],
+        "created_by_user_id": user_id,
+        "kids": [{"id": kid["id"], "first_name": "Zoë"}],
+        "schedule": {
+            "type": "recurring",
+            "start_date": "2026-09-07",
+            "end_date": "2026-12-18",
+            "timezone": "America/New_York",
+            "weekdays": [0, 2],
+            "default_start_time": "16:00",
+            "default_end_time": "17:00",
+            "day_times": [{"weekday": 2, "start_time": "17:00", "end_time": "18:30"}],
+        },
+        "created_at": created_at.isoformat(),
+    }
+
+    (listed,) = client.get("/api/v1/kids", headers=auth("u1")).json
+    assert listed == {
+        "id": kid["id"],
+        "first_name": "Zoë",
+        "gender": None,
+        "dob": "2015-03-04",
+        "household_id": household["id"],
+        "parent_user_id": user_id,
+        "avatar_url": None,
+    }
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+import middleware.firebase_auth as firebase_auth
+
+# Captured before the make_app fixture replaces it with the test stub.
+verify_token = firebase_auth._verify_token
+
+
+class FakeFirebase:
+    def __init__(self, exp):
+        self.exp = exp
+        self.revoked = False
+        self.calls = []
+
+    def verify_id_token(self, token, check_revoked=False):
+        self.calls.append(check_revoked)
+        if check_revoked and self.revoked:
+            raise ValueError("The Firebase ID token has been revoked.")
+        return {"uid": token, "exp": self.exp}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def firebase(monkeypatch, clock):
+    fake = FakeFirebase(exp=clock[0] + 3600)
+    monkeypatch.setattr(firebase_auth.auth, "verify_id_token", fake.verify_id_token)
+    return fake
+
+
+def test_verified_token_is_cached_until_exp(make_app, firebase, clock):
+    app = make_app(TOKEN_CACHE_TTL_SECONDS=0)
+    with app.app_context():
+        assert verify_token("u1")["uid"] == "u1"
+        clock[0] += 3599
+        assert verify_token("u1")["uid"] == "u1"
+        assert len(firebase.calls) == 1
+
+        clock[0] += 1
+        firebase.exp = clock[0] + 3600
+        assert verify_token("u1")["uid"] == "u1"
+        assert len(firebase.calls) == 2
+
+
+def test_expired_tokens_are_not_cached(make_app, firebase, clock):
+    firebase.exp = clock[0] - 1
+    app = make_app()
+    with app.app_context():
+        verify_token("u1")
+        verify_token("u1")
+    assert len(firebase.calls) == 2
+
+
+def test_revoked_token_stops_working_after_the_cache_ttl(make_app, firebase, clock):
+    app = make_app(TOKEN_CACHE_TTL_SECONDS=60, TOKEN_CHECK_REVOKED=True)
+    with app.app_context():
+        assert verify_token("u1") is not None
+        firebase.revoked = True
+        clock[0] += 59
+        assert verify_token("u1") is not None  # still cached
+        clock[0] += 1
+        assert verify_token("u1") is None
+    assert firebase.calls == [True, True]
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from conftest import auth, create_household, recorded_queries
+from models import User, db
+
+
+def test_household_change_is_seen_by_other_workers(make_app):
+    # Two apps on one database stand in for two gunicorn workers with their own caches.
+    worker_a, worker_b = make_app().test_client(), make_app().test_client()
+    assert worker_b.get("/api/v1/users/me", headers=auth("u1")).status_code == 200
+    assert worker_b.get("/api/v1/households/me", headers=auth("u1")).status_code == 404
+
+    household = worker_a.post("/api/v1/households", json={"name": "Fam"}, headers=auth("u1")).json
+
+    response = worker_b.get("/api/v1/households/me", headers=auth("u1"))
+    assert response.status_code == 200
+    assert response.json["id"] == household["id"]
+
+
+def test_parallel_first_logins_create_one_user(app):
+    workers = 16
+    barrier = threading.Barrier(workers)
+
+    def first_login(_):
+        client = app.test_client()
+        barrier.wait()
+        return client.get("/api/v1/users/me", headers=auth("new-user"))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        responses = list(pool.map(first_login, range(workers)))
+
+    assert [r.status_code for r in responses] == [200] * workers
+    assert len({r.json["id"] for r in responses}) == 1
+    with app.app_context():
+        assert User.query.filter_by(firebase_uid="new-user").count() == 1
+
+
+def test_known_user_read_does_not_write(app, client):
+    client.get("/api/v1/users/me", headers=auth("u1"))
+    app.extensions["user_cache"].clear()
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/api/v1/users/me", headers=auth("u1")).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == ["SELECT"]
+
+
+def test_warm_hit_runs_no_queries(app, client):
+    create_household(client, "u1")
+    client.get("/api/v1/users/me", headers=auth("u1"))
+
+    with recorded_queries(app) as statements:
+        response = client.get("/api/v1/users/me", headers=auth("u1"))
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_users_without_a_household_are_not_cached(app, client):
+    client.get("/api/v1/users/me", headers=auth("u1"))
+    assert app.extensions["user_cache"].get("u1") is None
+
+    household = create_household(client, "u1")
+    client.get("/api/v1/users/me", headers=auth("u1"))
+    assert app.extensions["user_cache"].get("u1")["household_id"] == household["id"]
+
+
+def test_user_writes_invalidate_the_cache(app, client):
+    create_household(client, "u1")
+    client.get("/api/v1/users/me", headers=auth("u1"))
+    with app.app_context():
+        User.query.filter_by(firebase_uid="u1").one().first_name = "Renamed"
+        db.session.commit()
+
+    assert app.extensions["user_cache"].get("u1") is None
+    assert client.get("/api/v1/users/me", headers=auth("u1")).json["first_name"] == "Renamed"
+    # The cached copy attaches to the request's session, so routes can still write through it.
+    assert client.post("/api/v1/kids", json={"first_name": "k"}, headers=auth("u1")).status_code == 201
@@ -0,0 +1,91 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON only
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional: JSON only
+    cbor2 = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+# Media types clients use for MessagePack besides the registered one.
+ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _convert(value: Any) -> Any:
+    # Mirror the JSON provider so every format carries the same values.
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "tolist"):  # numpy scalars and arrays
+        return value.tolist()
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def to_plain(value: Any) -> Any:
+    """Reduce a response payload to str/int/float/bool/None, lists and dicts.
+
+    Only needed for CBOR, which would otherwise write dates as tagged values; msgpack reaches
+    _convert through its ``default`` hook. Unlike JSON, map keys keep their type in both formats.
+    """
+    if isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return to_plain(_convert(value))
+
+
+def _codecs() -> Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    codecs = {}
+    if msgpack is not None:
+        codecs[MSGPACK] = (
+            lambda obj: msgpack.packb(obj, default=_convert, use_bin_type=True, datetime=False),
+            lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+        )
+    if cbor2 is not None:
+        codecs[CBOR] = (lambda obj: cbor2.dumps(to_plain(obj)), cbor2.loads)
+    return codecs
+
+
+CODECS = _codecs()
+
+
+def binary_media_types() -> List[str]:
+    return list(CODECS)
+
+
+def canonical_media_type(mimetype: Optional[str]) -> Optional[str]:
+    """The CODECS key for a Content-Type/Accept media type, or None when it is not a binary format we speak."""
+    mimetype = (mimetype or "").lower()
+    mimetype = ALIASES.get(mimetype, mimetype)
+    return mimetype if mimetype in CODECS else None
+
+
+def encode(obj: Any, media_type: str) -> bytes:
+    return CODECS[media_type][0](obj)
+
+
+def decode(data: bytes, media_type: str) -> Any:
+    return CODECS[media_type][1](data)
+
@@ -0,0 +1,143 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+REPLICA_BIND_PREFIX = "replica_"
+
+
+class _PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.connect_seconds = 0.0
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts queue for a connection and how many time out.
+
+    Opening a new connection when the pool grows is timed separately (``connect_seconds``), so
+    the wait figures only show contention for the pool.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats = _PoolStats()
+        self._checkout = threading.local()
+
+    def _do_get(self):
+        checkout = self._checkout
+        if getattr(checkout, "active", False):
+            # QueuePool retries by calling _do_get again; only the outermost call is one checkout.
+            return super()._do_get()
+        checkout.active = True
+        checkout.connect_seconds = 0.0
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            checkout.active = False
+            connect_seconds = checkout.connect_seconds
+            waited = max(time.perf_counter() - started - connect_seconds, 0.0)
+            stats = self._stats
+            with stats.lock:
+                stats.checkouts += 1
+                stats.timeouts += timed_out
+                stats.wait_seconds += waited
+                stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+                stats.connect_seconds += connect_seconds
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            if getattr(self._checkout, "active", False):
+                self._checkout.connect_seconds += time.perf_counter() - started
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool._stats = self._stats  # keep counting across invalidation
+        return pool
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = self._stats
+        with stats.lock:
+            checkouts, timeouts = stats.checkouts, stats.timeouts
+            wait_seconds, max_wait_seconds = stats.wait_seconds, stats.max_wait_seconds
+            connect_seconds = stats.connect_seconds
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_seconds_total": wait_seconds,
+            "wait_seconds_avg": wait_seconds / checkouts if checkouts else 0.0,
+            "wait_seconds_max": max_wait_seconds,
+            "connect_seconds_total": connect_seconds,
+        }
+
+
+def engine_options(
+    database_url: str,
+    *,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+    pgbouncer: bool = False,
+) -> Dict[str, Any]:
+    """SQLALCHEMY_ENGINE_OPTIONS for a server database; SQLite keeps SQLAlchemy's defaults."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+    }
+    if pgbouncer:
+        connect_args = _pgbouncer_connect_args(url.get_driver_name())
+        if connect_args:
+            options["connect_args"] = connect_args
+    return options
+
+
+def replica_binds(urls: List[str], **options: Any) -> Dict[str, Dict[str, Any]]:
+    """SQLALCHEMY_BINDS entries ``replica_1``, ``replica_2``, ... for read replicas, pooled like the primary."""
+    return {
+        f"{REPLICA_BIND_PREFIX}{index}": {"url": url, **engine_options(url, **options)}
+        for index, url in enumerate(urls, start=1)
+    }
+
+
+def _pgbouncer_connect_args(driver: str) -> Optional[Dict[str, Any]]:
+    # PgBouncer in transaction mode hands each transaction to any server connection, so
+    # named server-side prepared statements from an earlier transaction may not exist there.
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    # psycopg2 never prepares server-side and pg8000 executes through unnamed statements.
+    return None
+
+
+def pool_snapshot(engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.snapshot()
+    return {"status": pool.status()}
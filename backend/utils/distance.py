@@ -0,0 +1,49 @@
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.geohash import EARTH_RADIUS_KM
+
+
+def as_coordinates(values: Sequence[Optional[float]]) -> np.ndarray:
+    """Contiguous float64 array from a column of coordinates; missing values become NaN."""
+    return np.ascontiguousarray(np.array(values, dtype=np.float64))
+
+
+def _haversine(lat1, lon1, lat2, lon2) -> np.ndarray:
+    # All arguments are radians; shapes broadcast.
+    a = np.sin((lat2 - lat1) * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
+    return (2.0 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_one_to_many(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance (km) from one point to each point in lats/lons (degrees)."""
+    return _haversine(math.radians(lat), math.radians(lon), np.radians(lats), np.radians(lons))
+
+
+def haversine_matrix(
+    lats_a: np.ndarray, lons_a: np.ndarray, lats_b: np.ndarray, lons_b: np.ndarray
+) -> np.ndarray:
+    """Distance matrix (km) of shape (len(a), len(b))."""
+    lat_a = np.radians(lats_a)[:, None]
+    lon_a = np.radians(lons_a)[:, None]
+    return _haversine(lat_a, lon_a, np.radians(lats_b)[None, :], np.radians(lons_b)[None, :])
+
+
+def top_k(distances: np.ndarray, k: int, max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and distances of the k nearest entries, nearest first.
+
+    argpartition selects the k smallest in O(n); only those k are sorted. NaN distances (rows
+    without coordinates) and anything beyond max_distance are dropped.
+    """
+    candidates = np.flatnonzero(~np.isnan(distances))
+    if max_distance is not None:
+        candidates = candidates[distances[candidates] <= max_distance]
+    if k <= 0 or not len(candidates):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    if k < len(candidates):
+        candidates = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+    order = np.argsort(distances[candidates], kind="stable")
+    indices = candidates[order]
+    return indices, distances[indices]
@@ -0,0 +1,86 @@
+import math
+from typing import List, Set, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0088
+PRECISION = 9
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell at this precision, in degrees."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float, max_cells: int = 32) -> List[str]:
+    """Geohash prefixes whose union covers the bounding box of a circle, as few as max_cells allows."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lon_delta = min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    south, north = max(-90.0, latitude - lat_delta), min(90.0, latitude + lat_delta)
+    west, east = longitude - lon_delta, longitude + lon_delta
+
+    best: List[str] = []
+    for precision in range(1, PRECISION + 1):
+        cells = _cells_for_box(south, north, west, east, precision, max_cells)
+        if cells is None:
+            break
+        best = sorted(cells)
+    return best or [""]
+
+
+def _cells_for_box(
+    south: float, north: float, west: float, east: float, precision: int, max_cells: int
+) -> "Set[str] | None":
+    height, width = cell_size_degrees(precision)
+    rows = int((north - south) / height) + 2
+    cols = int((east - west) / width) + 2
+    if rows * cols > max_cells * 4:
+        return None
+    cells: Set[str] = set()
+    for r in range(rows):
+        lat = min(north, south + r * height)
+        for c in range(cols):
+            lon = min(east, west + c * width)
+            cells.add(encode(lat, _wrap(lon), precision))
+            if len(cells) > max_cells:
+                return None
+    return cells
+
+
+def _wrap(longitude: float) -> float:
+    return ((longitude + 180.0) % 360.0) - 180.0
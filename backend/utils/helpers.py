@@ -1,14 +1,73 @@
-from typing import Any, Dict, Optional
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 
-from flask import jsonify, request
+from flask import current_app, has_request_context, jsonify, request
 
+from utils import codecs
 
-def json_response(payload: Dict[str, Any], status_code: int = 200):
-    response = jsonify(payload)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def negotiated_media_type() -> Optional[str]:
+    """The binary format (msgpack/CBOR) the client's Accept header prefers over JSON, if any."""
+    if not codecs.CODECS or not has_request_context():
+        return None
+    offered = [codecs.JSON, *codecs.binary_media_types(), *codecs.ALIASES]
+    return codecs.canonical_media_type(request.accept_mimetypes.best_match(offered))
+
+
+def json_response(payload: Dict[str, Any], status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+    media_type = negotiated_media_type()
+    if media_type is None:
+        response = jsonify(payload)
+    else:
+        response = current_app.response_class(codecs.encode(payload, media_type), mimetype=media_type)
+    if codecs.CODECS:
+        response.vary.add("Accept")
     response.status_code = status_code
+    if headers:
+        response.headers.update(headers)
     return response
 
 
+def _etag(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _revalidate_privately(response) -> None:
+    # Per-user data: browsers and the app may keep it but must check back before reuse.
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+
+def conditional_json_response(payload: Any, *, headers: Optional[Dict[str, str]] = None):
+    """json_response with a strong ETag (a hash of the encoded body), answering 304 when If-None-Match has it.
+
+    The body is still built and encoded on a match, but the transfer is saved.
+    """
+    response = json_response(payload, headers=headers)
+    response.set_etag(_etag(response.get_data()))
+    _revalidate_privately(response)
+    return response.make_conditional(request)
+
+
+def get_request_payload() -> Any:
+    """The request body decoded per its Content-Type (msgpack/CBOR when supported, else JSON); None if unreadable."""
+    media_type = codecs.canonical_media_type(request.mimetype)
+    if media_type is None:
+        return request.get_json(silent=True)
+    try:
+        return codecs.decode(request.get_data(cache=True), media_type)
+    except Exception:  # noqa: BLE001 - malformed bodies are treated like invalid JSON
+        return None
+
+
 def error_response(message: str, status_code: int = 400, errors: Optional[Dict[str, Any]] = None):
     body = {"error": message}
     if errors:
@@ -29,3 +88,30 @@ def get_bearer_token() -> Optional[str]:
     else:
         current_app.logger.debug("Bearer token was empty after extraction")
     return token
+
+
+def parse_limit(value: Optional[str], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> Tuple[int, Optional[str]]:
+    if value in (None, ""):
+        return default, None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default, "limit must be an integer"
+    if limit < 1:
+        return default, "limit must be positive"
+    return min(limit, maximum), None
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[Tuple[datetime, str]], Optional[str]]:
+    """Decode an opaque (created_at, id) keyset cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_raw, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(created_at_raw), str(row_id)), None
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        return None, "cursor is invalid"
@@ -0,0 +1,62 @@
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={labels[k]}" for k in sorted(labels)) + "}"
+
+
+class Metrics:
+    """In-process counters and summaries (count/sum/min/max), exposed as JSON on /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._summaries: Dict[str, Tuple[int, float, float, float]] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def register_gauge(self, name: str, read: Callable[[], Any]) -> None:
+        """Report ``read()`` under ``name`` on every snapshot, for values owned elsewhere (pool state)."""
+        with self._lock:
+            self._gauges[name] = read
+
+    def incr(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            count, total, low, high = self._summaries.get(key, (0, 0.0, value, value))
+            self._summaries[key] = (count + 1, total + value, min(low, value), max(high, value))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = {
+                key: {"count": count, "sum": total, "avg": total / count, "min": low, "max": high}
+                for key, (count, total, low, high) in self._summaries.items()
+            }
+            gauges = dict(self._gauges)
+        return {
+            "counters": counters,
+            "summaries": summaries,
+            "gauges": {name: read() for name, read in gauges.items()},
+        }
+
+
+def init_metrics(app: Flask) -> Metrics:
+    registry = Metrics()
+    app.extensions["metrics"] = registry
+    return registry
+
+
+def get_metrics() -> Optional[Metrics]:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("metrics")
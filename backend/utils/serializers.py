@@ -0,0 +1,54 @@
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+# A field is an attribute name, (key, attribute name), (key, callable taking the object) or
+# (key, attribute name, callable applied to the attribute value).
+FieldSpec = Union[
+    str,
+    Tuple[str, Union[str, Callable[[Any], Any]]],
+    Tuple[str, str, Callable[[Any], Any]],
+]
+
+
+class Serializer:
+    """Turns objects into dicts using a function generated once from a field list.
+
+    The generated function is a single dict display, so there is no per-field loop at run time.
+    Attributes are read straight from the instance ``__dict__`` when present: loaded ORM column
+    values live there, and skipping the instrumented descriptor is most of the saving. Missing
+    (expired, deferred or unset) attributes fall back to normal attribute access.
+    """
+
+    def __init__(self, name: str, fields: Sequence[FieldSpec]):
+        self.name = name
+        self.keys: List[str] = []
+        namespace: Dict[str, Any] = {}
+        entries = []
+        for index, field in enumerate(fields):
+            if isinstance(field, str):
+                field = (field, field)
+            key, source, convert = field if len(field) == 3 else (*field, None)
+            if isinstance(source, str):
+                if not source.isidentifier():
+                    raise ValueError(f"{name}: {source!r} is not an attribute name")
+                expression = f"(d[{source!r}] if {source!r} in d else obj.{source})"
+                if convert is not None:
+                    namespace[f"_c{index}"] = convert
+                    expression = f"_c{index}{expression}"
+            else:
+                namespace[f"_f{index}"] = source
+                expression = f"_f{index}(obj)"
+            self.keys.append(key)
+            entries.append(f"{key!r}: {expression}")
+        source_code = f"def serialize(obj):\n    d = obj.__dict__\n    return {{{', '.join(entries)}}}\n"
+        exec(compile(source_code, f"<serializer {name}>", "exec"), namespace)  # noqa: S102
+        self._serialize: Callable[[Any], Dict[str, Any]] = namespace["serialize"]
+
+    def __call__(self, obj: Any) -> Dict[str, Any]:
+        return self._serialize(obj)
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        serialize = self._serialize
+        return [serialize(obj) for obj in objs]
+
+    def optional(self, obj: Any) -> Any:
+        return None if obj is None else self._serialize(obj)